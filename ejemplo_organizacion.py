@@ -6,9 +6,34 @@ Este script muestra cómo usar el clasificador para organizar
 automáticamente los PDFs en carpetas por tema.
 """
 
-from pdf_classifier import PDFClassifier
+import os
+import sys
 from pathlib import Path
 
+from pdf_utils import latest_results
+
+try:
+    from rich.console import Console
+    from rich.text import Text
+    from rich.tree import Tree
+    RICH_AVAILABLE = True
+except ImportError:
+    RICH_AVAILABLE = False
+
+# Tamaño de lote para los ejemplos: lotes mayores amortizan la latencia fija de cada request
+TAMANO_LOTE = 10
+
+# Clasificador compartido por todos los ejemplos (se crea la primera vez que se necesita)
+_clasificador = None
+
+def obtener_clasificador():
+    """Devuelve el clasificador compartido, creándolo (e importándolo) solo una vez."""
+    global _clasificador
+    if _clasificador is None:
+        from pdf_classifier import PDFClassifier
+        _clasificador = PDFClassifier(batch_size=TAMANO_LOTE)
+    return _clasificador
+
 def ejemplo_organizacion_automatica():
     """Ejemplo de clasificación y organización automática."""
     print("🗂️  EJEMPLO: CLASIFICACIÓN Y ORGANIZACIÓN AUTOMÁTICA")
@@ -24,8 +49,8 @@ def ejemplo_organizacion_automatica():
         return
 
     try:
-        # Crear clasificador
-        classifier = PDFClassifier(batch_size=3)
+        # El clasificador se crea solo cuando hay algo que procesar
+        classifier = obtener_clasificador()
 
         print(f"📁 Procesando PDFs de: {carpeta_pdfs}")
         print(f"🎯 Organizando en: {carpeta_organizada}")
@@ -66,24 +91,39 @@ def mostrar_estructura_creada(carpeta_organizada: Path):
     print(f"\n🌳 ESTRUCTURA CREADA EN {carpeta_organizada.name}:")
     print("-" * 40)
 
-    def mostrar_carpeta(carpeta, nivel=0):
-        indent = "  " * nivel
-        items = sorted(carpeta.iterdir())
-
-        for item in items:
-            if item.is_dir():
-                print(f"{indent}📁 {item.name}/")
-                # Mostrar archivos en la carpeta
-                archivos = list(item.glob("*.pdf"))
-                if archivos:
-                    for archivo in sorted(archivos):
-                        print(f"{indent}  📄 {archivo.name}")
-                # Mostrar subcarpetas
-                subcarpetas = [x for x in item.iterdir() if x.is_dir()]
-                if subcarpetas:
-                    mostrar_carpeta(item, nivel + 1)
-
-    mostrar_carpeta(carpeta_organizada)
+    # Un único recorrido con os.walk (basado en os.scandir): cada carpeta se lee una
+    # sola vez y el tipo de cada entrada viene de la propia lectura del directorio
+    raiz = os.fspath(carpeta_organizada)
+    nivel_base = raiz.rstrip(os.sep).count(os.sep) + 1
+
+    # El árbol se arma en memoria y se escribe de una vez al final
+    arbol = Tree(Text(f"📂 {carpeta_organizada.name}")) if RICH_AVAILABLE else None
+    nodos = {raiz: arbol}
+    lineas = []
+
+    for ruta, subcarpetas, archivos in os.walk(raiz):
+        subcarpetas.sort()  # os.walk desciende en el orden de esta lista
+        if ruta == raiz:
+            continue
+
+        nombre = os.path.basename(ruta)
+        pdfs = sorted(a for a in archivos if a.lower().endswith(".pdf"))
+
+        if RICH_AVAILABLE:
+            nodo = nodos[os.path.dirname(ruta)].add(Text(f"📁 {nombre}/"))
+            nodos[ruta] = nodo
+            for archivo in pdfs:
+                nodo.add(Text(f"📄 {archivo}"))
+        else:
+            indent = "  " * (ruta.count(os.sep) - nivel_base)
+            lineas.append(f"{indent}📁 {nombre}/")
+            # Mostrar archivos en la carpeta
+            lineas.extend(f"{indent}  📄 {archivo}" for archivo in pdfs)
+
+    if RICH_AVAILABLE:
+        Console().print(arbol)
+    elif lineas:
+        sys.stdout.write("\n".join(lineas) + "\n")
 
 def ejemplo_solo_organizacion():
     """Ejemplo de organización usando resultados existentes."""
@@ -91,29 +131,26 @@ def ejemplo_solo_organizacion():
     print("=" * 60)
 
     carpeta_pdfs = "/home/federico/prg/duply_v6_clipy/pdf"
-    resultados_json = "results/clasificacion_20250918_141611.json"  # Usar tu archivo de resultados
+    carpeta_resultados = "results"
 
     if not Path(carpeta_pdfs).exists():
         print(f"❌ La carpeta {carpeta_pdfs} no existe.")
         return
 
-    if not Path(resultados_json).exists():
-        print(f"❌ Archivo de resultados no encontrado: {resultados_json}")
+    # La clasificación más reciente de cada PDF entre todos los archivos de resultados
+    # (una corrida incremental guarda solo los PDFs nuevos o modificados)
+    resultados = latest_results(carpeta_resultados, carpeta_pdfs)
+    if not resultados:
+        print(f"❌ No hay resultados de {carpeta_pdfs} en: {carpeta_resultados}")
         print("   Ejecuta primero una clasificación.")
         return
 
     try:
-        import json
-
-        # Cargar resultados existentes
-        with open(resultados_json, 'r', encoding='utf-8') as f:
-            resultados = json.load(f)
-
-        # Crear clasificador y organizar
-        classifier = PDFClassifier()
+        # Organizar con el clasificador compartido
+        classifier = obtener_clasificador()
 
         stats = classifier.organize_files_by_classification(
-            results=resultados,
+            results=resultados.values(),
             source_folder=Path(carpeta_pdfs),
             organized_folder=Path("pdf_organizados_manual")
         )
@@ -130,8 +167,11 @@ def main():
     print("🚀 EJEMPLOS DE ORGANIZACIÓN DE PDFs")
     print("=" * 50)
 
+    # Cargar .env sin importar el clasificador (se importa solo si hay PDFs)
+    from dotenv import load_dotenv
+    load_dotenv()
+
     # Verificar API key
-    import os
     if not os.getenv('GOOGLE_API_KEY'):
         print("❌ API key no encontrada en .env")
         return
@@ -5,31 +5,63 @@ Ejemplo de uso del clasificador de PDFs
 Este script muestra diferentes formas de usar el clasificador.
 """
 
-from pdf_classifier import PDFClassifier
 from pathlib import Path
+from typing import List
 import os
 
-def ejemplo_basico():
-    """Ejemplo básico de uso del clasificador."""
-    print("=== EJEMPLO BÁSICO ===")
+from pdf_utils import iter_pdfs
+
+# Tamaño de lote para los ejemplos: lotes mayores amortizan la latencia fija de cada request
+TAMANO_LOTE = 10
+
+# Carpeta con PDFs usada por los ejemplos (ajusta esta ruta)
+CARPETA_PDFS = "/ruta/a/tu/carpeta/de/pdfs"
 
-    # Crear instancia del clasificador
-    classifier = PDFClassifier(batch_size=3)
+# Clasificador compartido por todos los ejemplos (se crea la primera vez que se necesita)
+_clasificador = None
 
-    # Carpeta con PDFs (ajusta esta ruta)
-    carpeta_pdfs = "/ruta/a/tu/carpeta/de/pdfs"
+def obtener_clasificador():
+    """Devuelve el clasificador compartido, creándolo (e importándolo) solo una vez."""
+    global _clasificador
+    if _clasificador is None:
+        from pdf_classifier import PDFClassifier
+        _clasificador = PDFClassifier(batch_size=TAMANO_LOTE)
+    return _clasificador
 
-    # Verificar que la carpeta existe
-    if not Path(carpeta_pdfs).exists():
-        print(f"⚠️  La carpeta {carpeta_pdfs} no existe.")
-        print("   Ajusta la variable 'carpeta_pdfs' con la ruta correcta.")
+def listar_pdfs(carpeta: str) -> List[str]:
+    """
+    Lista los PDFs de una carpeta con una sola lectura del directorio.
+
+    Args:
+        carpeta: Carpeta a recorrer
+
+    Returns:
+        Rutas de los PDFs (lista vacía si la carpeta no existe)
+    """
+    try:
+        return list(iter_pdfs(carpeta))
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+def ejemplo_basico(pdfs: List[str]):
+    """Ejemplo básico de uso del clasificador."""
+    print("=== EJEMPLO BÁSICO ===")
+
+    # Verificar que la carpeta existe y tiene PDFs (ya listados en main)
+    if not pdfs:
+        print(f"⚠️  La carpeta {CARPETA_PDFS} no existe o no contiene PDFs.")
+        print("   Ajusta la variable 'CARPETA_PDFS' con la ruta correcta.")
         return
 
+    # El clasificador se crea solo cuando hay algo que procesar
+    classifier = obtener_clasificador()
+
     try:
         # Procesar PDFs
         stats = classifier.classify_pdfs_in_folder(
-            folder_path=carpeta_pdfs,
-            output_dir="resultados_ejemplo"
+            folder_path=CARPETA_PDFS,
+            output_dir="resultados_ejemplo",
+            pdf_files=pdfs
         )
 
         print(f"✅ Procesados: {stats['processed']}/{stats['total_files']} archivos")
@@ -38,27 +70,28 @@ def ejemplo_basico():
     except Exception as e:
         print(f"❌ Error: {e}")
 
-def ejemplo_configuracion_personalizada():
+def ejemplo_configuracion_personalizada(pdfs: List[str]):
     """Ejemplo con configuración personalizada."""
     print("\n=== EJEMPLO CON CONFIGURACIÓN PERSONALIZADA ===")
 
-    # Configuración personalizada
+    if not pdfs:
+        print(f"⚠️  La carpeta {CARPETA_PDFS} no existe o no contiene PDFs.")
+        return
+
+    from pdf_classifier import PDFClassifier
+
+    # Configuración personalizada (instancia propia: usa otro tamaño de lote)
     classifier = PDFClassifier(
         api_key=os.getenv('GOOGLE_API_KEY'),  # API key específica
         batch_size=2  # Lotes más pequeños
     )
 
-    carpeta_pdfs = "/ruta/a/tu/carpeta/de/pdfs"
-
-    if not Path(carpeta_pdfs).exists():
-        print(f"⚠️  La carpeta {carpeta_pdfs} no existe.")
-        return
-
     try:
         # Procesar con configuración personalizada
         stats = classifier.classify_pdfs_in_folder(
-            folder_path=carpeta_pdfs,
-            output_dir="resultados_personalizados"
+            folder_path=CARPETA_PDFS,
+            output_dir="resultados_personalizados",
+            pdf_files=pdfs
         )
 
         print(f"✅ Procesamiento completado")
@@ -66,38 +99,57 @@ def ejemplo_configuracion_personalizada():
 
     except Exception as e:
         print(f"❌ Error: {e}")
+    finally:
+        # Instancia propia: se cierra su log al terminar (la compartida se cierra al salir)
+        classifier.close()
 
 def ejemplo_procesamiento_individual():
-    """Ejemplo de procesamiento de archivos individuales."""
+    """Ejemplo de procesamiento de archivos individuales en una sola llamada a la API."""
     print("\n=== EJEMPLO DE PROCESAMIENTO INDIVIDUAL ===")
 
-    classifier = PDFClassifier()
+    # Archivos específicos (ajusta estas rutas)
+    archivos_pdf = [
+        "/ruta/a/un/archivo.pdf",
+        "/ruta/a/otro/archivo.pdf",
+    ]
 
-    # Archivo específico (ajusta esta ruta)
-    archivo_pdf = "/ruta/a/un/archivo.pdf"
+    existentes = []
+    for archivo_pdf in archivos_pdf:
+        if Path(archivo_pdf).exists():
+            existentes.append(Path(archivo_pdf))
+        else:
+            print(f"⚠️  El archivo {archivo_pdf} no existe.")
 
-    if not Path(archivo_pdf).exists():
-        print(f"⚠️  El archivo {archivo_pdf} no existe.")
+    if not existentes:
         return
 
-    try:
-        # Extraer texto del PDF
-        texto = classifier.extract_text_from_pdf(Path(archivo_pdf))
+    classifier = obtener_clasificador()
 
-        if texto:
-            print(f"📄 Texto extraído de {Path(archivo_pdf).name}:")
-            print(f"   Primeros 200 caracteres: {texto[:200]}...")
-
-            # Clasificar un solo documento
-            resultado = classifier.classify_batch_with_ai([(texto, Path(archivo_pdf).name)])
-
-            if resultado:
-                print(f"🏷️  Clasificación:")
-                print(f"   General: {resultado[0].get('tema_general')}")
-                print(f"   Subtema: {resultado[0].get('subtema')}")
-                print(f"   Específico: {resultado[0].get('tema_especifico')}")
-        else:
-            print("❌ No se pudo extraer texto del PDF")
+    try:
+        # Extraer el texto de todos los PDFs antes de llamar a la API
+        textos_y_archivos = []
+        for archivo_pdf in existentes:
+            texto = classifier.extract_text_from_pdf(archivo_pdf)
+
+            if texto:
+                print(f"📄 Texto extraído de {archivo_pdf.name}:")
+                print(f"   Primeros 200 caracteres: {texto[:200]}...")
+                textos_y_archivos.append((texto, archivo_pdf.name))
+            else:
+                print(f"❌ No se pudo extraer texto de {archivo_pdf.name}")
+
+        if not textos_y_archivos:
+            return
+
+        # Clasificar todos los documentos en un único request
+        resultados = classifier.classify_batch_with_ai(textos_y_archivos)
+
+        if resultados:
+            for (_, nombre), resultado in zip(textos_y_archivos, resultados):
+                print(f"🏷️  Clasificación de {nombre}:")
+                print(f"   General: {resultado.get('tema_general')}")
+                print(f"   Subtema: {resultado.get('subtema')}")
+                print(f"   Específico: {resultado.get('tema_especifico')}")
 
     except Exception as e:
         print(f"❌ Error: {e}")
@@ -107,6 +159,10 @@ def main():
     print("🚀 EJEMPLOS DE USO DEL CLASIFICADOR DE PDFs")
     print("=" * 50)
 
+    # Cargar .env sin importar el clasificador (se importa solo si hay PDFs)
+    from dotenv import load_dotenv
+    load_dotenv()
+
     # Verificar que tenemos API key
     if not os.getenv('GOOGLE_API_KEY'):
         print("❌ API key de Google Gemini no encontrada.")
@@ -115,9 +171,12 @@ def main():
 
     print("✅ API key encontrada")
 
+    # Listar la carpeta una sola vez para todos los ejemplos
+    pdfs = listar_pdfs(CARPETA_PDFS)
+
     # Ejecutar ejemplos
-    ejemplo_basico()
-    ejemplo_configuracion_personalizada()
+    ejemplo_basico(pdfs)
+    ejemplo_configuracion_personalizada(pdfs)
     ejemplo_procesamiento_individual()
 
     print("\n" + "=" * 50)
@@ -6,8 +6,7 @@ Ejecuta el menú interactivo o comandos directos del clasificador.
 """
 
 import sys
-import os
-from pathlib import Path
+import importlib.util
 
 def main():
     """Función principal que determina qué interfaz usar."""
@@ -21,11 +20,8 @@ def main():
     # Si no hay argumentos, mostrar menú interactivo
     else:
         try:
-            # Verificar si las dependencias están instaladas
-            try:
-                import rich
-                import colorama
-            except ImportError:
+            # Verificar si las dependencias están instaladas (sin importarlas)
+            if importlib.util.find_spec("rich") is None or importlib.util.find_spec("colorama") is None:
                 print("⚠️  Las dependencias para el menú colorido no están instaladas.")
                 print("Ejecuta: pip install -r requirements.txt")
                 print("\nUsando interfaz básica...")
@@ -5,35 +5,98 @@ MENÚ INTERACTIVO PARA CLASIFICADOR DE PDFs
 Interfaz colorida y atractiva para el clasificador de PDFs con Google Gemini.
 """
 
+import io
 import os
 import sys
-import shutil
+import stat
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, FIRST_COMPLETED, wait
+from contextlib import redirect_stdout
 from pathlib import Path
-from datetime import datetime
-import json
+
+from dotenv import load_dotenv
+
+# El clasificador (PyMuPDF + SDK de Gemini) se importa solo al clasificar
+from pdf_utils import iter_pdfs, list_result_files, count_results, hash_file, copy_file, write_json
 
 try:
-    from rich.console import Console
+    import termios
+    import tty
+    TERMIOS_AVAILABLE = True
+except ImportError:
+    TERMIOS_AVAILABLE = False
+
+try:
+    import msvcrt
+    MSVCRT_AVAILABLE = True
+except ImportError:
+    MSVCRT_AVAILABLE = False
+
+try:
+    from rich.console import Console, Group
     from rich.panel import Panel
     from rich.table import Table
     from rich.text import Text
-    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
     from rich.prompt import Prompt, Confirm
-    from rich.layout import Layout
     from rich.align import Align
-    from rich.live import Live
     from rich import box
-    from colorama import init, Fore, Back, Style
+    from colorama import just_fix_windows_console, Fore, Back, Style
     RICH_AVAILABLE = True
 except ImportError:
     RICH_AVAILABLE = False
-    from colorama import init, Fore, Back, Style
-
-# Inicializar colorama
-init(autoreset=True)
-
-# Importar nuestro clasificador
-from pdf_classifier import PDFClassifier
+    from colorama import just_fix_windows_console, Fore, Back, Style
+
+# Inicializar colorama: solo envuelve stdout en las consolas de Windows sin soporte ANSI
+# (en el resto de plataformas cada escritura va directo al terminal). Sin autoreset,
+# los textos con color terminan con Style.RESET_ALL explícito.
+just_fix_windows_console()
+
+# Cargar variables de entorno (antes llegaban con el import de pdf_classifier)
+load_dotenv()
+
+# Lleva el cursor al inicio, borra la pantalla y el historial de scroll (lo mismo
+# que escribe `clear`). En las consolas antiguas de Windows la traduce colorama.
+LIMPIAR_PANTALLA = "\x1b[H\x1b[2J\x1b[3J"
+
+# Para repintar encima sin borrar antes: cursor al inicio, borrar el resto de
+# cada línea y borrar desde el cursor hasta el final de la pantalla
+CURSOR_INICIO = "\x1b[H"
+BORRAR_LINEA = "\x1b[K"
+BORRAR_HASTA_EL_FINAL = "\x1b[J"
+
+# Color de colorama equivalente a cada color de Rich usado en los mensajes
+COLORES_SIMPLES = {
+    "red": Fore.RED,
+    "green": Fore.GREEN,
+    "yellow": Fore.YELLOW,
+    "blue": Fore.BLUE,
+    "magenta": Fore.MAGENTA,
+    "cyan": Fore.CYAN,
+}
+
+# Filas de la tabla de resultados: (clave en stats, etiqueta, estilo de la etiqueta, estilo del valor)
+FILAS_RESULTADOS = (
+    ("total_files", "📁 Archivos totales", "cyan", "bright_white"),
+    ("processed", "✅ Procesados exitosamente", "green", "bright_green"),
+    ("errors", "❌ Errores", "red", "bright_red"),
+)
+FILAS_ORGANIZACION = (
+    ("successfully_organized", "🗂️ Organizados por tema", "magenta", "bright_magenta"),
+    ("moved_to_unclassified", "❓ Movidos a 'no_clasificados'", "yellow", "bright_yellow"),
+    ("folders_created", "📁 Carpetas creadas", "blue", "bright_blue"),
+)
+
+# Hilos para copiar PDFs en la recolección recursiva (trabajo de E/S: más hilos que núcleos)
+HILOS_COPIA = min(32, (os.cpu_count() or 1) * 4)
+
+# Opciones del menú principal y respuestas aceptadas en las confirmaciones simples
+OPCIONES_MENU = frozenset("01234567")
+RESPUESTAS_SI = frozenset({"s", "si", "sí", "y", "yes"})
+RESPUESTAS_NO = frozenset({"n", "no"})
+
+# A partir de esta cantidad de filas el listado de resultados se muestra como texto plano
+MAX_FILAS_TABLA = 100
 
 class MenuColorido:
     def __init__(self):
@@ -41,19 +104,286 @@ class MenuColorido:
         self.classifier = None
         self.carpeta_actual = None
 
+        # La API key se consulta al iniciar y solo se vuelve a leer en la configuración avanzada
+        self._api_key_present = bool(os.environ.get('GOOGLE_API_KEY'))
+
+        # Cantidad de PDFs por carpeta, según (ruta, mtime) de la carpeta
+        self._pdf_count_cache = {}
+
+        # Cantidad de clasificaciones de los resultados sin el dato en el nombre, según (ruta, mtime, tamaño)
+        self._result_count_cache = {}
+
+        # Los elementos fijos de la interfaz se construyen una sola vez y se reutilizan
+        if RICH_AVAILABLE:
+            self._banner_panel = self._crear_banner_rich()
+            self._banner_ancho = None
+            self._banner_texto = self._banner_ansi()
+            self._ayuda_panel = self._crear_ayuda_rich()
+            self._menu_panels = {}  # (api_configurada, carpeta_seleccionada) -> Panel
+            self._progress = None  # Barra de progreso de la clasificación (se crea al usarla)
+            # Textos fijos de las pantallas, creados como Text (sin markup que parsear en cada uso)
+            self._textos = {
+                clave: Text(etiqueta, style=estilo)
+                for clave, etiqueta, estilo, _ in FILAS_RESULTADOS + FILAS_ORGANIZACION
+            }
+            self._textos.update({
+                "success_rate": Text("📊 Tasa de éxito", style="blue"),
+                "already_classified": Text("⏭️  Ya clasificados (omitidos)", style="dim"),
+                "separador_metrica": Text("─" * 35, style="dim"),
+                "separador_valor": Text("─" * 15, style="dim"),
+                "titulo_resultados": Text(" 🎉 RESULTADOS DE LA CLASIFICACIÓN 🎉 ", style="bold white on green"),
+                "linea_resultados": Text("\n" + "▓" * 80, style="bright_green"),
+                "titulo_anteriores": Text("\n📊 RESULTADOS ANTERIORES", style="bold blue"),
+                "titulo_configuracion": Text("\n⚙️ CONFIGURACIÓN AVANZADA", style="bold blue"),
+            })
+            # Prompt del menú principal: su texto se parsea una vez y no en cada vuelta del menú
+            self._prompt_menu = Prompt(
+                "\n[bold bright_yellow on blue] Selecciona una opción (0-7) [/bold bright_yellow on blue]",
+                console=self.console,
+                choices=sorted(OPCIONES_MENU),
+                show_default=True
+            )
+
+        # La variante (Rich o simple) de cada elemento de la interfaz se elige una
+        # sola vez aquí, en lugar de consultar RICH_AVAILABLE en cada llamada
+        if RICH_AVAILABLE:
+            self.mostrar_banner = self._mostrar_banner_rich
+            self.imprimir_menu_principal = self._imprimir_menu_rich
+            self.pedir_opcion = self._pedir_opcion_rich
+            self.mostrar_resultados = self._mostrar_resultados_rich
+            self.mensaje = self._mensaje_rich
+            self.mensajes = self._mensajes_rich
+            self.preguntar = self._preguntar_rich
+        else:
+            self.mostrar_banner = self._mostrar_banner_simple
+            self.imprimir_menu_principal = self._imprimir_menu_simple
+            self.pedir_opcion = self._pedir_opcion_simple
+            self.mostrar_resultados = self._mostrar_resultados_simple
+            self.mensaje = self._mensaje_simple
+            self.mensajes = self._mensajes_simple
+            self.preguntar = self._preguntar_simple
+
+        # Las secuencias para borrar y repintar la pantalla solo se escriben en un terminal
+        # (con la salida redirigida a un archivo o a un pipe solo ensuciarían el texto)
+        self._es_terminal = sys.stdout.isatty()
+        # Lectura de una sola tecla (sin Enter) si la entrada es un terminal
+        self._lectura_tecla = sys.stdin.isatty() and (TERMIOS_AVAILABLE or MSVCRT_AVAILABLE)
+
+        # Última pantalla principal renderizada y el estado con el que se generó
+        self._pantalla_principal = None
+        self._estado_pantalla = None
+
+    def _emitir(self, lineas):
+        """
+        Escribe varias líneas de la interfaz simple con una sola escritura a stdout.
+
+        Args:
+            lineas: Líneas a mostrar (pueden incluir códigos de color de colorama)
+        """
+        # Cada línea termina con RESET_ALL para no arrastrar el color a la siguiente
+        sys.stdout.write("".join(f"{linea}{Style.RESET_ALL}\n" for linea in lineas))
+        sys.stdout.flush()
+
+    def _mensaje_rich(self, texto, estilo):
+        """
+        Muestra un mensaje de una línea con Rich.
+
+        Args:
+            texto: Mensaje a mostrar
+            estilo: Estilo de Rich (por ejemplo "red" o "bold blue")
+        """
+        # Como Text el estilo se aplica directo, sin armar ni analizar markup en cada
+        # mensaje (y sin que un "[" en una ruta se tome por una etiqueta)
+        self.console.print(Text(texto, style=estilo))
+
+    def _mensajes_rich(self, lineas):
+        """
+        Muestra varios mensajes seguidos con un único console.print.
+
+        Args:
+            lineas: Pares (texto, estilo de Rich)
+        """
+        self.console.print(Group(*(Text(texto, style=estilo) for texto, estilo in lineas)))
+
+    @staticmethod
+    def _color_simple(estilo):
+        """
+        Traduce un estilo de Rich ("red", "bold blue", ...) a códigos de colorama.
+
+        Args:
+            estilo: Estilo de Rich
+
+        Returns:
+            Prefijo de color para la interfaz simple
+        """
+        negrita, _, color = estilo.rpartition(" ")
+        return COLORES_SIMPLES[color] + (Style.BRIGHT if negrita else "")
+
+    def _mensaje_simple(self, texto, estilo):
+        """
+        Muestra un mensaje de una línea con colorama.
+
+        Args:
+            texto: Mensaje a mostrar
+            estilo: Estilo de Rich, traducido al color equivalente de colorama
+        """
+        print(self._color_simple(estilo) + texto + Style.RESET_ALL, flush=True)
+
+    def _mensajes_simple(self, lineas):
+        """
+        Muestra varios mensajes seguidos con una sola escritura.
+
+        Args:
+            lineas: Pares (texto, estilo de Rich)
+        """
+        self._emitir(self._color_simple(estilo) + texto for texto, estilo in lineas)
+
+    def _preguntar_rich(self, texto, estilo, default=None):
+        """
+        Pide un valor al usuario con el prompt de Rich.
+
+        Args:
+            texto: Pregunta a mostrar
+            estilo: Estilo de Rich de la pregunta
+            default: Valor usado si el usuario no escribe nada
+
+        Returns:
+            Respuesta del usuario
+        """
+        pregunta = f"\n[{estilo}]{texto}[/{estilo}]"
+        if default is None:
+            return Prompt.ask(pregunta)
+        return Prompt.ask(pregunta, default=default)
+
+    def _preguntar_simple(self, texto, estilo, default=None):
+        """
+        Pide un valor al usuario con input().
+
+        Args:
+            texto: Pregunta a mostrar
+            estilo: Estilo de Rich, traducido al color equivalente de colorama
+            default: Valor usado si el usuario no escribe nada
+
+        Returns:
+            Respuesta del usuario
+        """
+        sufijo = f" (default={default})" if default is not None else ""
+        respuesta = input(self._color_simple(estilo) + f"\n{texto}{sufijo}: " + Style.RESET_ALL)
+        return respuesta or default or ""
+
+    @staticmethod
+    def _leer_tecla():
+        """
+        Lee una sola tecla sin esperar Enter ni mostrarla.
+
+        En POSIX usa el modo cbreak de termios y en Windows msvcrt.getwch().
+        Solo debe llamarse si la entrada es un terminal (ver _lectura_tecla).
+
+        Returns:
+            Carácter leído ("" para teclas especiales como flechas o F1)
+        """
+        if MSVCRT_AVAILABLE:
+            tecla = msvcrt.getwch()
+            if tecla in ("\x00", "\xe0"):
+                msvcrt.getwch()  # Segunda mitad de una tecla especial
+                return ""
+            if tecla == "\x03":
+                raise KeyboardInterrupt
+            return tecla
+
+        fd = sys.stdin.fileno()
+        anterior = termios.tcgetattr(fd)
+        try:
+            tty.setcbreak(fd)
+            dato = os.read(fd, 1)
+            # Descartar el resto de teclas con varios bytes (flechas, F1...)
+            termios.tcflush(fd, termios.TCIFLUSH)
+        finally:
+            termios.tcsetattr(fd, termios.TCSADRAIN, anterior)
+
+        if not dato:
+            raise EOFError
+        return dato.decode("ascii", errors="ignore")
+
+    def _esperar_tecla(self, salto_linea=True):
+        """
+        Espera a que el usuario presione una tecla para continuar.
+
+        En un terminal basta una tecla (no hace falta Enter); con la entrada
+        redirigida vuelve a input().
+
+        Args:
+            salto_linea: Si se deja una línea en blanco antes del mensaje
+        """
+        prefijo = "\n" if salto_linea else ""
+        if not self._lectura_tecla:
+            input(prefijo + "Presiona Enter para continuar...")
+            return
+
+        sys.stdout.write(prefijo + "Presiona una tecla para continuar...")
+        sys.stdout.flush()
+        self._leer_tecla()
+        sys.stdout.write("\n")
+
     def limpiar_pantalla(self):
         """Limpia la pantalla del terminal."""
-        os.system('clear' if os.name == 'posix' else 'cls')
+        if not self._es_terminal:
+            return
+
+        # Secuencia ANSI en lugar de os.system('clear'): sin lanzar un proceso
+        sys.stdout.write(LIMPIAR_PANTALLA)
+        sys.stdout.flush()
+
+    def _renderizar_pantalla_principal(self):
+        """
+        Renderiza el banner y el menú principal a texto (con sus códigos ANSI).
 
-    def mostrar_banner(self):
-        """Muestra el banner principal del programa."""
+        Cada línea termina borrando el resto de la línea del terminal, para
+        poder escribir la pantalla encima de la anterior.
+
+        Returns:
+            Pantalla lista para escribir en stdout
+        """
         if RICH_AVAILABLE:
-            self._mostrar_banner_rich()
+            with self.console.capture() as captura:
+                self.imprimir_menu_principal()
+            pantalla = self._banner_ansi() + captura.get()
+        else:
+            buffer = io.StringIO()
+            with redirect_stdout(buffer):
+                self.mostrar_banner()
+                self.imprimir_menu_principal()
+            pantalla = buffer.getvalue()
+
+        if not self._es_terminal:
+            return pantalla
+        return pantalla.replace("\n", BORRAR_LINEA + "\n")
+
+    def mostrar_pantalla_principal(self):
+        """Muestra el banner y el menú principal ocupando toda la pantalla."""
+        # La pantalla solo se vuelve a renderizar si cambió algo de lo que muestra
+        estado = (
+            self.carpeta_actual,
+            self._api_key_present,
+            self.console.width if RICH_AVAILABLE else None,
+        )
+        if estado != self._estado_pantalla:
+            self._pantalla_principal = self._renderizar_pantalla_principal()
+            self._estado_pantalla = estado
+            inicio = LIMPIAR_PANTALLA
         else:
-            self._mostrar_banner_simple()
+            # Mismo contenido: se escribe encima desde el inicio, sin borrar antes toda
+            # la pantalla (evita el parpadeo), y se borra lo que quede debajo
+            inicio = CURSOR_INICIO
 
-    def _mostrar_banner_rich(self):
-        """Banner con Rich (colorido y estilizado)."""
+        if not self._es_terminal:
+            sys.stdout.write(self._pantalla_principal)
+        else:
+            sys.stdout.write(inicio + self._pantalla_principal + BORRAR_HASTA_EL_FINAL)
+        sys.stdout.flush()
+
+    def _crear_banner_rich(self):
+        """Construye el panel del banner (se llama una vez, desde __init__)."""
         # Banner principal con gradientes de colores
         banner_text = Text.from_markup("""
 [bold bright_cyan]    ██████╗ ██████╗ ███████╗[/bold bright_cyan][bold magenta]     ██████╗██╗      █████╗ ███████╗███████╗██╗███████╗██╗███████╗██████╗[/bold magenta]
@@ -81,31 +411,60 @@ class MenuColorido:
             padding=(1, 2)
         )
 
-        self.console.print(panel)
-
         # Línea decorativa adicional
         decorative_line = "─" * 80
-        self.console.print(f"[bright_blue]{decorative_line}[/bright_blue]")
-        self.console.print()
+
+        return Group(panel, f"[bright_blue]{decorative_line}[/bright_blue]", "")
+
+    def _banner_ansi(self):
+        """
+        Devuelve el banner ya renderizado a texto con códigos ANSI.
+
+        Se renderiza una vez y solo se vuelve a generar si cambia el ancho del terminal.
+
+        Returns:
+            Banner listo para escribir en stdout
+        """
+        if self._banner_ancho != self.console.width:
+            with self.console.capture() as captura:
+                self.console.print(self._banner_panel)
+            self._banner_texto = captura.get()
+            self._banner_ancho = self.console.width
+        return self._banner_texto
+
+    def _mostrar_banner_rich(self):
+        """Banner con Rich (colorido y estilizado)."""
+        # Se escribe el texto pre-renderizado: Rich no vuelve a procesar el panel
+        sys.stdout.write(self._banner_ansi())
+        sys.stdout.flush()
 
     def _mostrar_banner_simple(self):
         """Banner simple sin Rich."""
-        print(Fore.CYAN + Style.BRIGHT + "=" * 70)
-        print(Fore.YELLOW + Style.BRIGHT + "🚀   CLASIFICADOR INTELIGENTE DE PDFs   🚀")
-        print(Fore.GREEN + "📚   Organiza automáticamente tus documentos por tema")
-        print(Fore.BLUE + "🤖   Powered by Google Gemini AI")
-        print(Fore.CYAN + Style.BRIGHT + "=" * 70)
-        print()
+        self._emitir([
+            Fore.CYAN + Style.BRIGHT + "=" * 70,
+            Fore.YELLOW + Style.BRIGHT + "🚀   CLASIFICADOR INTELIGENTE DE PDFs   🚀",
+            Fore.GREEN + "📚   Organiza automáticamente tus documentos por tema",
+            Fore.BLUE + "🤖   Powered by Google Gemini AI",
+            Fore.CYAN + Style.BRIGHT + "=" * 70,
+            "",
+        ])
 
     def mostrar_menu_principal(self):
-        """Muestra el menú principal de opciones."""
-        if RICH_AVAILABLE:
-            return self._mostrar_menu_rich()
-        else:
-            return self._mostrar_menu_simple()
+        """Muestra el menú principal de opciones y devuelve la opción elegida."""
+        self.imprimir_menu_principal()
+        return self.pedir_opcion()
 
-    def _mostrar_menu_rich(self):
-        """Menú principal con Rich."""
+    def _crear_menu_rich(self, api_configurada, carpeta_seleccionada):
+        """
+        Construye el panel del menú principal para un estado dado.
+
+        Args:
+            api_configurada: Si la API key está configurada
+            carpeta_seleccionada: Si hay una carpeta de PDFs seleccionada
+
+        Returns:
+            Panel listo para imprimir
+        """
         # Crear tabla con diseño más atractivo
         table = Table(
             show_header=False,
@@ -120,19 +479,23 @@ class MenuColorido:
         table.add_column("Estado", style="bold yellow", width=20, justify="center")
 
         # Estado de configuración con mejores visuales
-        api_status = "[green]✅ Configurado[/green]" if os.getenv('GOOGLE_API_KEY') else "[red]❌ Falta API Key[/red]"
-        carpeta_status = f"[green]📁 Seleccionada[/green]" if self.carpeta_actual else "[red]❌ No seleccionada[/red]"
+        api_status = "[green]✅ Configurado[/green]" if api_configurada else "[red]❌ Falta API Key[/red]"
+        carpeta_status = f"[green]📁 Seleccionada[/green]" if carpeta_seleccionada else "[red]❌ No seleccionada[/red]"
 
         # Filas del menú con colores vibrantes
-        table.add_row("[bold bright_cyan]1[/bold bright_cyan]", "[cyan]🗂️  Seleccionar carpeta de PDFs[/cyan]", carpeta_status)
-        table.add_row("[bold bright_cyan]2[/bold bright_cyan]", "[blue]🔍 Clasificar PDFs únicamente[/blue]", "")
-        table.add_row("[bold bright_cyan]3[/bold bright_cyan]", "[green]🗂️  Clasificar y organizar automáticamente[/green]", "[yellow]⭐ Recomendado[/yellow]")
-        table.add_row("[bold bright_cyan]4[/bold bright_cyan]", "[bright_magenta]📂 Recolectar PDFs recursivamente[/bright_magenta]", "[bright_green]🚀 Nuevo[/bright_green]")
-        table.add_row("[bold bright_cyan]5[/bold bright_cyan]", "[magenta]📊 Ver resultados anteriores[/magenta]", "")
-        table.add_row("[bold bright_cyan]6[/bold bright_cyan]", "[yellow]⚙️  Configuración avanzada[/yellow]", api_status)
-        table.add_row("[bold bright_cyan]7[/bold bright_cyan]", "[white]❓ Ayuda y ejemplos[/white]", "")
-        table.add_row("", "", "")  # Separador
-        table.add_row("[bold red]0[/bold red]", "[red]🚪 Salir[/red]", "")
+        filas = [
+            ("[bold bright_cyan]1[/bold bright_cyan]", "[cyan]🗂️  Seleccionar carpeta de PDFs[/cyan]", carpeta_status),
+            ("[bold bright_cyan]2[/bold bright_cyan]", "[blue]🔍 Clasificar PDFs únicamente[/blue]", ""),
+            ("[bold bright_cyan]3[/bold bright_cyan]", "[green]🗂️  Clasificar y organizar automáticamente[/green]", "[yellow]⭐ Recomendado[/yellow]"),
+            ("[bold bright_cyan]4[/bold bright_cyan]", "[bright_magenta]📂 Recolectar PDFs recursivamente[/bright_magenta]", "[bright_green]🚀 Nuevo[/bright_green]"),
+            ("[bold bright_cyan]5[/bold bright_cyan]", "[magenta]📊 Ver resultados anteriores[/magenta]", ""),
+            ("[bold bright_cyan]6[/bold bright_cyan]", "[yellow]⚙️  Configuración avanzada[/yellow]", api_status),
+            ("[bold bright_cyan]7[/bold bright_cyan]", "[white]❓ Ayuda y ejemplos[/white]", ""),
+            ("", "", ""),  # Separador
+            ("[bold red]0[/bold red]", "[red]🚪 Salir[/red]", ""),
+        ]
+        for fila in filas:
+            table.add_row(*fila)
 
         # Panel principal con gradientes
         panel = Panel(
@@ -143,138 +506,176 @@ class MenuColorido:
             expand=False
         )
 
+        return panel
+
+    def _imprimir_menu_rich(self):
+        """Menú principal con Rich."""
+        # Solo hay cuatro variantes del menú según el estado: se construyen una vez cada una
+        estado = (self._api_key_present, bool(self.carpeta_actual))
+        panel = self._menu_panels.get(estado)
+        if panel is None:
+            panel = self._menu_panels[estado] = self._crear_menu_rich(*estado)
+
         self.console.print(panel)
 
-        # Prompt estilizado
-        return Prompt.ask(
-            "\n[bold bright_yellow on blue] Selecciona una opción (0-7) [/bold bright_yellow on blue]",
-            choices=["0", "1", "2", "3", "4", "5", "6", "7"],
-            default="3",
-            show_default=True
-        )
+    def _pedir_opcion_rich(self):
+        """Prompt estilizado del menú principal."""
+        return self._prompt_menu(default="3")
 
-    def _mostrar_menu_simple(self):
+    def _imprimir_menu_simple(self):
         """Menú principal simple."""
-        print(Fore.GREEN + Style.BRIGHT + "📋 MENÚ PRINCIPAL")
-        print(Fore.CYAN + "=" * 50)
-
         # Estado
-        api_status = "✅" if os.getenv('GOOGLE_API_KEY') else "❌"
+        api_status = "✅" if self._api_key_present else "❌"
         carpeta_status = f"📁 {self.carpeta_actual}" if self.carpeta_actual else "❌"
 
-        print(f"1. 🗂️  Seleccionar carpeta de PDFs          {carpeta_status}")
-        print(f"2. 🔍 Clasificar PDFs únicamente")
-        print(f"3. 🗂️  Clasificar y organizar automáticamente  ⭐ Recomendado")
-        print(f"4. 📂 Recolectar PDFs recursivamente      🚀 Nuevo")
-        print(f"5. 📊 Ver resultados anteriores")
-        print(f"6. ⚙️  Configuración avanzada              {api_status}")
-        print(f"7. ❓ Ayuda y ejemplos")
-        print(f"0. 🚪 Salir")
-        print(Fore.CYAN + "=" * 50)
-
+        self._emitir([
+            Fore.GREEN + Style.BRIGHT + "📋 MENÚ PRINCIPAL",
+            Fore.CYAN + "=" * 50,
+            f"1. 🗂️  Seleccionar carpeta de PDFs          {carpeta_status}",
+            f"2. 🔍 Clasificar PDFs únicamente",
+            f"3. 🗂️  Clasificar y organizar automáticamente  ⭐ Recomendado",
+            f"4. 📂 Recolectar PDFs recursivamente      🚀 Nuevo",
+            f"5. 📊 Ver resultados anteriores",
+            f"6. ⚙️  Configuración avanzada              {api_status}",
+            f"7. ❓ Ayuda y ejemplos",
+            f"0. 🚪 Salir",
+            Fore.CYAN + "=" * 50,
+        ])
+
+    def _pedir_opcion_simple(self):
+        """
+        Pide la opción del menú principal simple.
+
+        En un terminal responde a la primera tecla válida (Enter elige la opción 3)
+        e ignora las demás en silencio; con la entrada redirigida lee líneas.
+        """
+        prompt = Fore.YELLOW + "Selecciona una opción (0-7, default=3): " + Style.RESET_ALL
+
+        if not self._lectura_tecla:
+            while True:
+                opcion = input(prompt).strip()
+                if not opcion:
+                    return "3"
+                if opcion in OPCIONES_MENU:
+                    return opcion
+                print(Fore.RED + "❌ Opción inválida. Intenta de nuevo." + Style.RESET_ALL)
+
+        sys.stdout.write(prompt)
+        sys.stdout.flush()
         while True:
-            opcion = input(Fore.YELLOW + "Selecciona una opción (0-7, default=3): ").strip()
-            if not opcion:
-                return "3"
-            if opcion in ["0", "1", "2", "3", "4", "5", "6", "7"]:
-                return opcion
-            print(Fore.RED + "❌ Opción inválida. Intenta de nuevo.")
+            tecla = self._leer_tecla()
+            if tecla in ("\r", "\n"):
+                tecla = "3"
+            if tecla in OPCIONES_MENU:
+                sys.stdout.write(tecla + "\n")
+                return tecla
 
     def seleccionar_carpeta(self):
         """Permite al usuario seleccionar una carpeta de PDFs."""
-        if RICH_AVAILABLE:
-            self.console.print("\n[bold blue]📁 SELECCIÓN DE CARPETA[/bold blue]")
-        else:
-            print(Fore.BLUE + Style.BRIGHT + "\n📁 SELECCIÓN DE CARPETA")
+        self.mensaje("\n📁 SELECCIÓN DE CARPETA", "bold blue")
 
         while True:
-            if RICH_AVAILABLE:
-                carpeta = Prompt.ask("\n[yellow]Introduce la ruta de la carpeta con PDFs[/yellow]")
-            else:
-                carpeta = input(Fore.YELLOW + "\nIntroduce la ruta de la carpeta con PDFs: ")
+            carpeta = self.preguntar("Introduce la ruta de la carpeta con PDFs", "yellow")
 
             if not carpeta:
                 continue
 
             path = Path(carpeta).expanduser()
 
-            if not path.exists():
-                if RICH_AVAILABLE:
-                    self.console.print(f"[red]❌ La carpeta no existe: {path}[/red]")
-                else:
-                    print(Fore.RED + f"❌ La carpeta no existe: {path}")
+            # Un solo stat responde si existe, si es carpeta y su mtime
+            try:
+                st = path.stat()
+            except OSError:
+                self.mensaje(f"❌ La carpeta no existe: {path}", "red")
                 continue
 
-            if not path.is_dir():
-                if RICH_AVAILABLE:
-                    self.console.print(f"[red]❌ No es una carpeta válida: {path}[/red]")
-                else:
-                    print(Fore.RED + f"❌ No es una carpeta válida: {path}")
+            if not stat.S_ISDIR(st.st_mode):
+                self.mensaje(f"❌ No es una carpeta válida: {path}", "red")
                 continue
 
-            # Contar PDFs
-            pdfs = list(path.glob("*.pdf"))
+            # Contar PDFs (si la carpeta no cambió desde la última vez, no se vuelve a leer)
+            clave = (str(path), st.st_mtime_ns)
+            num_pdfs = self._pdf_count_cache.get(clave)
+            if num_pdfs is None:
+                num_pdfs = self._pdf_count_cache[clave] = sum(1 for _ in iter_pdfs(path))
 
-            if not pdfs:
-                if RICH_AVAILABLE:
-                    self.console.print(f"[red]❌ No se encontraron archivos PDF en: {path}[/red]")
-                else:
-                    print(Fore.RED + f"❌ No se encontraron archivos PDF en: {path}")
+            if not num_pdfs:
+                self.mensaje(f"❌ No se encontraron archivos PDF en: {path}", "red")
                 continue
 
             self.carpeta_actual = str(path)
 
-            if RICH_AVAILABLE:
-                self.console.print(f"\n[green]✅ Carpeta seleccionada: {path}[/green]")
-                self.console.print(f"[blue]📊 Se encontraron {len(pdfs)} archivos PDF[/blue]")
-            else:
-                print(Fore.GREEN + f"\n✅ Carpeta seleccionada: {path}")
-                print(Fore.BLUE + f"📊 Se encontraron {len(pdfs)} archivos PDF")
+            self.mensajes([
+                (f"\n✅ Carpeta seleccionada: {path}", "green"),
+                (f"📊 Se encontraron {num_pdfs} archivos PDF", "blue"),
+            ])
 
-            input("\nPresiona Enter para continuar...")
+            self._esperar_tecla()
             break
 
     def mostrar_progreso_clasificacion(self, total_archivos, batch_size):
-        """Muestra una barra de progreso durante la clasificación."""
+        """
+        Prepara la barra de progreso de la clasificación.
+
+        El Progress de Rich se crea la primera vez y se reutiliza en las
+        clasificaciones siguientes (solo se agregan y quitan tareas).
+
+        Args:
+            total_archivos: PDFs a clasificar
+            batch_size: Tamaño del lote
+
+        Returns:
+            Progress de Rich, o None en la interfaz simple
+        """
         if not RICH_AVAILABLE:
-            print(Fore.YELLOW + f"🔄 Procesando {total_archivos} archivos en lotes de {batch_size}...")
+            self.mensaje(f"🔄 Procesando {total_archivos} archivos en lotes de {batch_size}...", "yellow")
             return None
 
-        progress = Progress(
-            SpinnerColumn(),
-            TextColumn("[progress.description]{task.description}"),
-            BarColumn(),
-            TaskProgressColumn(),
-            console=self.console
-        )
+        return self._obtener_progreso()
+
+    def _obtener_progreso(self):
+        """
+        Devuelve la barra de progreso de Rich compartida (la crea la primera vez).
+
+        Se redibuja a 4 Hz desde su propio hilo: los avances solo actualizan
+        contadores y nunca fuerzan un redibujado.
+
+        Returns:
+            Progress de Rich
+        """
+        if self._progress is None:
+            from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
+            self._progress = Progress(
+                SpinnerColumn(),
+                # Sin markup: la descripción no se vuelve a analizar en cada refresco
+                TextColumn("{task.description}", style="progress.description", markup=False),
+                BarColumn(),
+                TaskProgressColumn(),
+                console=self.console,
+                transient=True,
+                refresh_per_second=4
+            )
 
-        return progress
+        return self._progress
 
     def ejecutar_clasificacion(self, organizar=True):
         """Ejecuta el proceso de clasificación con interfaz visual."""
         if not self.carpeta_actual:
-            if RICH_AVAILABLE:
-                self.console.print("[red]❌ Primero debes seleccionar una carpeta de PDFs[/red]")
-            else:
-                print(Fore.RED + "❌ Primero debes seleccionar una carpeta de PDFs")
-            input("Presiona Enter para continuar...")
+            self.mensaje("❌ Primero debes seleccionar una carpeta de PDFs", "red")
+            self._esperar_tecla(salto_linea=False)
             return
 
-        if not os.getenv('GOOGLE_API_KEY'):
-            if RICH_AVAILABLE:
-                self.console.print("[red]❌ API Key de Google Gemini no configurada[/red]")
-            else:
-                print(Fore.RED + "❌ API Key de Google Gemini no configurada")
-            input("Presiona Enter para continuar...")
+        if not self._api_key_present:
+            self.mensaje("❌ API Key de Google Gemini no configurada", "red")
+            self._esperar_tecla(salto_linea=False)
             return
 
         try:
             # Crear clasificador
-            if RICH_AVAILABLE:
-                batch_size = int(Prompt.ask("\n[yellow]Tamaño del lote[/yellow]", default="5"))
-            else:
-                batch_size_input = input(Fore.YELLOW + "\nTamaño del lote (default=5): ")
-                batch_size = int(batch_size_input) if batch_size_input else 5
+            batch_size = int(self.preguntar("Tamaño del lote", "yellow", default="5"))
+
+            from pdf_classifier import PDFClassifier
 
             self.classifier = PDFClassifier(batch_size=batch_size)
 
@@ -292,50 +693,72 @@ class MenuColorido:
                 if not Confirm.ask("\n[yellow]¿Continuar con la clasificación?[/yellow]", default=True):
                     return
             else:
-                print(Fore.GREEN + "\n⚙️ CONFIGURACIÓN:")
-                print(f"📁 Carpeta: {self.carpeta_actual}")
-                print(f"🔄 Modo: {'Clasificar y Organizar' if organizar else 'Solo Clasificar'}")
-                print(f"📦 Lote: {batch_size}")
-
-                continuar = input("\n¿Continuar? (s/N): ").lower()
-                if continuar not in ['s', 'si', 'sí', 'y', 'yes']:
+                self._emitir([
+                    Fore.GREEN + "\n⚙️ CONFIGURACIÓN:",
+                    f"📁 Carpeta: {self.carpeta_actual}",
+                    f"🔄 Modo: {'Clasificar y Organizar' if organizar else 'Solo Clasificar'}",
+                    f"📦 Lote: {batch_size}",
+                ])
+
+                continuar = input("\n¿Continuar? (s/N): ").strip().lower()
+                if continuar not in RESPUESTAS_SI:
                     return
 
             # Ejecutar clasificación
-            if RICH_AVAILABLE:
-                self.console.print("\n[bold green]🚀 INICIANDO CLASIFICACIÓN...[/bold green]")
-            else:
-                print(Fore.GREEN + Style.BRIGHT + "\n🚀 INICIANDO CLASIFICACIÓN...")
+            self.mensaje("\n🚀 INICIANDO CLASIFICACIÓN...", "bold green")
 
-            if organizar:
-                stats = self.classifier.classify_and_organize(
-                    folder_path=self.carpeta_actual,
-                    output_dir="results",
-                    organize_files=True
-                )
+            # Listar la carpeta una vez: da el total de la barra y se pasa al clasificador
+            pdf_files = list(iter_pdfs(self.carpeta_actual))
+            progreso = self.mostrar_progreso_clasificacion(len(pdf_files), batch_size)
+
+            if progreso is None:
+                stats = self._clasificar(organizar, pdf_files)
             else:
-                stats = self.classifier.classify_pdfs_in_folder(
-                    folder_path=self.carpeta_actual,
-                    output_dir="results"
-                )
+                tarea = progreso.add_task("Clasificando PDFs", total=len(pdf_files))
+                self.classifier.on_batch = lambda n: progreso.update(tarea, advance=n, refresh=False)
+                try:
+                    with progreso:
+                        stats = self._clasificar(organizar, pdf_files)
+                finally:
+                    self.classifier.on_batch = None
+                    progreso.remove_task(tarea)
 
             # Mostrar resultados
             self.mostrar_resultados(stats)
 
         except Exception as e:
-            if RICH_AVAILABLE:
-                self.console.print(f"[red]❌ Error durante la clasificación: {e}[/red]")
-            else:
-                print(Fore.RED + f"❌ Error durante la clasificación: {e}")
-
-        input("\nPresiona Enter para continuar...")
-
-    def mostrar_resultados(self, stats):
-        """Muestra los resultados de la clasificación de forma visual."""
-        if RICH_AVAILABLE:
-            self._mostrar_resultados_rich(stats)
-        else:
-            self._mostrar_resultados_simple(stats)
+            self.mensaje(f"❌ Error durante la clasificación: {e}", "red")
+        finally:
+            # Cada corrida crea su clasificador: se cierra su log para no acumular hilos y archivos
+            if self.classifier is not None:
+                self.classifier.close()
+                self.classifier = None
+
+        self._esperar_tecla()
+
+    def _clasificar(self, organizar, pdf_files):
+        """
+        Clasifica (y opcionalmente organiza) la carpeta actual.
+
+        Args:
+            organizar: Si además se organizan los archivos en carpetas
+            pdf_files: PDFs de la carpeta, ya listados
+
+        Returns:
+            Estadísticas del proceso
+        """
+        if organizar:
+            return self.classifier.classify_and_organize(
+                folder_path=self.carpeta_actual,
+                output_dir="results",
+                organize_files=True,
+                pdf_files=pdf_files
+            )
+        return self.classifier.classify_pdfs_in_folder(
+            folder_path=self.carpeta_actual,
+            output_dir="results",
+            pdf_files=pdf_files
+        )
 
     def _mostrar_resultados_rich(self, stats):
         """Muestra resultados con Rich."""
@@ -349,36 +772,35 @@ class MenuColorido:
         results_table.add_column("Métrica", style="bold bright_cyan", width=35)
         results_table.add_column("Valor", style="bold bright_white", width=15, justify="center")
 
-        # Datos principales con colores
-        results_table.add_row("[cyan]📁 Archivos totales[/cyan]", f"[bright_white]{stats['total_files']}[/bright_white]")
-        results_table.add_row("[green]✅ Procesados exitosamente[/green]", f"[bright_green]{stats['processed']}[/bright_green]")
-        results_table.add_row("[red]❌ Errores[/red]", f"[bright_red]{stats['errors']}[/bright_red]")
+        # Datos principales con colores (etiquetas ya creadas; los valores, como Text sin markup)
+        for clave, _, _, estilo_valor in FILAS_RESULTADOS:
+            results_table.add_row(self._textos[clave], Text(str(stats[clave]), style=estilo_valor))
 
         # Tasa de éxito con color condicional
         success_rate = stats['success_rate']
         success_color = "bright_green" if success_rate >= 90 else "yellow" if success_rate >= 70 else "red"
-        results_table.add_row("[blue]📊 Tasa de éxito[/blue]", f"[{success_color}]{success_rate:.1f}%[/{success_color}]")
+        results_table.add_row(self._textos["success_rate"], Text(f"{success_rate:.1f}%", style=success_color))
+
+        if stats.get('already_classified'):
+            results_table.add_row(self._textos["already_classified"], Text(str(stats['already_classified']), style="dim"))
 
         if 'organization' in stats:
             org_stats = stats['organization']
             # Línea separadora visual
-            results_table.add_row("[dim]" + "─" * 35 + "[/dim]", "[dim]" + "─" * 15 + "[/dim]")
-            results_table.add_row("[magenta]🗂️ Organizados por tema[/magenta]", f"[bright_magenta]{org_stats['successfully_organized']}[/bright_magenta]")
-            results_table.add_row("[yellow]❓ Movidos a 'no_clasificados'[/yellow]", f"[bright_yellow]{org_stats['moved_to_unclassified']}[/bright_yellow]")
-            results_table.add_row("[blue]📁 Carpetas creadas[/blue]", f"[bright_blue]{org_stats['folders_created']}[/bright_blue]")
+            results_table.add_row(self._textos["separador_metrica"], self._textos["separador_valor"])
+            for clave, _, _, estilo_valor in FILAS_ORGANIZACION:
+                results_table.add_row(self._textos[clave], Text(str(org_stats[clave]), style=estilo_valor))
 
         # Panel de resultados con efectos visuales
         panel = Panel(
             results_table,
-            title="[bold white on green] 🎉 RESULTADOS DE LA CLASIFICACIÓN 🎉 [/bold white on green]",
+            title=self._textos["titulo_resultados"],
             border_style="bright_green",
             padding=(1, 2)
         )
 
-        # Línea decorativa superior
-        decorative_line = "▓" * 80
-        self.console.print(f"\n[bright_green]{decorative_line}[/bright_green]")
-        self.console.print(panel)
+        # Línea decorativa superior; todo se imprime junto al final
+        renderables = [self._textos["linea_resultados"], panel]
 
         if 'organized_folder' in stats:
             # Panel adicional para la carpeta de resultados
@@ -387,7 +809,7 @@ class MenuColorido:
                 border_style="bright_blue",
                 padding=(0, 1)
             )
-            self.console.print(folder_panel)
+            renderables.append(folder_panel)
 
         # Panel informativo sobre los logs de API
         if 'log_files' in stats:
@@ -413,189 +835,209 @@ class MenuColorido:
             border_style="bright_yellow",
             padding=(0, 1)
         )
-        self.console.print(log_panel)
+        renderables.append(log_panel)
+
+        self.console.print(Group(*renderables))
 
     def _mostrar_resultados_simple(self, stats):
         """Muestra resultados simples."""
-        print(Fore.GREEN + Style.BRIGHT + "\n🎉 RESULTADOS DE LA CLASIFICACIÓN")
-        print(Fore.CYAN + "=" * 60)
-        print(f"📁 Archivos totales: {stats['total_files']}")
-        print(f"✅ Procesados exitosamente: {stats['processed']}")
-        print(f"❌ Errores: {stats['errors']}")
-        print(f"📊 Tasa de éxito: {stats['success_rate']:.1f}%")
+        lineas = [
+            Fore.GREEN + Style.BRIGHT + "\n🎉 RESULTADOS DE LA CLASIFICACIÓN",
+            Fore.CYAN + "=" * 60,
+            f"📁 Archivos totales: {stats['total_files']}",
+            f"✅ Procesados exitosamente: {stats['processed']}",
+            f"❌ Errores: {stats['errors']}",
+            f"📊 Tasa de éxito: {stats['success_rate']:.1f}%",
+        ]
+
+        if stats.get('already_classified'):
+            lineas.append(f"⏭️  Ya clasificados (omitidos): {stats['already_classified']}")
 
         if 'organization' in stats:
             org_stats = stats['organization']
-            print(Fore.YELLOW + "\n--- ORGANIZACIÓN DE ARCHIVOS ---")
-            print(f"🗂️ Organizados por tema: {org_stats['successfully_organized']}")
-            print(f"❓ Movidos a 'no_clasificados': {org_stats['moved_to_unclassified']}")
-            print(f"📁 Carpetas creadas: {org_stats['folders_created']}")
+            lineas += [
+                Fore.YELLOW + "\n--- ORGANIZACIÓN DE ARCHIVOS ---",
+                f"🗂️ Organizados por tema: {org_stats['successfully_organized']}",
+                f"❓ Movidos a 'no_clasificados': {org_stats['moved_to_unclassified']}",
+                f"📁 Carpetas creadas: {org_stats['folders_created']}",
+            ]
 
         if 'organized_folder' in stats:
-            print(Fore.BLUE + f"\n📂 Archivos organizados en: {stats['organized_folder']}")
+            lineas.append(Fore.BLUE + f"\n📂 Archivos organizados en: {stats['organized_folder']}")
 
         # Información sobre logs
-        print(Fore.YELLOW + "\n📋 LOGS DETALLADOS GENERADOS:")
+        lineas.append(Fore.YELLOW + "\n📋 LOGS DETALLADOS GENERADOS:")
         if 'log_files' in stats:
             log_info = stats['log_files']
-            print(Fore.GREEN + f"• {log_info['api_log']} - Log detallado de todos los requests a la API")
-            print(Fore.BLUE + f"• {log_info['general_log']} - Log general del proceso de clasificación")
-            print(Fore.CYAN + f"• Sesión: {log_info['session_timestamp']}")
-            print(Fore.YELLOW + f"💡 Revisa {log_info['api_log']} para ver qué archivos dieron error en las consultas a la API")
+            lineas += [
+                Fore.GREEN + f"• {log_info['api_log']} - Log detallado de todos los requests a la API",
+                Fore.BLUE + f"• {log_info['general_log']} - Log general del proceso de clasificación",
+                Fore.CYAN + f"• Sesión: {log_info['session_timestamp']}",
+                Fore.YELLOW + f"💡 Revisa {log_info['api_log']} para ver qué archivos dieron error en las consultas a la API",
+            ]
         else:
-            print(Fore.GREEN + "• api_requests_YYYYMMDD_HHMMSS.log - Log detallado de todos los requests a la API")
-            print(Fore.BLUE + "• pdf_classifier_YYYYMMDD_HHMMSS.log - Log general del proceso de clasificación")
-            print(Fore.YELLOW + "💡 Los logs se guardan con timestamp para diferenciar cada sesión")
+            lineas += [
+                Fore.GREEN + "• api_requests_YYYYMMDD_HHMMSS.log - Log detallado de todos los requests a la API",
+                Fore.BLUE + "• pdf_classifier_YYYYMMDD_HHMMSS.log - Log general del proceso de clasificación",
+                Fore.YELLOW + "💡 Los logs se guardan con timestamp para diferenciar cada sesión",
+            ]
 
-    def mostrar_ayuda(self):
-        """Muestra la ayuda del programa."""
-        if RICH_AVAILABLE:
-            # Crear múltiples paneles para mejor organización visual
+        self._emitir(lineas)
+
+    def _crear_ayuda_rich(self):
+        """Construye el panel de ayuda (se llama una vez, desde __init__)."""
+        # Crear múltiples paneles para mejor organización visual
 
-            # Panel de preparación
-            prep_panel = Panel(
-                """[bold bright_cyan]1. Preparación:[/bold bright_cyan]
+        # Panel de preparación
+        prep_panel = Panel(
+            """[bold bright_cyan]1. Preparación:[/bold bright_cyan]
    [green]•[/green] Coloca tus archivos PDF en una carpeta
    [green]•[/green] Asegúrate de tener conexión a internet
    [green]•[/green] Verifica que tu API Key esté configurada""",
-                title="[bold yellow on blue] 🛠️ PREPARACIÓN [/bold yellow on blue]",
-                border_style="bright_cyan",
-                padding=(0, 1)
-            )
+            title="[bold yellow on blue] 🛠️ PREPARACIÓN [/bold yellow on blue]",
+            border_style="bright_cyan",
+            padding=(0, 1)
+        )
 
-            # Panel de proceso
-            process_panel = Panel(
-                """[bold bright_magenta]2. Proceso de clasificación:[/bold bright_magenta]
+        # Panel de proceso
+        process_panel = Panel(
+            """[bold bright_magenta]2. Proceso de clasificación:[/bold bright_magenta]
    [yellow]•[/yellow] El sistema analiza las primeras 20 páginas de cada PDF
    [yellow]•[/yellow] Utiliza Google Gemini AI para clasificar el contenido
    [yellow]•[/yellow] Genera una jerarquía de 3 niveles: General > Subtema > Específico""",
-                title="[bold white on magenta] 🤖 PROCESO IA [/bold white on magenta]",
-                border_style="bright_magenta",
-                padding=(0, 1)
-            )
+            title="[bold white on magenta] 🤖 PROCESO IA [/bold white on magenta]",
+            border_style="bright_magenta",
+            padding=(0, 1)
+        )
 
-            # Panel de organización
-            org_panel = Panel(
-                """[bold bright_green]3. Organización automática:[/bold bright_green]
+        # Panel de organización
+        org_panel = Panel(
+            """[bold bright_green]3. Organización automática:[/bold bright_green]
    [cyan]•[/cyan] Crea carpetas por tema automáticamente
-   [cyan]•[/cyan] Copia los PDFs a sus carpetas correspondientes
+   [cyan]•[/cyan] Copia los PDFs a sus carpetas correspondientes (copias independientes)
    [cyan]•[/cyan] Los archivos problemáticos van a 'no_clasificados'""",
-                title="[bold black on green] 📁 ORGANIZACIÓN [/bold black on green]",
-                border_style="bright_green",
-                padding=(0, 1)
-            )
+            title="[bold black on green] 📁 ORGANIZACIÓN [/bold black on green]",
+            border_style="bright_green",
+            padding=(0, 1)
+        )
 
-            # Panel de resultados
-            results_panel = Panel(
-                """[bold bright_blue]4. Resultados:[/bold bright_blue]
+        # Panel de resultados
+        results_panel = Panel(
+            """[bold bright_blue]4. Resultados:[/bold bright_blue]
    [magenta]•[/magenta] Archivos JSON y CSV con la clasificación
    [magenta]•[/magenta] Logs detallados del proceso
    [magenta]•[/magenta] Estructura de carpetas organizada""",
-                title="[bold white on blue] 📊 RESULTADOS [/bold white on blue]",
-                border_style="bright_blue",
-                padding=(0, 1)
-            )
+            title="[bold white on blue] 📊 RESULTADOS [/bold white on blue]",
+            border_style="bright_blue",
+            padding=(0, 1)
+        )
 
-            # Panel de recolección recursiva
-            recursive_panel = Panel(
-                """[bold bright_yellow]📂 RECOLECCIÓN RECURSIVA (NUEVO):[/bold bright_yellow]
+        # Panel de recolección recursiva
+        recursive_panel = Panel(
+            """[bold bright_yellow]📂 RECOLECCIÓN RECURSIVA (NUEVO):[/bold bright_yellow]
    [cyan]•[/cyan] Busca PDFs en TODAS las subcarpetas automáticamente
-   [cyan]•[/cyan] Copia todos los PDFs a una carpeta única
+   [cyan]•[/cyan] Copia todos los PDFs a una carpeta única (o los enlaza con hardlinks, si lo pides)
    [cyan]•[/cyan] Mantiene registro completo de ubicaciones originales
    [cyan]•[/cyan] Ideal para preparar bibliotecas dispersas antes del análisis
    [cyan]•[/cyan] NO analiza automáticamente (solo recolecta y organiza)""",
-                title="[bold white on bright_yellow] 🚀 RECOLECCIÓN RECURSIVA [/bold white on bright_yellow]",
-                border_style="bright_yellow",
-                padding=(0, 1)
-            )
+            title="[bold white on bright_yellow] 🚀 RECOLECCIÓN RECURSIVA [/bold white on bright_yellow]",
+            border_style="bright_yellow",
+            padding=(0, 1)
+        )
 
-            # Panel de consejos
-            tips_panel = Panel(
-                """[bold bright_red]💡 CONSEJOS IMPORTANTES:[/bold bright_red]
+        # Panel de consejos
+        tips_panel = Panel(
+            """[bold bright_red]💡 CONSEJOS IMPORTANTES:[/bold bright_red]
    [bright_yellow]🎯[/bright_yellow] Usa lotes de 3-7 archivos para mejor rendimiento
    [bright_yellow]📄[/bright_yellow] Los PDFs deben tener texto extraíble (no solo imágenes)
    [bright_yellow]🎯[/bright_yellow] La clasificación mejora con PDFs de contenido claro y específico
    [bright_yellow]⚡[/bright_yellow] Procesa en horarios de menor tráfico para evitar límites de API
    [bright_yellow]📂[/bright_yellow] Usa recolección recursiva para carpetas con subcarpetas""",
-                title="[bold white on red] 💡 CONSEJOS PRO [/bold white on red]",
-                border_style="bright_red",
-                padding=(0, 1)
-            )
+            title="[bold white on red] 💡 CONSEJOS PRO [/bold white on red]",
+            border_style="bright_red",
+            padding=(0, 1)
+        )
 
-            # Panel principal que contiene todo
-            main_help_panel = Panel(
-                f"{prep_panel}\n{process_panel}\n{org_panel}\n{results_panel}\n{recursive_panel}\n{tips_panel}",
-                title="[bold white on bright_blue] ❓ AYUDA Y GUÍA COMPLETA ❓ [/bold white on bright_blue]",
-                border_style="bright_blue",
-                padding=(1, 2)
-            )
+        # Panel principal que contiene todo
+        main_help_panel = Panel(
+            Group(prep_panel, process_panel, org_panel, results_panel, recursive_panel, tips_panel),
+            title="[bold white on bright_blue] ❓ AYUDA Y GUÍA COMPLETA ❓ [/bold white on bright_blue]",
+            border_style="bright_blue",
+            padding=(1, 2)
+        )
 
-            self.console.print(main_help_panel)
+        return main_help_panel
+
+    def mostrar_ayuda(self):
+        """Muestra la ayuda del programa."""
+        if RICH_AVAILABLE:
+            self.console.print(self._ayuda_panel)
         else:
-            print(Fore.BLUE + Style.BRIGHT + "\n❓ AYUDA Y GUÍA DE USO")
-            print(Fore.CYAN + "=" * 50)
-            print("🔍 CÓMO USAR EL CLASIFICADOR")
-            print("\n1. Preparación:")
-            print("   • Coloca tus archivos PDF en una carpeta")
-            print("   • Asegúrate de tener conexión a internet")
-            print("   • Verifica que tu API Key esté configurada")
-            print("\n2. Proceso de clasificación:")
-            print("   • Analiza las primeras 20 páginas de cada PDF")
-            print("   • Utiliza Google Gemini AI para clasificar")
-            print("   • Genera jerarquía de 3 niveles")
-            print("\n3. Organización automática:")
-            print("   • Crea carpetas por tema automáticamente")
-            print("   • Copia PDFs a carpetas correspondientes")
-            print("   • Archivos problemáticos van a 'no_clasificados'")
-
-        input("\nPresiona Enter para continuar...")
+            self._emitir([
+                Fore.BLUE + Style.BRIGHT + "\n❓ AYUDA Y GUÍA DE USO",
+                Fore.CYAN + "=" * 50,
+                "🔍 CÓMO USAR EL CLASIFICADOR",
+                "\n1. Preparación:",
+                "   • Coloca tus archivos PDF en una carpeta",
+                "   • Asegúrate de tener conexión a internet",
+                "   • Verifica que tu API Key esté configurada",
+                "\n2. Proceso de clasificación:",
+                "   • Analiza las primeras 20 páginas de cada PDF",
+                "   • Utiliza Google Gemini AI para clasificar",
+                "   • Genera jerarquía de 3 niveles",
+                "\n3. Organización automática:",
+                "   • Crea carpetas por tema automáticamente",
+                "   • Copia PDFs a carpetas correspondientes (copias independientes)",
+                "   • Archivos problemáticos van a 'no_clasificados'",
+            ])
+
+        self._esperar_tecla()
 
     def recolectar_pdfs_recursivamente(self):
         """Recolecta PDFs de forma recursiva y los copia a una carpeta única."""
         try:
             # Solicitar carpeta raíz
-            if RICH_AVAILABLE:
-                self.console.print("\n[bold magenta]📂 RECOLECCIÓN RECURSIVA DE PDFs[/bold magenta]")
-                self.console.print("[yellow]Esta opción busca PDFs en TODAS las subcarpetas y los copia a una carpeta única[/yellow]")
-                carpeta_raiz = Prompt.ask("\n[cyan]Introduce la ruta de la carpeta raíz[/cyan]")
-            else:
-                print(Fore.MAGENTA + "\n📂 RECOLECCIÓN RECURSIVA DE PDFs")
-                print(Fore.YELLOW + "Esta opción busca PDFs en TODAS las subcarpetas y los copia a una carpeta única")
-                carpeta_raiz = input(Fore.CYAN + "\nIntroduce la ruta de la carpeta raíz: ")
+            self.mensajes([
+                ("\n📂 RECOLECCIÓN RECURSIVA DE PDFs", "bold magenta"),
+                ("Esta opción busca PDFs en TODAS las subcarpetas y los copia a una carpeta única", "yellow"),
+            ])
+            carpeta_raiz = self.preguntar("Introduce la ruta de la carpeta raíz", "cyan")
 
             if not carpeta_raiz:
                 return
 
             path = Path(carpeta_raiz).expanduser()
-            if not path.exists() or not path.is_dir():
-                if RICH_AVAILABLE:
-                    self.console.print(f"[red]❌ La carpeta no existe: {path}[/red]")
-                else:
-                    print(Fore.RED + f"❌ La carpeta no existe: {path}")
-                input("Presiona Enter para continuar...")
+            if not path.is_dir():
+                self.mensaje(f"❌ La carpeta no existe: {path}", "red")
+                self._esperar_tecla(salto_linea=False)
                 return
 
             # Solicitar carpeta de destino
-            if RICH_AVAILABLE:
-                carpeta_destino = Prompt.ask("\n[green]Introduce la ruta de la carpeta destino[/green]", default="pdfs_recolectados")
-            else:
-                carpeta_destino = input(Fore.GREEN + "\nIntroduce la ruta de la carpeta destino (default=pdfs_recolectados): ") or "pdfs_recolectados"
+            carpeta_destino = self.preguntar("Introduce la ruta de la carpeta destino", "green", default="pdfs_recolectados")
 
             destino_path = Path(carpeta_destino).expanduser()
 
+            # Los hardlinks no ocupan espacio ni copian datos, pero comparten el contenido
+            # con el original (editar o anotar uno cambia el otro): solo si se piden
+            if RICH_AVAILABLE:
+                enlazar = Confirm.ask(
+                    "[yellow]¿Enlazar los PDFs a sus originales (hardlink) en lugar de copiarlos?[/yellow]",
+                    default=False
+                )
+            else:
+                enlazar = input("¿Enlazar los PDFs a sus originales (hardlink) en lugar de copiarlos? (s/N): ").strip().lower() in RESPUESTAS_SI
+            accion = "Enlaza al original (hardlink) o copia" if enlazar else "Copia"
+
             # Crear carpeta destino si no existe
             destino_path.mkdir(parents=True, exist_ok=True)
 
-            # Crear clasificador temporal solo para recolección
-            temp_classifier = PDFClassifier()
-
             # Mostrar información del proceso
             if RICH_AVAILABLE:
                 info_panel = Panel(
                     f"[cyan]📁 Carpeta raíz:[/cyan] {path}\n"
                     f"[green]📂 Carpeta destino:[/green] {destino_path}\n"
                     f"[yellow]🔍 Búsqueda:[/yellow] Recursiva en todas las subcarpetas\n"
-                    f"[blue]💾 Acción:[/blue] Solo copia (sin análisis)",
+                    f"[blue]💾 Acción:[/blue] {accion} (sin análisis)",
                     title="[bold green]⚙️ CONFIGURACIÓN DE RECOLECCIÓN[/bold green]",
                     border_style="green"
                 )
@@ -604,90 +1046,53 @@ class MenuColorido:
                 if not Confirm.ask("\n[yellow]¿Continuar con la recolección?[/yellow]", default=True):
                     return
             else:
-                print(Fore.GREEN + "\n⚙️ CONFIGURACIÓN DE RECOLECCIÓN:")
-                print(f"📁 Carpeta raíz: {path}")
-                print(f"📂 Carpeta destino: {destino_path}")
-                print("🔍 Búsqueda: Recursiva en todas las subcarpetas")
-                print("💾 Acción: Solo copia (sin análisis)")
-
-                continuar = input("\n¿Continuar? (S/n): ").lower()
-                if continuar in ['n', 'no']:
+                self._emitir([
+                    Fore.GREEN + "\n⚙️ CONFIGURACIÓN DE RECOLECCIÓN:",
+                    f"📁 Carpeta raíz: {path}",
+                    f"📂 Carpeta destino: {destino_path}",
+                    "🔍 Búsqueda: Recursiva en todas las subcarpetas",
+                    f"💾 Acción: {accion} (sin análisis)",
+                ])
+
+                continuar = input("\n¿Continuar? (S/n): ").strip().lower()
+                if continuar in RESPUESTAS_NO:
                     return
 
             # Recolección de PDFs
+            self.mensaje("\n🔍 RECOLECTANDO PDFs RECURSIVAMENTE...", "bold cyan")
+
+            # Buscar y copiar a la vez: cada PDF se envía a copiar apenas se encuentra
             if RICH_AVAILABLE:
-                self.console.print("\n[bold cyan]🔍 RECOLECTANDO PDFs RECURSIVAMENTE...[/bold cyan]")
+                # El total no se conoce hasta terminar el recorrido: barra sin total
+                progreso = self._obtener_progreso()
+                tarea = progreso.add_task("Recolectando PDFs", total=None)
+                try:
+                    with progreso:
+                        total_files, copied_files, linked_files, location_map = self._copiar_pdfs(
+                            path, destino_path, enlazar=enlazar,
+                            avance=lambda n: progreso.update(tarea, completed=n, refresh=False)
+                        )
+                finally:
+                    progreso.remove_task(tarea)
             else:
-                print(Fore.CYAN + Style.BRIGHT + "\n🔍 RECOLECTANDO PDFs RECURSIVAMENTE...")
-
-            # Buscar todos los PDFs recursivamente
-            pdf_files = list(path.rglob("*.pdf"))
-            total_files = len(pdf_files)
+                total_files, copied_files, linked_files, location_map = self._copiar_pdfs(path, destino_path, enlazar=enlazar)
 
             if total_files == 0:
-                if RICH_AVAILABLE:
-                    self.console.print("[yellow]📭 No se encontraron archivos PDF[/yellow]")
-                else:
-                    print(Fore.YELLOW + "📭 No se encontraron archivos PDF")
-                input("Presiona Enter para continuar...")
+                self.mensaje("📭 No se encontraron archivos PDF", "yellow")
+                self._esperar_tecla(salto_linea=False)
                 return
 
-            if RICH_AVAILABLE:
-                self.console.print(f"[green]📊 Encontrados {total_files} archivos PDF[/green]")
-            else:
-                print(Fore.GREEN + f"📊 Encontrados {total_files} archivos PDF")
-
-            # Copiar archivos y crear mapeo
-            copied_files = 0
-            location_map = {}
-
-            for pdf_file in pdf_files:
-                try:
-                    # Crear nombre único para evitar conflictos
-                    relative_path = pdf_file.relative_to(path)
-                    safe_name = str(relative_path).replace(os.sep, "_")
-
-                    # Agregar numeración si el nombre ya existe
-                    final_name = f"{copied_files:04d}_{safe_name}"
-                    destino_file = destino_path / final_name
-
-                    # Copiar el archivo
-                    shutil.copy2(pdf_file, destino_file)
-
-                    # Guardar mapeo de ubicación original
-                    location_map[final_name] = {
-                        'original_path': str(pdf_file),
-                        'relative_path': str(relative_path),
-                        'parent_folder': str(pdf_file.parent),
-                        'original_name': pdf_file.name
-                    }
-
-                    copied_files += 1
-
-                    if copied_files % 10 == 0:
-                        if RICH_AVAILABLE:
-                            self.console.print(f"[blue]📋 Copiados {copied_files}/{total_files} archivos...[/blue]")
-                        else:
-                            print(Fore.BLUE + f"📋 Copiados {copied_files}/{total_files} archivos...")
-
-                except Exception as e:
-                    if RICH_AVAILABLE:
-                        self.console.print(f"[red]❌ Error copiando {pdf_file}: {e}[/red]")
-                    else:
-                        print(Fore.RED + f"❌ Error copiando {pdf_file}: {e}")
-                    continue
-
             # Guardar mapeo en archivo JSON
             mapping_file = destino_path / "ubicaciones_originales.json"
-            with open(mapping_file, 'w', encoding='utf-8') as f:
-                json.dump(location_map, f, indent=2, ensure_ascii=False)
+            write_json(mapping_file, location_map)
 
             # Mostrar resultados
             if RICH_AVAILABLE:
                 results_panel = Panel(
                     f"[green]✅ Proceso completado exitosamente[/green]\n\n"
                     f"[cyan]📊 Archivos encontrados:[/cyan] {total_files}\n"
-                    f"[green]📁 Archivos copiados:[/green] {copied_files}\n"
+                    f"[green]📁 Archivos recolectados:[/green] {copied_files}\n"
+                    f"[green]🔗 Enlazados (sin copiar datos):[/green] {linked_files}\n"
                     f"[blue]📂 Carpeta destino:[/blue] {destino_path}\n"
                     f"[yellow]🗺️  Mapeo guardado en:[/yellow] ubicaciones_originales.json\n\n"
                     f"[magenta]💡 Ahora puedes usar las opciones 2 o 3 del menú[/magenta]\n"
@@ -697,39 +1102,193 @@ class MenuColorido:
                 )
                 self.console.print(results_panel)
             else:
-                print(Fore.GREEN + Style.BRIGHT + "\n🎉 RECOLECCIÓN COMPLETADA")
-                print(Fore.CYAN + "=" * 60)
-                print(f"📊 Archivos encontrados: {total_files}")
-                print(f"📁 Archivos copiados: {copied_files}")
-                print(f"📂 Carpeta destino: {destino_path}")
-                print(f"🗺️  Mapeo guardado en: ubicaciones_originales.json")
-                print(Fore.MAGENTA + "\n💡 Ahora puedes usar las opciones 2 o 3 del menú")
-                print(Fore.MAGENTA + f"   para clasificar los PDFs en: {destino_path}")
+                self._emitir([
+                    Fore.GREEN + Style.BRIGHT + "\n🎉 RECOLECCIÓN COMPLETADA",
+                    Fore.CYAN + "=" * 60,
+                    f"📊 Archivos encontrados: {total_files}",
+                    f"📁 Archivos recolectados: {copied_files}",
+                    f"🔗 Enlazados (sin copiar datos): {linked_files}",
+                    f"📂 Carpeta destino: {destino_path}",
+                    f"🗺️  Mapeo guardado en: ubicaciones_originales.json",
+                    Fore.MAGENTA + "\n💡 Ahora puedes usar las opciones 2 o 3 del menú",
+                    Fore.MAGENTA + f"   para clasificar los PDFs en: {destino_path}",
+                ])
 
             # Actualizar carpeta actual para facilitar el siguiente paso
             self.carpeta_actual = str(destino_path)
 
         except Exception as e:
-            if RICH_AVAILABLE:
-                self.console.print(f"[red]❌ Error durante la recolección: {e}[/red]")
+            self.mensaje(f"❌ Error durante la recolección: {e}", "red")
+
+        self._esperar_tecla()
+
+    def _copiar_pdfs(self, origen, destino, avance=None, enlazar=False):
+        """
+        Reúne en una carpeta única todos los PDFs de un árbol de carpetas.
+
+        Cada PDF se copia, salvo los que tienen el mismo contenido que otro ya
+        recolectado, que se enlazan a esa copia en lugar de copiarse de nuevo.
+        Solo se hashean (y se leen dos veces) los PDFs cuyo tamaño coincide con
+        el de otro.
+        Con enlazar=True, si el destino está en el mismo sistema de archivos,
+        cada PDF se enlaza (hardlink) a su original: aparece en la carpeta sin
+        leer ni escribir sus datos, pero comparte el contenido con el original.
+        El recorrido y las copias se solapan: cada PDF se envía al pool de hilos
+        en cuanto se encuentra, sin esperar a listar todo el árbol. Las copias
+        pendientes se limitan para no acumular un futuro por cada archivo.
+
+        Args:
+            origen: Carpeta raíz donde buscar PDFs
+            destino: Carpeta donde se copian
+            avance: Función llamada con la cantidad de archivos recolectados hasta el momento
+                    (por defecto se muestra un mensaje cada 10 archivos)
+            enlazar: Si se enlaza cada PDF a su original en lugar de copiarlo
+
+        Returns:
+            Tupla con (encontrados, copiados, enlazados, mapeo_de_ubicaciones)
+        """
+        raiz = str(origen.resolve())
+        # Las rutas se manejan como texto: la relativa sale de recortar este prefijo
+        prefijo_raiz = os.path.join(raiz, "")
+        # La carpeta destino puede estar dentro del árbol: sus PDFs no se vuelven a copiar
+        carpeta_destino = str(destino.resolve())
+        prefijo_destino = os.path.join(carpeta_destino, "")
+
+        total_files = 0
+        copied_files = 0
+        linked_files = 0
+        copiados = {}  # índice de descubrimiento -> (nombre final, datos de ubicación)
+        en_curso = {}  # futuro -> (índice, archivo, ruta relativa, nombre final)
+        copia_por_hash = {}  # hash del contenido -> futuro con la primera copia (None si falló)
+        # tamaño -> [primer archivo, futuro de su copia, futuro que indica que ya se registró su hash]
+        primero_por_tamano = {}
+        bloqueo_hashes = threading.Lock()
+
+        def copiar_primera(pdf_file, destino_file, propia):
+            # Copia el primer archivo con un contenido y avisa a sus duplicados dónde quedó
+            try:
+                copy_file(pdf_file, destino_file)
+            except BaseException:
+                propia.set_result(None)  # Los duplicados se copian cada uno por su cuenta
+                raise
+            propia.set_result(destino_file)
+            return False
+
+        def copiar(pdf_file, destino_file):
+            # Devuelve True si el archivo se enlazó en lugar de copiarse
+            if enlazar:
+                try:
+                    os.link(pdf_file, destino_file)
+                    return True
+                except OSError:
+                    pass  # Otro sistema de archivos o sin soporte de hardlinks: se copia
+
+            # Solo pueden ser iguales archivos del mismo tamaño: el primero de cada tamaño
+            # se copia sin hashear y se hashea recién cuando aparece otro que coincide
+            tamano = os.stat(pdf_file).st_size
+            propia = Future()
+            hashear_primero = False
+            with bloqueo_hashes:
+                primero = primero_por_tamano.get(tamano)
+                if primero is None:
+                    primero_por_tamano[tamano] = [pdf_file, propia, None]
+                elif primero[2] is None:
+                    primero[2] = Future()
+                    hashear_primero = True
+
+            if primero is None:
+                return copiar_primera(pdf_file, destino_file, propia)
+
+            if hashear_primero:
+                try:
+                    contenido_primero = hash_file(primero[0], "blake2b")
+                    with bloqueo_hashes:
+                        copia_por_hash.setdefault(contenido_primero, primero[1])
+                except OSError:
+                    pass  # Sin su hash el primero no sirve de original: no se enlaza a él
+                finally:
+                    primero[2].set_result(None)
             else:
-                print(Fore.RED + f"❌ Error durante la recolección: {e}")
+                primero[2].result()  # Que el hash del primero ya esté registrado
+
+            contenido = hash_file(pdf_file, "blake2b")
+            with bloqueo_hashes:
+                primera = copia_por_hash.setdefault(contenido, propia)
+
+            if primera is propia:
+                return copiar_primera(pdf_file, destino_file, propia)
+
+            # Otro hilo ya está copiando el mismo contenido: se espera a que termine
+            # para no enlazar un archivo a medio copiar (o que no llegó a crearse)
+            original = primera.result()
+            if original is not None:
+                try:
+                    os.link(original, destino_file)
+                    return True
+                except OSError:
+                    pass  # Sin soporte de hardlinks (u otro sistema de archivos): se copia
+            copy_file(pdf_file, destino_file)
+            return False
+
+        def recoger(hechos):
+            # Los resultados se juntan en este hilo, así que no hace falta bloquear nada
+            nonlocal copied_files, linked_files
+            for futuro in hechos:
+                indice, pdf_file, relative_path, final_name = en_curso.pop(futuro)
+                try:
+                    linked_files += futuro.result()
+                except Exception as e:
+                    self.mensaje(f"❌ Error copiando {pdf_file}: {e}", "red")
+                    continue
+
+                copiados[indice] = (final_name, {
+                    'original_path': pdf_file,
+                    'relative_path': relative_path,
+                    'parent_folder': os.path.dirname(pdf_file),
+                    'original_name': os.path.basename(pdf_file)
+                })
+                copied_files += 1
+
+                if avance is not None:
+                    avance(copied_files)
+                elif copied_files % 10 == 0:
+                    self.mensaje(f"📋 Recolectados {copied_files} archivos...", "blue")
+
+        # Cuando hay que copiar, copy_file copia solo el contenido (en Linux con
+        # copy_file_range, sin pasar los datos por Python) y se ahorra las llamadas
+        # de copystat; la ubicación original de cada archivo queda en ubicaciones_originales.json.
+        with ThreadPoolExecutor(max_workers=HILOS_COPIA) as executor:
+            for ruta in iter_pdfs(raiz, recursive=True):
+                if ruta.startswith(prefijo_destino):
+                    continue
+
+                # Nombre único para evitar conflictos (numerado en el orden encontrado)
+                relative_path = ruta[len(prefijo_raiz):]
+                final_name = f"{total_files:04d}_{relative_path.replace(os.sep, '_')}"
+
+                futuro = executor.submit(copiar, ruta, os.path.join(carpeta_destino, final_name))
+                en_curso[futuro] = (total_files, ruta, relative_path, final_name)
+                total_files += 1
 
-        input("\nPresiona Enter para continuar...")
+                if len(en_curso) >= HILOS_COPIA * 2:
+                    hechos, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+                    recoger(hechos)
+
+            recoger(list(en_curso))
+
+        # Mapeo en el orden en que se encontraron los archivos
+        location_map = dict(copiados[indice] for indice in sorted(copiados))
+        return total_files, copied_files, linked_files, location_map
 
     def ejecutar(self):
         """Ejecuta el menú principal del programa."""
         while True:
-            self.limpiar_pantalla()
-            self.mostrar_banner()
+            self.mostrar_pantalla_principal()
 
-            opcion = self.mostrar_menu_principal()
+            opcion = self.pedir_opcion()
 
             if opcion == "0":
-                if RICH_AVAILABLE:
-                    self.console.print("\n[bold blue]👋 ¡Gracias por usar el Clasificador de PDFs![/bold blue]")
-                else:
-                    print(Fore.BLUE + "\n👋 ¡Gracias por usar el Clasificador de PDFs!")
+                self.mensaje("\n👋 ¡Gracias por usar el Clasificador de PDFs!", "bold blue")
                 break
 
             elif opcion == "1":
@@ -757,93 +1316,101 @@ class MenuColorido:
         """Muestra resultados de clasificaciones anteriores."""
         results_dir = Path("results")
 
-        if not results_dir.exists():
-            if RICH_AVAILABLE:
-                self.console.print("[yellow]📭 No se encontraron resultados anteriores[/yellow]")
-            else:
-                print(Fore.YELLOW + "📭 No se encontraron resultados anteriores")
-            input("Presiona Enter para continuar...")
+        if not results_dir.is_dir():
+            self.mensaje("📭 No se encontraron resultados anteriores", "yellow")
+            self._esperar_tecla(salto_linea=False)
             return
 
-        json_files = list(results_dir.glob("clasificacion_*.json"))
+        # (mtime, tamaño, nombre, ruta) del más reciente al más antiguo, con una sola lectura del directorio
+        json_files = list_result_files(results_dir)
 
         if not json_files:
-            if RICH_AVAILABLE:
-                self.console.print("[yellow]📭 No se encontraron archivos de clasificación[/yellow]")
-            else:
-                print(Fore.YELLOW + "📭 No se encontraron archivos de clasificación")
-            input("Presiona Enter para continuar...")
+            self.mensaje("📭 No se encontraron archivos de clasificación", "yellow")
+            self._esperar_tecla(salto_linea=False)
             return
 
+        # Filas (archivo, fecha, cantidad) en una sola pasada; la vista simple solo muestra 5
+        # (la fecha sale del mtime ya leído, con time.strftime sin crear un datetime por fila)
+        filas = []
+        formatear, hora_local = time.strftime, time.localtime
+        for mtime, tamano, nombre, ruta in (json_files if RICH_AVAILABLE else json_files[:5]):
+            # Los archivos nuevos traen la cantidad en el nombre; los anteriores se leen
+            # completos, así que se cuentan una sola vez por sesión mientras no cambien
+            clave = (ruta, mtime, tamano)
+            cantidad = self._result_count_cache.get(clave)
+            if cantidad is None:
+                cantidad = count_results(ruta, tamano)
+                if cantidad is not None:
+                    self._result_count_cache[clave] = cantidad
+            if cantidad is None:
+                continue
+            filas.append((nombre, formatear("%Y-%m-%d %H:%M", hora_local(mtime)), str(cantidad)))
+
         # Mostrar archivos disponibles
         if RICH_AVAILABLE:
-            self.console.print("\n[bold blue]📊 RESULTADOS ANTERIORES[/bold blue]")
-
-            table = Table(show_header=True, header_style="bold magenta")
-            table.add_column("Archivo", style="cyan")
-            table.add_column("Fecha", style="yellow")
-            table.add_column("Archivos", style="green")
-
-            for json_file in sorted(json_files, key=lambda x: x.stat().st_mtime, reverse=True):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-
-                    fecha = datetime.fromtimestamp(json_file.stat().st_mtime).strftime("%Y-%m-%d %H:%M")
-                    table.add_row(json_file.name, fecha, str(len(data)))
-                except:
-                    continue
-
-            self.console.print(table)
+            if len(filas) > MAX_FILAS_TABLA:
+                # Con muchas filas, un bloque de texto preformateado es mucho más barato que una Table
+                ancho = max(len(nombre) for nombre, _, _ in filas)
+                listado = "\n".join(f"{nombre:<{ancho}}  {fecha}  {cantidad:>8}" for nombre, fecha, cantidad in filas)
+                contenido = Panel(Text(listado), border_style="magenta")
+            else:
+                contenido = Table(show_header=True, header_style="bold magenta")
+                contenido.add_column("Archivo", style="cyan")
+                contenido.add_column("Fecha", style="yellow")
+                contenido.add_column("Archivos", style="green")
+                for fila in filas:
+                    contenido.add_row(*fila)
+
+            self.console.print(Group(self._textos["titulo_anteriores"], contenido))
         else:
-            print(Fore.BLUE + "\n📊 RESULTADOS ANTERIORES")
-            print(Fore.CYAN + "=" * 50)
-
-            for i, json_file in enumerate(sorted(json_files, key=lambda x: x.stat().st_mtime, reverse=True)[:5]):
-                try:
-                    with open(json_file, 'r', encoding='utf-8') as f:
-                        data = json.load(f)
-
-                    fecha = datetime.fromtimestamp(json_file.stat().st_mtime).strftime("%Y-%m-%d %H:%M")
-                    print(f"{i+1}. {json_file.name} - {fecha} ({len(data)} archivos)")
-                except:
-                    continue
+            self._emitir(
+                [Fore.BLUE + "\n📊 RESULTADOS ANTERIORES", Fore.CYAN + "=" * 50]
+                + [f"{i}. {nombre} - {fecha} ({cantidad} archivos)" for i, (nombre, fecha, cantidad) in enumerate(filas, 1)]
+            )
 
-        input("\nPresiona Enter para continuar...")
+        self._esperar_tecla()
 
     def configuracion_avanzada(self):
         """Muestra opciones de configuración avanzada."""
-        if RICH_AVAILABLE:
-            self.console.print("\n[bold blue]⚙️ CONFIGURACIÓN AVANZADA[/bold blue]")
+        # Releer el .env por si se agregó la API key durante la sesión
+        # (si cambia, la pantalla principal cacheada se vuelve a renderizar)
+        load_dotenv()
+        self._api_key_present = bool(os.environ.get('GOOGLE_API_KEY'))
 
+        if RICH_AVAILABLE:
             config_table = Table(show_header=False, box=box.SIMPLE)
             config_table.add_column("Setting", style="cyan")
             config_table.add_column("Value", style="white")
 
-            api_key = os.getenv('GOOGLE_API_KEY', 'No configurada')
-            api_status = "✅ Configurada" if api_key != 'No configurada' else "❌ No configurada"
+            api_status = "✅ Configurada" if self._api_key_present else "❌ No configurada"
 
             config_table.add_row("🔑 API Key", api_status)
             config_table.add_row("📁 Carpeta actual", self.carpeta_actual or "No seleccionada")
             config_table.add_row("📂 Directorio de resultados", "results/")
 
-            self.console.print(config_table)
+            self.console.print(Group(self._textos["titulo_configuracion"], config_table))
         else:
-            print(Fore.BLUE + "\n⚙️ CONFIGURACIÓN AVANZADA")
-            print(Fore.CYAN + "=" * 40)
-
-            api_key = os.getenv('GOOGLE_API_KEY', 'No configurada')
-            api_status = "✅ Configurada" if api_key != 'No configurada' else "❌ No configurada"
+            api_status = "✅ Configurada" if self._api_key_present else "❌ No configurada"
 
-            print(f"🔑 API Key: {api_status}")
-            print(f"📁 Carpeta actual: {self.carpeta_actual or 'No seleccionada'}")
-            print(f"📂 Directorio de resultados: results/")
+            self._emitir([
+                Fore.BLUE + "\n⚙️ CONFIGURACIÓN AVANZADA",
+                Fore.CYAN + "=" * 40,
+                f"🔑 API Key: {api_status}",
+                f"📁 Carpeta actual: {self.carpeta_actual or 'No seleccionada'}",
+                f"📂 Directorio de resultados: results/",
+            ])
 
-        input("\nPresiona Enter para continuar...")
+        self._esperar_tecla()
 
 
 def main():
     """Función principal del menú interactivo."""
+    # En un terminal stdout usa buffer de línea (una escritura por cada "\n").
+    # Con buffer de bloque cada pantalla sale en pocas escrituras; input() vacía
+    # el buffer antes de leer y los avisos de progreso usan flush=True.
+    if sys.__stdout__ is not None and sys.__stdout__.isatty():
+        sys.__stdout__.reconfigure(line_buffering=False)
+
     try:
         menu = MenuColorido()
         menu.ejecutar()
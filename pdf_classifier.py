@@ -17,36 +17,564 @@ Características:
 import os
 import json
 import time
+import hashlib
+import asyncio
 import csv
 import logging
+import logging.handlers
+import queue
+import atexit
 import shutil
+import threading
 import re
+import random
 import tempfile
+import importlib.util
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Iterable, Callable, TypedDict, Union
 from datetime import datetime
 import fitz  # PyMuPDF
 import google.generativeai as genai
+from google.api_core.exceptions import DeadlineExceeded, InternalServerError, ResourceExhausted, ServiceUnavailable
 from dotenv import load_dotenv
 
+from pdf_utils import (iter_pdfs, latest_results, hash_file, copy_file,
+                       write_json, dumps_json, loads_json, append_jsonl, iter_jsonl)
+
+# Caché semántica opcional (sentence-transformers + numpy). Solo se comprueba que estén
+# instalados: importarlos carga PyTorch, así que se importan al usar la caché por primera vez
+SEMANTIC_AVAILABLE = all(importlib.util.find_spec(name) is not None
+                         for name in ("numpy", "sentence_transformers"))
+
 # Cargar variables de entorno
 load_dotenv()
 
+# Modelo de Gemini usado para clasificar
+MODEL_NAME = 'gemini-1.5-flash'
+
+# Versión del prompt de clasificación; al cambiarla se invalidan las entradas de la caché
+PROMPT_VERSION = 2
+
+# Encabezado de cada documento dentro del prompt de un lote (número, nombre de archivo)
+DOCUMENT_HEADER = "--- DOCUMENTO %s (Archivo: %s) ---"
+
+# Instrucciones fijas del modelo: se configuran una vez (system_instruction) en lugar de
+# repetirse en cada request, y piden claves de una letra para acortar la respuesta
+SYSTEM_PROMPT = f"""Clasificas textos de documentos PDF (libros o documentos académicos/técnicos) en una jerarquía temática de 3 niveles.
+Recibirás varios documentos, cada uno precedido por "{DOCUMENT_HEADER % ('n', 'nombre')}".
+""" + """Responde solo con un array JSON con un objeto por documento, en el mismo orden:
+[{"g": "tema general (ej: Ciencias, Tecnología, Historia)", "s": "subtema", "e": "tema específico del contenido", "c": "alta|media|baja", "k": ["palabra1", "palabra2", "palabra3"]}]"""
+
+class _ResponseItem(TypedDict):
+    """Esquema de cada clasificación en la respuesta del modelo (claves cortas del SYSTEM_PROMPT)."""
+    g: str
+    s: str
+    e: str
+    c: str
+    k: List[str]
+
+# Claves cortas de la respuesta del modelo -> campos de los resultados
+_RESPONSE_KEYS = {
+    "g": "tema_general",
+    "s": "subtema",
+    "e": "tema_especifico",
+    "c": "confianza",
+    "k": "palabras_clave",
+}
+
+# Opciones de get_text: sin TEXT_PRESERVE_LIGATURES las ligaduras (ﬁ, ﬂ) salen como
+# letras sueltas, que es lo que espera el modelo; espacios y recorte al mediabox como por defecto
+_TEXT_FLAGS = fitz.TEXT_PRESERVE_WHITESPACE | fitz.TEXT_MEDIABOX_CLIP
+
+# Versión de la extracción de texto (con sus opciones de get_text); al cambiarla se
+# invalidan los textos en caché y las clasificaciones hechas a partir de ellos
+TEXT_VERSION = f"2-{_TEXT_FLAGS}"
+
+# Reintentos de un request fallido y pausa máxima entre ellos. Un rechazo por cuota (429)
+# pausa todos los requests y la pausa se duplica con cada rechazo seguido (vuelve a cero
+# con el primer request exitoso); un error transitorio del servidor o un plazo agotado
+# solo demora ese request, 1, 2, 4... segundos con una variación al azar (jitter) para
+# que los lotes que fallaron juntos no se reintenten juntos
+API_RETRIES = 3
+RATE_LIMIT_MAX_BACKOFF = 60.0
+TRANSIENT_ERRORS = (ServiceUnavailable, InternalServerError, DeadlineExceeded)
+
+# Tiempo máximo de espera de cada request. Los documentos por request se ajustan
+# según la latencia (AIMD): si un request agota el plazo se reparte en dos mitades
+# y el máximo baja a la mitad; cada respuesta en menos del 60% del plazo lo sube
+# en uno, hasta batch_size
+REQUEST_TIMEOUT = 120.0
+
+# Modelo local de embeddings de la caché semántica (384 dimensiones, rápido en CPU)
+EMBEDDING_MODEL = 'all-MiniLM-L6-v2'
+
+# Limpieza de nombres de carpeta: caracteres no válidos en Windows (se eliminan con
+# str.translate, en C) y espacios (se reemplazan por guiones bajos)
+_INVALID_FOLDER_CHARS = str.maketrans('', '', '<>:"/\\|?*')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Límites de la extracción de texto: se leen como mucho MAX_PAGES páginas y se deja
+# de leer en cuanto se juntan MAX_CHARS caracteres (suficientes para clasificar)
+MAX_PAGES = 20
+MAX_CHARS = 15000
+
+# Caracteres de documentos por request: en lotes grandes cada texto se recorta a
+# BATCH_CHARS // tamaño del lote (sin pasar de MAX_CHARS) para acotar los tokens
+BATCH_CHARS = 60000
+
+# Separadores del log de API (inicio/fin de sesión) y del resumen final de la CLI
+_LOG_RULE = "=" * 80
+_LOG_RULE_END = "=" * 100 + "\n"
+_SUMMARY_RULE = "=" * 50
+
+# Hilos para copiar, enlazar o hashear PDFs: es E/S (libera el GIL), así que conviene más de uno por núcleo
+COPY_THREADS = min(32, (os.cpu_count() or 1) * 4)
+
+
+def _env_int(name: str) -> Optional[int]:
+    """
+    Lee un entero positivo de una variable de entorno (o del .env).
+
+    Args:
+        name: Nombre de la variable
+
+    Returns:
+        El valor, o None si la variable no existe o no es un entero positivo
+    """
+    try:
+        value = int(os.getenv(name, ""))
+    except ValueError:
+        return None
+    return value if value > 0 else None
+
+
+def _stop_log_listener(listener: logging.handlers.QueueListener, handlers: List[logging.Handler]):
+    """Vacía la cola de un QueueListener y cierra sus archivos de log."""
+    listener.stop()
+    for handler in handlers:
+        handler.close()
+
+
+# Archivo del log general del proceso (el de la primera sesión que lo configuró)
+_general_log_file: Optional[str] = None
+
+
+def _setup_general_logging(log_file: str, formatter: logging.Formatter) -> str:
+    """
+    Configura el log general una sola vez por proceso (como basicConfig: solo si
+    nadie configuró antes el logger raíz).
+
+    El archivo se escribe en un hilo aparte (QueueHandler + QueueListener): cada
+    log.info del procesamiento solo encola el registro, sin esperar la escritura
+    en disco. La consola sigue siendo directa para que los mensajes no se mezclen
+    con lo que se imprime después. El hilo se detiene al salir.
+
+    Args:
+        log_file: Archivo del log general
+        formatter: Formato de los registros
+
+    Returns:
+        Archivo del log general en uso (el de una sesión anterior si ya estaba configurado)
+    """
+    global _general_log_file
+    root_logger = logging.getLogger()
+    if root_logger.handlers:
+        return _general_log_file or log_file
+
+    log_queue = queue.SimpleQueue()
+    general_handler = logging.FileHandler(log_file, encoding='utf-8')
+    general_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setFormatter(formatter)
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.addHandler(console_handler)
+    root_logger.setLevel(logging.INFO)
+
+    listener = logging.handlers.QueueListener(log_queue, general_handler)
+    listener.start()
+    atexit.register(_stop_log_listener, listener, [general_handler])
+    _general_log_file = log_file
+    return log_file
+
+
+def _extract_text(pdf_path: Path, num_pages: int = MAX_PAGES, max_chars: int = MAX_CHARS) -> str:
+    """
+    Extrae texto de las primeras páginas de un PDF.
+
+    Es una función de módulo (y no un método) para que pueda ejecutarse
+    en los procesos trabajadores del ProcessPoolExecutor. Deja de leer
+    páginas en cuanto se junta max_chars caracteres.
+
+    Args:
+        pdf_path: Ruta al archivo PDF
+        num_pages: Número de páginas a procesar
+        max_chars: Máximo número de caracteres a extraer
+
+    Returns:
+        Texto extraído (lanza excepción si el PDF no se puede leer)
+    """
+    partes = []
+    restantes = max_chars
+    with fitz.open(pdf_path) as documento:
+        # Recorrer el documento en orden y pedir el TextPage de cada página:
+        # es lo mismo que hace get_text("text") sin pasar por su envoltorio
+        for page in documento:
+            if page.number >= num_pages:
+                break
+            page_text = page.get_textpage(flags=_TEXT_FLAGS).extractText()
+            # Limitar caracteres para optimizar API calls: la última página se recorta
+            # antes de unir, así el texto final se arma con una sola copia
+            if len(page_text) >= restantes:
+                partes.append(page_text[:restantes])
+                break
+            partes.append(page_text)
+            restantes -= len(page_text)
+
+    return "".join(partes)
+
+
+# Reglas para clasificar sin IA documentos triviales (facturas, preprints, currículums).
+# Una única expresión con alternancia y grupos con nombre: el encabezado se recorre una sola vez.
+_FAST_RULES_RE = re.compile(
+    r"(?P<factura>\b(?:factura|invoice|recibo|receipt)\b)"
+    r"|(?P<arxiv>\barXiv:\s?\d{4}\.\d{4,5})"
+    r"|(?P<curriculum>\bcurr[ií]culum(?:\s+vitae)?\b|(?-i:\bCV\b))",
+    re.IGNORECASE
+)
+
+_FAST_RULES = {
+    'factura': {
+        "tema_general": "Administración",
+        "subtema": "Finanzas",
+        "tema_especifico": "Facturas y recibos",
+        "confianza": "media",
+        "palabras_clave": ["factura", "recibo", "pago"]
+    },
+    'arxiv': {
+        "tema_general": "Ciencias",
+        "subtema": "Artículos científicos",
+        "tema_especifico": "Preprints de arXiv",
+        "confianza": "media",
+        "palabras_clave": ["arxiv", "preprint", "investigación"]
+    },
+    'curriculum': {
+        "tema_general": "Documentos personales",
+        "subtema": "Empleo",
+        "tema_especifico": "Currículum vitae",
+        "confianza": "media",
+        "palabras_clave": ["currículum", "cv", "experiencia"]
+    },
+}
+
+
+def fast_classify(filename: str, text: Optional[str], header_chars: int = 500) -> Optional[Dict]:
+    """
+    Clasifica por patrones los documentos triviales sin llamar a la API.
+
+    Args:
+        filename: Nombre del archivo PDF
+        text: Texto extraído del PDF
+        header_chars: Caracteres iniciales del texto que se examinan
+
+    Returns:
+        Clasificación con el mismo esquema que la de Gemini, o None si ninguna regla aplica
+    """
+    header = f"{filename}\n{(text or '')[:header_chars]}"
+    match = _FAST_RULES_RE.search(header)
+    if not match:
+        return None
+
+    classification = dict(_FAST_RULES[match.lastgroup])
+    classification['palabras_clave'] = list(classification['palabras_clave'])
+    return classification
+
+
+class ClassificationCache:
+    """
+    Caché en disco de clasificaciones, indexada por el hash del contenido del PDF.
+
+    Cada entrada es un archivo JSON cuyo nombre deriva de (modelo, versión del
+    prompt, versión de la extracción de texto, hash del PDF). Las entradas caducan tras `ttl_days` (según su mtime)
+    y, si se supera `max_entries`, se eliminan las menos usadas (según su atime).
+    """
+
+    suffix = ".json"
+
+    def __init__(self, cache_dir: str = "cache", ttl_days: int = 30,
+                 max_entries: int = 10000, model_name: str = MODEL_NAME):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_days * 24 * 3600
+        self.max_entries = max_entries
+        self.model_name = model_name
+        self.stats = {"hits": 0, "misses": 0}
+
+    def _entry_path(self, content_hash: str) -> Path:
+        key = hashlib.sha256(f"{self.model_name}:{PROMPT_VERSION}:{TEXT_VERSION}:{content_hash}".encode()).hexdigest()
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, content_hash: str) -> Optional[Dict]:
+        """Devuelve la clasificación guardada o None si no existe o caducó."""
+        entry = self._entry_path(content_hash)
+        try:
+            st = entry.stat()
+            if time.time() - st.st_mtime > self.ttl_seconds:
+                entry.unlink()
+                raise FileNotFoundError(entry)
+            with open(entry, 'r', encoding='utf-8') as f:
+                classification = json.load(f)
+            # Marcar como usada (atime) sin alterar la fecha de creación (mtime)
+            os.utime(entry, (time.time(), st.st_mtime))
+        except (OSError, ValueError):
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return classification
+
+    def put(self, content_hash: str, classification: Dict):
+        """Guarda una clasificación de forma atómica (escritura temporal + rename)."""
+        entry = self._entry_path(content_hash)
+        tmp_file = entry.with_suffix(f".{os.getpid()}.tmp")
+        write_json(tmp_file, classification, indent=False)
+        os.replace(tmp_file, entry)
+
+    def prune(self) -> int:
+        """Elimina las entradas menos usadas si se supera max_entries."""
+        with os.scandir(self.cache_dir) as it:
+            entries = [e for e in it if e.name.endswith(self.suffix)]
+
+        excess = len(entries) - self.max_entries
+        if excess <= 0:
+            return 0
+
+        entries.sort(key=lambda e: e.stat().st_atime)
+        for entry in entries[:excess]:
+            try:
+                os.unlink(entry.path)
+            except OSError:
+                pass
+        return excess
+
+
+class TextCache(ClassificationCache):
+    """
+    Caché en disco del texto extraído de cada PDF, indexada por el hash del contenido
+    y la versión de la extracción (TEXT_VERSION).
+
+    Evita volver a abrir los PDFs con PyMuPDF al reintentar una clasificación
+    (errores de la API, cambio de prompt o de modelo). Caduca y se poda igual
+    que la caché de clasificaciones.
+    """
+
+    suffix = ".txt"
+
+    def _entry_path(self, content_hash: str) -> Path:
+        return self.cache_dir / f"{content_hash}.v{TEXT_VERSION}{self.suffix}"
+
+    def get(self, content_hash: str) -> Optional[str]:
+        """Devuelve el texto guardado o None si no existe o caducó."""
+        entry = self._entry_path(content_hash)
+        try:
+            st = entry.stat()
+            if time.time() - st.st_mtime > self.ttl_seconds:
+                entry.unlink()
+                raise FileNotFoundError(entry)
+            text = entry.read_text(encoding='utf-8')
+            os.utime(entry, (time.time(), st.st_mtime))
+        except (OSError, ValueError):
+            self.stats["misses"] += 1
+            return None
+
+        self.stats["hits"] += 1
+        return text
+
+    def put(self, content_hash: str, text: str):
+        """Guarda un texto de forma atómica (escritura temporal + rename)."""
+        entry = self._entry_path(content_hash)
+        tmp_file = entry.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp_file.write_text(text, encoding='utf-8')
+        os.replace(tmp_file, entry)
+
+
+class SemanticCache:
+    """
+    Caché semántica: reutiliza la clasificación de un documento cuyo texto es
+    casi igual al de otro ya clasificado (otra edición, diferencias de OCR...).
+
+    El inicio de cada texto se representa con un embedding normalizado de
+    sentence-transformers y se compara por producto interno (similitud coseno)
+    con todos los guardados; una búsqueda exhaustiva en numpy sigue tomando
+    milisegundos con decenas de miles de entradas. Las entradas se guardan por
+    modelo y versión del prompt en un .npy (vectores) y un .jsonl (clasificaciones).
+    """
+
+    def __init__(self, cache_dir: str, threshold: float = 0.92, prefix_chars: int = 2048,
+                 embedding_model: str = EMBEDDING_MODEL, model_name: str = MODEL_NAME):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.threshold = threshold
+        self.prefix_chars = prefix_chars
+        self.embedding_model = embedding_model
+        key = hashlib.sha256(f"{model_name}:{PROMPT_VERSION}:{TEXT_VERSION}:{embedding_model}".encode()).hexdigest()[:16]
+        self.vectors_file = self.cache_dir / f"{key}.npy"
+        self.entries_file = self.cache_dir / f"{key}.jsonl"
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._np = None
+        self._encoder = None
+        self._matrix = None
+        self._entries = []
+        self._new_vectors = []
+        self._pending = {}  # Prefijo de texto -> embedding, hasta que llegue su clasificación
+
+    def _load(self):
+        """Importa numpy y el modelo, y lee las entradas guardadas (solo la primera vez)."""
+        with self._lock:
+            if self._encoder is not None:
+                return
+            import numpy as np
+            from sentence_transformers import SentenceTransformer
+
+            self._np = np
+            try:
+                self._matrix = np.load(self.vectors_file)
+                self._entries = list(iter_jsonl(self.entries_file))
+                if len(self._entries) != len(self._matrix):
+                    raise ValueError("caché semántica inconsistente")
+            except (OSError, ValueError):
+                self._matrix = None
+                self._entries = []
+            self._encoder = SentenceTransformer(self.embedding_model)
+
+    def lookup(self, texts: List[str]) -> List[Optional[Tuple[Dict, float]]]:
+        """
+        Busca la clasificación de un texto casi igual para cada texto.
+
+        Args:
+            texts: Textos extraídos de los PDFs
+
+        Returns:
+            Por cada texto, (clasificación, similitud) o None si no hay ninguno
+            por encima del umbral
+        """
+        self._load()
+        prefixes = [text[:self.prefix_chars] for text in texts]
+        # Fuera del lock: otros lotes pueden buscar o guardar mientras se calculan los embeddings
+        vectors = self._encoder.encode(prefixes, normalize_embeddings=True, convert_to_numpy=True)
+
+        with self._lock:
+            self._flush_new_vectors()
+            matches = [None] * len(texts)
+            if self._matrix is not None and len(self._matrix):
+                scores = vectors @ self._matrix.T
+                best = scores.argmax(axis=1)
+                for i, j in enumerate(best):
+                    if scores[i, j] >= self.threshold:
+                        matches[i] = (self._entries[j], float(scores[i, j]))
+
+            for prefix, vector, match in zip(prefixes, vectors, matches):
+                if match is None:
+                    self._pending[prefix] = vector
+
+        hits = sum(match is not None for match in matches)
+        self.stats["hits"] += hits
+        self.stats["misses"] += len(matches) - hits
+        return matches
+
+    def put(self, text: str, classification: Dict):
+        """Agrega la clasificación de un texto buscado antes con lookup."""
+        with self._lock:
+            vector = self._pending.pop(text[:self.prefix_chars], None)
+            if vector is not None:
+                self._new_vectors.append(vector)
+                self._entries.append(classification)
+
+    def _flush_new_vectors(self):
+        """Suma los vectores nuevos a la matriz (de a varios, no en cada put)."""
+        if self._new_vectors:
+            stacked = self._np.stack(self._new_vectors)
+            self._matrix = stacked if self._matrix is None else self._np.concatenate([self._matrix, stacked])
+            self._new_vectors = []
+
+    def save(self):
+        """Guarda las entradas en disco si hubo nuevas (escritura temporal + rename)."""
+        with self._lock:
+            self._pending.clear()
+            if not self._new_vectors:
+                return
+            self._flush_new_vectors()
+
+            tmp_vectors = self.vectors_file.with_suffix(f".{os.getpid()}.tmp.npy")
+            tmp_entries = self.entries_file.with_suffix(f".{os.getpid()}.tmp")
+            self._np.save(tmp_vectors, self._matrix)
+            with open(tmp_entries, 'wb') as f:
+                append_jsonl(f, self._entries)
+            os.replace(tmp_vectors, self.vectors_file)
+            os.replace(tmp_entries, self.entries_file)
+
+
 class PDFClassifier:
-    def __init__(self, api_key: str = None, batch_size: int = 5):
+    def __init__(self, api_key: str = None, batch_size: int = 5, max_workers: int = None,
+                 cache_dir: Optional[str] = "cache", cache_ttl_days: int = 30,
+                 fast_rules: bool = False, concurrency: int = None,
+                 request_interval: float = 2.0, prefetch_batches: int = 2,
+                 request_burst: int = None, skip_classified: bool = True,
+                 semantic_threshold: Optional[float] = None, results_format: str = "json"):
         """
         Inicializa el clasificador de PDFs.
 
         Args:
             api_key: Clave de API de Google Gemini
             batch_size: Tamaño del lote para procesamiento
+            max_workers: Procesos para extraer texto en paralelo (default: PDF_WORKERS o núcleos de CPU)
+            cache_dir: Carpeta de la caché de clasificaciones (None para desactivarla)
+            cache_ttl_days: Días de validez de cada clasificación en caché
+            fast_rules: Clasificar por patrones los documentos triviales sin usar la API (las
+                reglas buscan palabras sueltas y pueden equivocarse: desactivadas por defecto)
+            concurrency: Lotes que pueden estar en curso a la vez contra la API (default: GEMINI_CONCURRENCY o 4)
+            request_interval: Segundos por request en promedio (2.0 = 30 requests por minuto)
+            prefetch_batches: Lotes extra cuyo texto se extrae mientras los demás esperan a la API
+            request_burst: Requests que pueden salir seguidos sin esperar (default: concurrency)
+            skip_classified: Omitir los PDFs que ya figuran en resultados anteriores de la misma carpeta
+            semantic_threshold: Similitud (0-1) desde la que un texto casi igual a otro ya
+                clasificado reutiliza su clasificación (None: sin caché semántica; requiere
+                sentence-transformers)
+            results_format: "json" (arreglo JSON indentado, legible) o "jsonl" (un resultado
+                por línea, el mismo archivo que se escribe durante la clasificación: no
+                hay que reescribirlo al terminar); en ambos casos se genera además el CSV
         """
         self.api_key = api_key or os.getenv('GOOGLE_API_KEY')
         self.batch_size = batch_size
+        self.max_workers = max_workers or _env_int('PDF_WORKERS') or os.cpu_count() or 1
+        self.cache = ClassificationCache(cache_dir, cache_ttl_days) if cache_dir else None
+        self.text_cache = TextCache(Path(cache_dir) / "textos", cache_ttl_days) if cache_dir else None
+        self.semantic_cache = (SemanticCache(Path(cache_dir) / "semantica", semantic_threshold)
+                               if cache_dir and semantic_threshold and SEMANTIC_AVAILABLE else None)
+        self.fast_rules = fast_rules
+        self.concurrency = max(1, concurrency or _env_int('GEMINI_CONCURRENCY') or 4)
+        self.request_interval = request_interval
+        self.prefetch_batches = max(0, prefetch_batches)
+        self.request_burst = max(1, request_burst or self.concurrency)
+        self.skip_classified = skip_classified
+        self.results_format = results_format
+        self._throttle_lock = None
+        self._tokens = 0.0
+        self._tokens_at = 0.0
+        self._backoff = 0.0
+        self._paused_until = 0.0
+        self._docs_per_request = batch_size  # Se ajusta con la latencia de la API
+        # Se llama con la cantidad de archivos resueltos al terminar cada lote (para barras de progreso)
+        self.on_batch: Optional[Callable[[int], None]] = None
         self.model = None
         self.results = []
+        self._executor = None  # Pool de procesos activo durante classify_pdfs_in_folder
         self.temp_dir = None
         self.pdf_location_map = {}  # Mapeo de archivos temporales a ubicaciones originales
+        self._folder_names = {}  # Nombre de tema -> nombre de carpeta ya limpio
 
         # Generar timestamp para esta sesión
         self.session_timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -55,33 +583,50 @@ class PDFClassifier:
         logs_dir = Path("logs")
         logs_dir.mkdir(exist_ok=True)
 
-        self.general_log_file = f"logs/pdf_classifier_{self.session_timestamp}.log"
         self.api_log_file = f"logs/api_requests_{self.session_timestamp}.log"
 
-        # Configurar logging
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler(self.general_log_file, encoding='utf-8'),
-                logging.StreamHandler()
-            ]
-        )
+        # Configurar logging: el log general es uno por proceso; el de requests
+        # de API es propio de cada clasificador y se cierra con close()
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        self.general_log_file = _setup_general_logging(
+            f"logs/pdf_classifier_{self.session_timestamp}.log", formatter)
         self.logger = logging.getLogger(__name__)
 
-        # Configurar logger específico para requests de API
+        # Configurar logger específico para requests de API (archivo separado,
+        # escrito en un hilo aparte como el general)
+        api_queue = queue.SimpleQueue()
         self.api_logger = logging.getLogger(f'api_requests_{self.session_timestamp}')
         self.api_logger.setLevel(logging.INFO)
-
-        # Handler para el log de API (archivo separado)
-        api_handler = logging.FileHandler(self.api_log_file, encoding='utf-8')
-        api_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        api_handler.setFormatter(api_formatter)
-        self.api_logger.addHandler(api_handler)
         self.api_logger.propagate = False  # Evitar duplicados en consola
+        self._api_log_handler = logging.FileHandler(self.api_log_file, encoding='utf-8')
+        self._api_log_handler.setFormatter(formatter)
+        self._api_queue_handler = logging.handlers.QueueHandler(api_queue)
+        self.api_logger.addHandler(self._api_queue_handler)
+        self._log_listener = logging.handlers.QueueListener(api_queue, self._api_log_handler)
+        self._log_listener.start()
+        # Si no se llama a close(), al salir se escriben los registros pendientes
+        atexit.register(self.close)
+
+        if semantic_threshold and not SEMANTIC_AVAILABLE:
+            self.logger.warning("Caché semántica desactivada: instala sentence-transformers para usarla")
 
         self._configure_gemini()
 
+    def close(self):
+        """
+        Vacía y cierra el log de requests de API de este clasificador.
+
+        Conviene llamarlo al terminar con el clasificador cuando se crean varios
+        en el mismo proceso (p. ej. uno por corrida en el menú): si no, cada uno
+        deja un hilo y un archivo abiertos hasta que termina el programa.
+        """
+        if self._log_listener is None:
+            return
+        self.api_logger.removeHandler(self._api_queue_handler)
+        _stop_log_listener(self._log_listener, [self._api_log_handler])
+        self._log_listener = None
+        atexit.unregister(self.close)
+
     def _sanitize_folder_name(self, name: str) -> str:
         """
         Limpia el nombre para crear carpetas válidas.
@@ -92,20 +637,22 @@ class PDFClassifier:
         Returns:
             Nombre válido para carpeta
         """
-        if not name or name.lower() in ['n/a', 'na', 'none', 'null']:
-            return "Sin_Clasificar"
+        # Los mismos temas se repiten en muchos resultados: cada nombre se limpia una vez
+        cached = self._folder_names.get(name)
+        if cached is not None:
+            return cached
 
-        # Remover caracteres especiales y reemplazar espacios
-        sanitized = re.sub(r'[<>:"/\\|?*]', '', name)
-        sanitized = re.sub(r'\s+', '_', sanitized.strip())
-
-        # Limitar longitud
-        sanitized = sanitized[:50]
+        if not name or name.lower() in ['n/a', 'na', 'none', 'null']:
+            sanitized = "Sin_Clasificar"
+        else:
+            # Remover caracteres especiales, reemplazar espacios y limitar longitud
+            sanitized = _WHITESPACE_RE.sub('_', name.translate(_INVALID_FOLDER_CHARS).strip())[:50]
 
-        # Capitalizar primera letra de cada palabra
-        sanitized = '_'.join(word.capitalize() for word in sanitized.split('_') if word)
+            # Capitalizar primera letra de cada palabra
+            sanitized = '_'.join(word.capitalize() for word in sanitized.split('_') if word) or "Sin_Clasificar"
 
-        return sanitized or "Sin_Clasificar"
+        self._folder_names[name] = sanitized
+        return sanitized
 
     def _configure_gemini(self):
         """Configura la API de Google Gemini."""
@@ -114,7 +661,16 @@ class PDFClassifier:
 
         try:
             genai.configure(api_key=self.api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-flash')
+            self.model = genai.GenerativeModel(
+                MODEL_NAME,
+                system_instruction=SYSTEM_PROMPT,
+                # Salida estructurada: JSON puro que sigue el esquema (un array de
+                # clasificaciones), sin bloques ```json que limpiar ni estructura que validar
+                generation_config={
+                    "response_mime_type": "application/json",
+                    "response_schema": List[_ResponseItem],
+                }
+            )
             self.logger.info("API de Gemini configurada correctamente")
         except Exception as e:
             self.logger.error(f"Error al configurar la API de Gemini: {e}")
@@ -122,8 +678,12 @@ class PDFClassifier:
 
     def collect_pdfs_recursively(self, root_folder: Path) -> Tuple[Path, Dict[str, str], int]:
         """
-        Recolecta recursivamente todos los PDFs de una carpeta y subcarpetas,
-        los copia a una carpeta temporal para análisis eficiente.
+        Recolecta recursivamente todos los PDFs de una carpeta y subcarpetas
+        en una carpeta temporal plana para analizarlos juntos.
+
+        Si la carpeta temporal está en el mismo sistema de archivos, cada PDF
+        se enlaza (hardlink) a su original en lugar de copiarse: no se leen ni
+        escriben sus datos. Si no, se copia.
 
         Args:
             root_folder: Carpeta raíz donde buscar PDFs
@@ -132,7 +692,7 @@ class PDFClassifier:
             Tupla con (carpeta_temporal, mapeo_ubicaciones, total_archivos)
         """
         root_folder = Path(root_folder)
-        if not root_folder.exists() or not root_folder.is_dir():
+        if not root_folder.is_dir():
             raise ValueError(f"La carpeta no existe o no es válida: {root_folder}")
 
         # Crear carpeta temporal
@@ -145,53 +705,72 @@ class PDFClassifier:
         self.logger.info(f"🔍 Escaneando recursivamente la carpeta: {root_folder}")
         self.logger.info(f"📁 Carpeta temporal creada: {self.temp_dir}")
 
-        # Buscar todos los PDFs recursivamente
-        pdf_files = list(root_folder.rglob("*.pdf"))
-        total_files = len(pdf_files)
+        def copy_one(copy: Tuple[str, str, str]) -> Optional[Exception]:
+            try:
+                os.link(copy[0], self.temp_dir / copy[2])
+                return None
+            except OSError:
+                pass  # Otro sistema de archivos o sin soporte de hardlinks: se copia
+
+            # Copiar solo el contenido: la copia temporal no necesita permisos ni fechas
+            try:
+                copy_file(copy[0], self.temp_dir / copy[2])
+            except Exception as e:
+                return e
+            return None
+
+        def record(copy: Tuple[str, str, str], error: Optional[Exception]):
+            nonlocal copied_files
+            pdf_file, relative_path, temp_pdf_name = copy
+            if error is not None:
+                self.logger.error(f"❌ Error copiando {pdf_file}: {error}")
+                return
+
+            # Guardar mapeo de ubicación original
+            self.pdf_location_map[temp_pdf_name] = {
+                'original_path': pdf_file,
+                'relative_path': relative_path,
+                'parent_folder': os.path.dirname(pdf_file),
+                'original_name': os.path.basename(pdf_file)
+            }
+
+            copied_files += 1
+
+            if copied_files % 10 == 0:
+                self.logger.info(f"📋 Copiados {copied_files} archivos...")
+
+        # Cada PDF se enlaza o copia en cuanto el recorrido lo encuentra (como texto: sin
+        # crear un Path por archivo), sin esperar a listar todo el árbol. Los pendientes
+        # se acotan y se atienden en orden de descubrimiento.
+        root_prefix = os.path.join(str(root_folder), "")
+        pending = deque()
+        with ThreadPoolExecutor(max_workers=COPY_THREADS) as executor:
+            for index, pdf_file in enumerate(iter_pdfs(root_folder, recursive=True)):
+                # Nombres únicos para evitar conflictos (numerados por orden de descubrimiento)
+                relative_path = pdf_file[len(root_prefix):]
+                safe_name = relative_path.replace(os.sep, "_")
+                copy = (pdf_file, relative_path, f"{index:04d}_{safe_name}")
+                pending.append((copy, executor.submit(copy_one, copy)))
+                total_files += 1
+
+                if len(pending) >= COPY_THREADS * 4:
+                    copy, future = pending.popleft()
+                    record(copy, future.result())
+
+            while pending:
+                copy, future = pending.popleft()
+                record(copy, future.result())
 
         if total_files == 0:
             self.logger.warning(f"❌ No se encontraron archivos PDF en: {root_folder}")
             return self.temp_dir, self.pdf_location_map, 0
 
         self.logger.info(f"📊 Encontrados {total_files} archivos PDF")
-
-        # Copiar cada PDF a la carpeta temporal
-        for pdf_file in pdf_files:
-            try:
-                # Crear nombre único para evitar conflictos
-                relative_path = pdf_file.relative_to(root_folder)
-                safe_name = str(relative_path).replace(os.sep, "_")
-
-                # Agregar timestamp si el nombre ya existe
-                temp_pdf_name = f"{copied_files:04d}_{safe_name}"
-                temp_pdf_path = self.temp_dir / temp_pdf_name
-
-                # Copiar el archivo
-                shutil.copy2(pdf_file, temp_pdf_path)
-
-                # Guardar mapeo de ubicación original
-                self.pdf_location_map[temp_pdf_name] = {
-                    'original_path': str(pdf_file),
-                    'relative_path': str(relative_path),
-                    'parent_folder': str(pdf_file.parent),
-                    'original_name': pdf_file.name
-                }
-
-                copied_files += 1
-
-                if copied_files % 10 == 0:
-                    self.logger.info(f"📋 Copiados {copied_files}/{total_files} archivos...")
-
-            except Exception as e:
-                self.logger.error(f"❌ Error copiando {pdf_file}: {e}")
-                continue
-
-        self.logger.info(f"✅ Proceso completado: {copied_files}/{total_files} archivos copiados")
+        self.logger.info(f"✅ Proceso completado: {copied_files}/{total_files} archivos recolectados")
 
         # Guardar mapeo en archivo JSON para referencia
         mapping_file = self.temp_dir / "ubicaciones_originales.json"
-        with open(mapping_file, 'w', encoding='utf-8') as f:
-            json.dump(self.pdf_location_map, f, indent=2, ensure_ascii=False)
+        write_json(mapping_file, self.pdf_location_map)
 
         return self.temp_dir, self.pdf_location_map, copied_files
 
@@ -208,7 +787,8 @@ class PDFClassifier:
             except Exception as e:
                 self.logger.error(f"❌ Error eliminando carpeta temporal: {e}")
 
-    def extract_text_from_pdf(self, pdf_path: Path, num_pages: int = 20, max_chars: int = 15000) -> Optional[str]:
+    def extract_text_from_pdf(self, pdf_path: Path, num_pages: int = MAX_PAGES,
+                              max_chars: int = MAX_CHARS) -> Optional[str]:
         """
         Extrae texto de las primeras páginas de un PDF.
 
@@ -221,23 +801,149 @@ class PDFClassifier:
             Texto extraído o None si hay error
         """
         try:
-            with fitz.open(pdf_path) as documento:
-                texto_completo = ""
-                for i in range(min(num_pages, documento.page_count)):
-                    page_text = documento.load_page(i).get_text()
-                    texto_completo += page_text
+            texto_final = _extract_text(pdf_path, num_pages, max_chars)
+        except Exception as e:
+            self.logger.error(f"Error al leer PDF '{pdf_path.name}': {e}")
+            return None
+
+        if len(texto_final.strip()) < 100:
+            self.logger.warning(f"Texto muy corto extraído de {pdf_path.name}")
 
-                # Limitar caracteres para optimizar API calls
-                texto_final = texto_completo[:max_chars]
+        return texto_final
 
-                if len(texto_final.strip()) < 100:
+    def _extract_texts(self, pdf_paths: List[Path]) -> List[Optional[str]]:
+        """
+        Extrae el texto de varios PDFs, en paralelo si hay un pool de procesos activo.
+
+        Args:
+            pdf_paths: Rutas a los archivos PDF
+
+        Returns:
+            Lista de textos (None si hubo error) en el mismo orden que pdf_paths
+        """
+        if self._executor is None:
+            return [self.extract_text_from_pdf(pdf_path) for pdf_path in pdf_paths]
+
+        futures = [self._executor.submit(_extract_text, pdf_path) for pdf_path in pdf_paths]
+        texts = []
+        for pdf_path, future in zip(pdf_paths, futures):
+            try:
+                texto = future.result()
+            except BrokenProcessPool as e:
+                # Un PDF corrupto puede tumbar al trabajador: seguir sin pool
+                self.logger.warning(f"Pool de extracción caído ({e}), continuando en serie")
+                self._executor = None
+                texto = self.extract_text_from_pdf(pdf_path)
+            except Exception as e:
+                self.logger.error(f"Error al leer PDF '{pdf_path.name}': {e}")
+                texto = None
+            else:
+                if len(texto.strip()) < 100:
                     self.logger.warning(f"Texto muy corto extraído de {pdf_path.name}")
+            texts.append(texto)
 
-                return texto_final
+        return texts
 
-        except Exception as e:
-            self.logger.error(f"Error al leer PDF '{pdf_path.name}': {e}")
-            return None
+    def _build_prompt(self, texts_and_files: List[Tuple[str, str]]) -> str:
+        """
+        Construye el prompt de un lote: solo los documentos, ya que la parte fija
+        (instrucciones y formato de respuesta) va una sola vez en SYSTEM_PROMPT.
+        Cada texto se recorta para que el lote completo no pase de BATCH_CHARS.
+
+        Args:
+            texts_and_files: Lista de tuplas (texto, nombre_archivo)
+
+        Returns:
+            Texto del request
+        """
+        header = DOCUMENT_HEADER
+        # El recorte se hace aquí y no al extraer: la caché de textos guarda el texto
+        # completo y sirve igual para cualquier tamaño de lote
+        max_chars = min(MAX_CHARS, BATCH_CHARS // max(1, len(texts_and_files)))
+
+        # Una sola unión de todas las partes: cada texto se copia una vez al prompt final
+        # (armar antes "encabezado + texto" por documento lo copiaría dos veces)
+        parts = []
+        for i, (texto, filename) in enumerate(texts_and_files, 1):
+            parts.append(f"\n\n{header % (i, filename)}\n" if i > 1 else f"{header % (i, filename)}\n")
+            parts.append(texto[:max_chars])
+        return "".join(parts)
+
+    def _log_request(self, prompt: str, filenames: List[str]):
+        """Registra en el log de API el request que se va a enviar."""
+        self.api_logger.info(f"=== NUEVO REQUEST A LA API ===")
+        self.api_logger.info(f"Archivos en el lote: {filenames}")
+        self.api_logger.info(f"Cantidad de archivos: {len(filenames)}")
+        self.api_logger.info(f"Prompt enviado (primeros 500 chars): {prompt[:500]}...")
+
+    def _parse_response(self, response, filenames: List[str]) -> List[Dict]:
+        """
+        Convierte la respuesta de Gemini en la lista de clasificaciones.
+
+        Args:
+            response: Respuesta de generate_content
+            filenames: Archivos del lote, en orden
+
+        Returns:
+            Lista de clasificaciones (lanza excepción si la respuesta no es válida)
+        """
+        # response.text arma el texto a partir de las partes de la respuesta en cada
+        # acceso: se lee una sola vez para el log y el parseo
+        text = response.text
+
+        # Log de la respuesta
+        self.api_logger.info(f"✅ Respuesta recibida exitosamente")
+        self.api_logger.info(f"Respuesta completa: {text}")
+
+        # Parsear JSON: el esquema de respuesta garantiza un array de objetos, así que
+        # no hace falta limpiar el texto ni validar la estructura (una respuesta
+        # cortada por límite de tokens sigue fallando aquí como JSONDecodeError)
+        items = loads_json(text)
+
+        # Pasar las claves cortas a los nombres de campo de los resultados;
+        # el número de documento sale de la posición en el array
+        classifications = [
+            {"documento": i, **{field: item.get(short, item.get(field)) for short, field in _RESPONSE_KEYS.items()}}
+            for i, item in enumerate(items, 1)
+        ]
+
+        # Log de éxito
+        self.api_logger.info(f"✅ JSON parseado correctamente. {len(classifications)} clasificaciones obtenidas")
+
+        # Log detallado de cada clasificación
+        for i, classification in enumerate(classifications):
+            filename = filenames[i] if i < len(filenames) else "archivo_desconocido"
+            self.api_logger.info(f"  📁 {filename}: {classification.get('tema_general', 'N/A')} > {classification.get('subtema', 'N/A')} > {classification.get('tema_especifico', 'N/A')} (Confianza: {classification.get('confianza', 'N/A')})")
+
+        self.api_logger.info(f"=== FIN REQUEST EXITOSO ===\n")
+
+        return classifications
+
+    def _log_api_error(self, error: Exception, filenames: List[str], response=None):
+        """Registra un request fallido en los logs general y de API."""
+        if isinstance(error, json.JSONDecodeError):
+            # Log de error de JSON
+            self.api_logger.error(f"❌ ERROR DE PARSEO JSON")
+            self.api_logger.error(f"Error: {error}")
+            text = response.text
+            self.api_logger.error(f"Respuesta que causó el error: {text}")
+            self.api_logger.error(f"Archivos afectados: {filenames}")
+            self.api_logger.error(f"=== FIN REQUEST CON ERROR JSON ===\n")
+
+            self.logger.error(f"Error al parsear JSON de la API: {error}")
+            self.logger.debug(f"Respuesta recibida: {text}")
+            return
+
+        # Log de error general
+        self.api_logger.error(f"❌ ERROR EN LLAMADA A LA API")
+        self.api_logger.error(f"Error: {str(error)}")
+        self.api_logger.error(f"Tipo de error: {type(error).__name__}")
+        self.api_logger.error(f"Archivos afectados: {filenames}")
+        if response is not None:
+            self.api_logger.error(f"Respuesta (si existe): {getattr(response, 'text', 'Sin respuesta')}")
+        self.api_logger.error(f"=== FIN REQUEST CON ERROR GENERAL ===\n")
+
+        self.logger.error(f"Error en llamada a la API: {error}")
 
     def classify_batch_with_ai(self, texts_and_files: List[Tuple[str, str]]) -> Optional[List[Dict]]:
         """
@@ -252,147 +958,326 @@ class PDFClassifier:
         if not texts_and_files:
             return []
 
-        # Construir prompt para el lote
-        prompt_documents = ""
-        for i, (texto, filename) in enumerate(texts_and_files):
-            prompt_documents += f"--- DOCUMENTO {i+1} (Archivo: {filename}) ---\n{texto}\n\n"
-
-        prompt = f"""
-        Analiza los {len(texts_and_files)} textos de documentos PDF que te proporciono a continuación.
-        Para cada uno, clasifícalo en una jerarquía temática de 3 niveles, considerando que son libros o documentos académicos/técnicos.
-
-        {prompt_documents}
-
-        Responde ÚNICAMENTE con un array JSON válido, uno por cada documento en el mismo orden.
-        La estructura debe ser exactamente esta:
-        [
-            {{
-                "documento": 1,
-                "archivo": "nombre_del_archivo.pdf",
-                "tema_general": "Categoría principal (ej: Ciencias, Tecnología, Historia, etc.)",
-                "subtema": "Subcategoría específica",
-                "tema_especifico": "Tema muy específico del contenido",
-                "confianza": "alta|media|baja",
-                "palabras_clave": ["palabra1", "palabra2", "palabra3"]
-            }}
-        ]
+        prompt = self._build_prompt(texts_and_files)
+        filenames = [filename for _, filename in texts_and_files]
+        self._log_request(prompt, filenames)
+
+        for attempt in range(API_RETRIES + 1):
+            response = None
+            try:
+                response = self.model.generate_content(prompt, request_options={"timeout": REQUEST_TIMEOUT})
+                self._backoff = 0.0
+                return self._parse_response(response, filenames)
+            except ResourceExhausted as e:
+                if attempt == API_RETRIES:
+                    self._log_api_error(e, filenames, response)
+                    return None
+                self._rate_limited(filenames)
+                time.sleep(max(0.0, self._paused_until - time.monotonic()))
+            except TRANSIENT_ERRORS as e:
+                if attempt == API_RETRIES:
+                    self._log_api_error(e, filenames, response)
+                    return None
+                time.sleep(self._retry_delay(e, attempt, filenames))
+            except Exception as e:
+                self._log_api_error(e, filenames, response)
+                return None
 
-        Asegúrate de que el JSON sea válido y sin texto adicional.
+    async def classify_batch_with_ai_async(self, texts_and_files: List[Tuple[str, str]],
+                                           split_on_timeout: bool = False) -> Optional[List[Dict]]:
         """
+        Versión asíncrona de classify_batch_with_ai (usa generate_content_async).
 
-        try:
-            # Log del request
-            filenames = [filename for _, filename in texts_and_files]
-            self.api_logger.info(f"=== NUEVO REQUEST A LA API ===")
-            self.api_logger.info(f"Archivos en el lote: {filenames}")
-            self.api_logger.info(f"Cantidad de archivos: {len(texts_and_files)}")
-            self.api_logger.info(f"Prompt enviado (primeros 500 chars): {prompt[:500]}...")
+        Args:
+            texts_and_files: Lista de tuplas (texto, nombre_archivo)
+            split_on_timeout: Relanzar DeadlineExceeded si el request agota el plazo
+                con más de un documento, para reintentarlo en partes
 
-            # Hacer el request
-            response = self.model.generate_content(prompt)
+        Returns:
+            Lista de clasificaciones o None si hay error
+        """
+        if not texts_and_files:
+            return []
 
-            # Log de la respuesta
-            self.api_logger.info(f"✅ Respuesta recibida exitosamente")
-            self.api_logger.info(f"Respuesta completa: {response.text}")
+        prompt = self._build_prompt(texts_and_files)
+        filenames = [filename for _, filename in texts_and_files]
 
-            # Limpiar respuesta
-            json_text = response.text.strip()
-            if json_text.startswith("```json"):
-                json_text = json_text[7:]
-            if json_text.endswith("```"):
-                json_text = json_text[:-3]
-            json_text = json_text.strip()
+        # Un 429 pausa el throttle para todos los lotes y el request se repite;
+        # un error transitorio demora solo este request
+        for attempt in range(API_RETRIES + 1):
+            await self._throttle()
+            self._log_request(prompt, filenames)
 
-            # Parsear JSON
-            classifications = json.loads(json_text)
+            response = None
+            started = time.monotonic()
+            try:
+                response = await self.model.generate_content_async(
+                    prompt, request_options={"timeout": REQUEST_TIMEOUT})
+                self._backoff = 0.0
+                if (time.monotonic() - started < 0.6 * REQUEST_TIMEOUT
+                        and self._docs_per_request < self.batch_size):
+                    self._docs_per_request += 1
+                return self._parse_response(response, filenames)
+            except ResourceExhausted as e:
+                if attempt == API_RETRIES:
+                    self._log_api_error(e, filenames, response)
+                    return None
+                self._rate_limited(filenames)
+            except TRANSIENT_ERRORS as e:
+                if isinstance(e, DeadlineExceeded) and len(texts_and_files) > 1:
+                    self._docs_per_request = max(1, min(self._docs_per_request, len(texts_and_files)) // 2)
+                    self.logger.warning(f"Request sin respuesta a tiempo, ahora hasta {self._docs_per_request} documentos por request")
+                    if split_on_timeout:
+                        self._log_api_error(e, filenames, response)
+                        raise
+                if attempt == API_RETRIES:
+                    self._log_api_error(e, filenames, response)
+                    return None
+                await asyncio.sleep(self._retry_delay(e, attempt, filenames))
+            except Exception as e:
+                self._log_api_error(e, filenames, response)
+                return None
 
-            # Validar estructura
-            if not isinstance(classifications, list):
-                raise ValueError("La respuesta no es una lista válida")
+    def _retry_delay(self, error: Exception, attempt: int, filenames: List[str]) -> float:
+        """
+        Calcula la espera antes de reintentar un request tras un error transitorio.
 
-            # Log de éxito
-            self.api_logger.info(f"✅ JSON parseado correctamente. {len(classifications)} clasificaciones obtenidas")
+        Args:
+            error: Error recibido (5xx o plazo agotado)
+            attempt: Número de intento fallido (desde 0)
+            filenames: Archivos del request
 
-            # Log detallado de cada clasificación
-            for i, classification in enumerate(classifications):
-                filename = filenames[i] if i < len(filenames) else "archivo_desconocido"
-                self.api_logger.info(f"  📁 {filename}: {classification.get('tema_general', 'N/A')} > {classification.get('subtema', 'N/A')} > {classification.get('tema_especifico', 'N/A')} (Confianza: {classification.get('confianza', 'N/A')})")
+        Returns:
+            Segundos a esperar: 1, 2, 4... (hasta RATE_LIMIT_MAX_BACKOFF) entre el 50% y el 100%
+        """
+        delay = min(2.0 ** attempt, RATE_LIMIT_MAX_BACKOFF) * random.uniform(0.5, 1.0)
+        self.logger.warning(f"Error transitorio de la API ({type(error).__name__}), reintento en {delay:.1f} segundos")
+        self.api_logger.warning(f"🔁 {type(error).__name__}: {error}. Reintento {attempt + 1}/{API_RETRIES} "
+                                f"en {delay:.1f}s. Archivos: {filenames}")
+        return delay
 
-            self.api_logger.info(f"=== FIN REQUEST EXITOSO ===\n")
+    def _rate_limited(self, filenames: List[str]):
+        """
+        Registra un rechazo por cuota (429) y pausa los requests con backoff exponencial.
 
-            return classifications
+        La pausa se duplica solo si el rechazo llega fuera de una pausa en curso:
+        varios lotes rechazados a la vez no la multiplican. Al terminar, el token
+        bucket arranca vacío, de modo que los requests se reanudan al ritmo normal.
 
-        except json.JSONDecodeError as e:
-            # Log de error de JSON
-            self.api_logger.error(f"❌ ERROR DE PARSEO JSON")
-            self.api_logger.error(f"Error: {e}")
-            self.api_logger.error(f"Respuesta que causó el error: {response.text}")
-            self.api_logger.error(f"Archivos afectados: {filenames}")
-            self.api_logger.error(f"=== FIN REQUEST CON ERROR JSON ===\n")
+        Args:
+            filenames: Archivos del request rechazado
+        """
+        now = time.monotonic()
+        if now >= self._paused_until:
+            self._backoff = min(max(self._backoff * 2, self.request_interval, 1.0), RATE_LIMIT_MAX_BACKOFF)
+            self._paused_until = now + self._backoff
+            self._tokens = 0.0
+            self._tokens_at = self._paused_until
 
-            self.logger.error(f"Error al parsear JSON de la API: {e}")
-            self.logger.debug(f"Respuesta recibida: {response.text}")
-            return None
+        self.logger.warning(f"Límite de requests de la API alcanzado, reintento en {self._paused_until - now:.1f} segundos")
+        self.api_logger.warning(f"⏳ 429 / cuota agotada: reintento en {self._paused_until - now:.1f}s. Archivos: {filenames}")
 
-        except Exception as e:
-            # Log de error general
-            self.api_logger.error(f"❌ ERROR EN LLAMADA A LA API")
-            self.api_logger.error(f"Error: {str(e)}")
-            self.api_logger.error(f"Tipo de error: {type(e).__name__}")
-            self.api_logger.error(f"Archivos afectados: {filenames}")
-            if 'response' in locals():
-                self.api_logger.error(f"Respuesta (si existe): {getattr(response, 'text', 'Sin respuesta')}")
-            self.api_logger.error(f"=== FIN REQUEST CON ERROR GENERAL ===\n")
+    async def _throttle(self):
+        """
+        Limita el ritmo de requests con un token bucket.
 
-            self.logger.error(f"Error en llamada a la API: {e}")
-            return None
+        Se acumula un token cada request_interval segundos, hasta request_burst:
+        tras una pausa pueden salir varios requests seguidos, pero el promedio
+        nunca supera un request por intervalo (las cuotas de Gemini son por minuto).
+        """
+        async with self._throttle_lock:
+            # Pausa por un 429 reciente (ver _rate_limited)
+            pause = self._paused_until - time.monotonic()
+            if pause > 0:
+                await asyncio.sleep(pause)
+
+            now = time.monotonic()
+            if self.request_interval > 0:
+                self._tokens = min(self.request_burst,
+                                   self._tokens + (now - self._tokens_at) / self.request_interval)
+            else:
+                self._tokens = self.request_burst
+            self._tokens_at = now
 
-    def process_batch(self, pdf_files: List[Path], folder_path: Path) -> List[Dict]:
+            if self._tokens < 1:
+                wait = (1 - self._tokens) * self.request_interval
+                self.logger.info(f"Pausa de {wait:.1f} segundos antes del siguiente request...")
+                await asyncio.sleep(wait)
+                self._tokens = 1.0
+                self._tokens_at = time.monotonic()
+
+            self._tokens -= 1
+
+    def _split_into_requests(self, texts_and_files: List[Tuple[str, str]]) -> List[List[Tuple[str, str]]]:
         """
-        Procesa un lote de archivos PDF.
+        Divide un lote en grupos de no más documentos de los que hoy admite un request.
+        El tamaño de cada prompt ya lo acota _build_prompt (BATCH_CHARS).
+
+        Args:
+            texts_and_files: Lista de tuplas (texto, nombre_archivo)
+
+        Returns:
+            Lista de grupos, en el orden original
+        """
+        size = max(1, self._docs_per_request)
+        return [texts_and_files[i:i + size] for i in range(0, len(texts_and_files), size)]
+
+    def _lookup_cache(self, pdf_files: List[Path], folder_path: Path,
+                      file_hashes: Optional[Dict[str, str]] = None) -> Tuple[List[Dict], List[Path], Dict[str, str]]:
+        """
+        Busca en la caché de clasificaciones los PDFs indicados.
+
+        Args:
+            pdf_files: Archivos PDF a buscar
+            folder_path: Ruta base de la carpeta
+            file_hashes: Hashes ya calculados por nombre de archivo (opcional)
+
+        Returns:
+            Tupla con (resultados_de_caché, archivos_pendientes, hashes_de_los_pendientes)
+        """
+        cached_results = []
+        pending_files = []
+        content_hashes = {}
+        cached_at = datetime.now().isoformat()  # Una marca de tiempo para todos los aciertos
+
+        known = file_hashes or {}
+        to_hash = [folder_path / pdf_file.name for pdf_file in pdf_files if pdf_file.name not in known]
+        hashes = dict(zip((path.name for path in to_hash), self._hash_files(to_hash)))
+
+        for pdf_file in pdf_files:
+            content_hash = known.get(pdf_file.name) or hashes[pdf_file.name]
+            if isinstance(content_hash, OSError):
+                self.logger.error(f"Error al calcular el hash de '{pdf_file.name}': {content_hash}")
+                pending_files.append(pdf_file)
+                continue
+
+            cached = self.cache.get(content_hash)
+            if cached is not None:
+                result = cached.copy()
+                result['archivo'] = pdf_file.name
+                result['timestamp'] = cached_at
+                cached_results.append(result)
+                self.logger.info(f"Clasificación obtenida de caché: {pdf_file.name}")
+                self.api_logger.info(f"💾 Cache hit: {pdf_file.name}")
+            else:
+                content_hashes[pdf_file.name] = content_hash
+                pending_files.append(pdf_file)
+
+        return cached_results, pending_files, content_hashes
+
+    def _prepare_batch(self, pdf_files: List[Path], folder_path: Path,
+                       file_hashes: Optional[Dict[str, str]] = None,
+                       lookup_cache: bool = True) -> Tuple[List[Dict], List[Tuple[str, str]], Dict[str, str]]:
+        """
+        Resuelve lo que no necesita a la API (caché y reglas) y extrae el texto del resto.
 
         Args:
             pdf_files: Lista de archivos PDF a procesar
             folder_path: Ruta base de la carpeta
+            file_hashes: Hashes ya calculados por nombre de archivo (opcional)
+            lookup_cache: False si la caché ya se consultó antes de armar el lote;
+                file_hashes trae entonces los hashes de los archivos no encontrados
 
         Returns:
-            Lista de resultados de clasificación
+            Tupla con (resultados_ya_resueltos, textos_pendientes, hashes_por_archivo)
         """
         self.logger.info(f"Procesando lote de {len(pdf_files)} archivos")
 
-        texts_and_files = []
+        batch_results = []
+        content_hashes = {}
 
-        # Extraer texto de cada PDF
-        for pdf_file in pdf_files:
-            full_path = folder_path / pdf_file
-            texto = self.extract_text_from_pdf(full_path)
+        # Consultar la caché antes de extraer texto o llamar a la API
+        if self.cache and lookup_cache:
+            batch_results, pdf_files, content_hashes = self._lookup_cache(pdf_files, folder_path, file_hashes)
+            if not pdf_files:
+                return batch_results, [], content_hashes
+        elif self.cache:
+            content_hashes = file_hashes or {}
 
-            if texto and len(texto.strip()) > 50:
+        texts_and_files = []
+
+        # Reusar el texto ya extraído en corridas anteriores; el resto se extrae
+        # de cada PDF (en paralelo si hay pool de procesos)
+        texts = [None] * len(pdf_files)
+        to_extract = []
+        for i, pdf_file in enumerate(pdf_files):
+            content_hash = content_hashes.get(pdf_file.name)
+            if content_hash is not None:
+                texts[i] = self.text_cache.get(content_hash)
+            if texts[i] is None:
+                to_extract.append(i)
+
+        extracted = self._extract_texts([folder_path / pdf_files[i].name for i in to_extract])
+        for i, texto in zip(to_extract, extracted):
+            texts[i] = texto
+            content_hash = content_hashes.get(pdf_files[i].name)
+            if texto is not None and content_hash is not None:
+                try:
+                    self.text_cache.put(content_hash, texto)
+                except OSError as e:
+                    self.logger.warning(f"No se pudo guardar el texto de '{pdf_files[i].name}' en caché: {e}")
+
+        classified_at = datetime.now().isoformat()
+        for pdf_file, texto in zip(pdf_files, texts):
+            fast_result = fast_classify(pdf_file.name, texto) if self.fast_rules else None
+
+            if fast_result is not None:
+                fast_result['archivo'] = pdf_file.name
+                fast_result['timestamp'] = classified_at
+                batch_results.append(fast_result)
+                self.logger.info(f"Clasificado por reglas (sin API): {pdf_file.name} → {fast_result['tema_especifico']}")
+                self.api_logger.info(f"⚡ Clasificado por reglas, sin request: {pdf_file.name}")
+            elif texto and len(texto.strip()) > 50:
                 texts_and_files.append((texto, pdf_file.name))
                 self.api_logger.info(f"📄 Texto extraído exitosamente de: {pdf_file.name} ({len(texto)} chars)")
             else:
                 self.logger.warning(f"Saltando archivo '{pdf_file.name}' (texto insuficiente)")
                 self.api_logger.warning(f"⚠️  Archivo saltado por texto insuficiente: {pdf_file.name} (chars: {len(texto) if texto else 0})")
 
+        # Reutilizar la clasificación de documentos casi iguales ya clasificados
+        if self.semantic_cache and texts_and_files:
+            pending = []
+            matches = self.semantic_cache.lookup([texto for texto, _ in texts_and_files])
+            for (texto, filename), match in zip(texts_and_files, matches):
+                if match is None:
+                    pending.append((texto, filename))
+                    continue
+                classification, similarity = match
+                if self.cache and filename in content_hashes:
+                    self.cache.put(content_hashes[filename], classification)
+                result = classification.copy()
+                result['archivo'] = filename
+                result['timestamp'] = classified_at
+                batch_results.append(result)
+                self.logger.info(f"Clasificación reutilizada de un documento similar ({similarity:.2f}): {filename}")
+                self.api_logger.info(f"🧠 Similar a uno ya clasificado ({similarity:.2f}), sin request: {filename}")
+            texts_and_files = pending
+
         if not texts_and_files:
             self.logger.warning("Lote vacío, no hay texto válido para clasificar")
             self.api_logger.warning(f"⚠️  LOTE VACÍO: Ningún archivo del lote tuvo texto válido para clasificar")
-            return []
 
-        # Clasificar con IA
-        classifications = self.classify_batch_with_ai(texts_and_files)
+        return batch_results, texts_and_files, content_hashes
 
+    def _collect_classifications(self, group: List[Tuple[str, str]], classifications: Optional[List[Dict]],
+                                 content_hashes: Dict[str, str], batch_results: List[Dict]):
+        """Añade a batch_results las clasificaciones de un grupo y las guarda en caché."""
         if not classifications:
             self.logger.error("No se recibieron clasificaciones válidas")
-            return []
+            return
 
-        # Procesar resultados
-        batch_results = []
-        for i, (_, filename) in enumerate(texts_and_files):
+        # Procesar resultados (todo el grupo llegó en la misma respuesta: una sola marca de tiempo)
+        classified_at = datetime.now().isoformat()
+        for i, (texto, filename) in enumerate(group):
             if i < len(classifications):
+                if self.cache and filename in content_hashes:
+                    self.cache.put(content_hashes[filename], classifications[i])
+                if self.semantic_cache:
+                    self.semantic_cache.put(texto, classifications[i])
+
                 result = classifications[i].copy()
                 result['archivo'] = filename
-                result['timestamp'] = datetime.now().isoformat()
+                result['timestamp'] = classified_at
                 batch_results.append(result)
 
                 # Log resultado
@@ -403,15 +1288,184 @@ class PDFClassifier:
             else:
                 self.logger.warning(f"Sin clasificación para {filename}")
 
+    def process_batch(self, pdf_files: List[Path], folder_path: Path) -> List[Dict]:
+        """
+        Procesa un lote de archivos PDF.
+
+        Args:
+            pdf_files: Lista de archivos PDF a procesar
+            folder_path: Ruta base de la carpeta
+
+        Returns:
+            Lista de resultados de clasificación
+        """
+        batch_results, texts_and_files, content_hashes = self._prepare_batch(pdf_files, folder_path)
+
+        # Clasificar con IA (un request por grupo de hasta _docs_per_request documentos)
+        for group in self._split_into_requests(texts_and_files):
+            classifications = self.classify_batch_with_ai(group)
+            self._collect_classifications(group, classifications, content_hashes, batch_results)
+
+        return batch_results
+
+    async def _process_batch_async(self, pdf_files: List[Path], folder_path: Path,
+                                   in_flight: asyncio.Semaphore, api_slots: asyncio.Semaphore,
+                                   content_hashes: Optional[Dict[str, str]] = None) -> List[Dict]:
+        """
+        Versión asíncrona de process_batch: la extracción corre en un hilo (que usa
+        el pool de procesos) y los requests se envían con el cliente asíncrono.
+
+        La extracción solo ocupa un lugar de in_flight; el lugar de api_slots se
+        toma al llegar a los requests, así el texto de los lotes siguientes se
+        extrae mientras los anteriores esperan la respuesta de la API. La caché
+        ya se consultó antes de armar los lotes (content_hashes son los hashes
+        de los archivos que no estaban en ella).
+        """
+        async with in_flight:
+            loop = asyncio.get_running_loop()
+            batch_results, texts_and_files, content_hashes = await loop.run_in_executor(
+                None, self._prepare_batch, pdf_files, folder_path, content_hashes, False
+            )
+
+            if texts_and_files:
+                async with api_slots:
+                    groups = self._split_into_requests(texts_and_files)
+                    while groups:
+                        group = groups.pop(0)
+                        try:
+                            classifications = await self.classify_batch_with_ai_async(group, split_on_timeout=True)
+                        except DeadlineExceeded:
+                            # Reintentar en grupos del nuevo tamaño máximo
+                            groups[:0] = self._split_into_requests(group)
+                            continue
+                        self._collect_classifications(group, classifications, content_hashes, batch_results)
+
         return batch_results
 
-    def classify_pdfs_in_folder(self, folder_path: str, output_dir: str = "results") -> Dict:
+    @staticmethod
+    def _hash_files(paths: List[Path]) -> List[Union[str, OSError]]:
+        """
+        Calcula el hash de varios archivos en paralelo.
+
+        hashlib libera el GIL mientras procesa cada bloque, así que los hilos
+        solapan la lectura del disco y el cálculo de distintos archivos.
+
+        Args:
+            paths: Archivos a leer
+
+        Returns:
+            Hash de cada archivo, o el OSError que impidió leerlo, en el orden de paths
+        """
+        def hash_one(path: Path) -> Union[str, OSError]:
+            try:
+                return hash_file(path)
+            except OSError as e:
+                return e
+
+        if len(paths) < 2:
+            return [hash_one(path) for path in paths]
+        with ThreadPoolExecutor(max_workers=min(COPY_THREADS, len(paths))) as executor:
+            return list(executor.map(hash_one, paths))
+
+    def _group_duplicates(self, pdf_files: List[Path]) -> Tuple[List[Path], Dict[str, List[str]], Dict[str, str]]:
+        """
+        Agrupa los PDFs con idéntico contenido para clasificar solo uno por grupo.
+
+        Solo pueden ser iguales archivos del mismo tamaño, así que primero se
+        compara el tamaño (un stat) y se leen completos únicamente los que
+        coinciden con otro; el resto se hashea más tarde solo si lo pide la caché.
+
+        Args:
+            pdf_files: Archivos PDF de la carpeta
+
+        Returns:
+            Tupla con (representantes, duplicados_por_representante, hashes_por_archivo)
+        """
+        representatives = []
+        duplicates = {}
+        file_hashes = {}
+        first_by_hash = {}
+
+        sizes = []
+        files_per_size = {}
+        for pdf_file in pdf_files:
+            try:
+                size = pdf_file.stat().st_size
+            except OSError:
+                size = None  # Se intenta hashear y, si falla, se procesa igual
+            sizes.append(size)
+            files_per_size[size] = files_per_size.get(size, 0) + 1
+
+        colliding = [pdf_file for pdf_file, size in zip(pdf_files, sizes)
+                     if size is None or files_per_size[size] > 1]
+        hashes = iter(self._hash_files(colliding))
+
+        for pdf_file, size in zip(pdf_files, sizes):
+            if size is not None and files_per_size[size] == 1:
+                representatives.append(pdf_file)
+                continue
+
+            content_hash = next(hashes)
+            if isinstance(content_hash, OSError):
+                self.logger.error(f"Error al calcular el hash de '{pdf_file.name}': {content_hash}")
+                representatives.append(pdf_file)
+                continue
+
+            file_hashes[pdf_file.name] = content_hash
+            representative = first_by_hash.get(content_hash)
+            if representative is None:
+                first_by_hash[content_hash] = pdf_file.name
+                representatives.append(pdf_file)
+            else:
+                duplicates.setdefault(representative, []).append(pdf_file.name)
+                self.logger.info(f"Duplicado de {representative}, no se clasifica de nuevo: {pdf_file.name}")
+
+        return representatives, duplicates, file_hashes
+
+    def _previous_results(self, folder_path: Path, output_dir: Path) -> Dict[str, Dict]:
+        """
+        Reúne la clasificación más reciente de cada PDF de una carpeta entre todos
+        los resultados anteriores (ver pdf_utils.latest_results).
+
+        Args:
+            folder_path: Carpeta con PDFs
+            output_dir: Directorio de resultados
+
+        Returns:
+            Diccionario nombre de archivo → resultado más reciente
+        """
+        return latest_results(
+            output_dir, folder_path,
+            on_error=lambda name, e: self.logger.warning(f"No se pudieron leer los resultados de {name}: {e}")
+        )
+
+    def classify_pdfs_in_folder(self, folder_path: str, output_dir: str = "results",
+                                pdf_files: Optional[Iterable[str]] = None) -> Dict:
         """
         Clasifica todos los PDFs en una carpeta.
 
         Args:
             folder_path: Ruta a la carpeta con PDFs
             output_dir: Directorio para guardar resultados
+            pdf_files: Rutas de los PDFs ya listados (por defecto se recorre la carpeta)
+
+        Returns:
+            Diccionario con estadísticas del procesamiento
+        """
+        return asyncio.run(self.classify_pdfs_in_folder_async(folder_path, output_dir, pdf_files))
+
+    async def classify_pdfs_in_folder_async(self, folder_path: str, output_dir: str = "results",
+                                            pdf_files: Optional[Iterable[str]] = None) -> Dict:
+        """
+        Clasifica todos los PDFs en una carpeta enviando varios lotes a la vez.
+
+        Como máximo `concurrency` lotes están en curso simultáneamente y los
+        requests salen, en promedio, uno cada `request_interval` segundos.
+
+        Args:
+            folder_path: Ruta a la carpeta con PDFs
+            output_dir: Directorio para guardar resultados
+            pdf_files: Rutas de los PDFs ya listados (por defecto se recorre la carpeta)
 
         Returns:
             Diccionario con estadísticas del procesamiento
@@ -425,13 +1479,47 @@ class PDFClassifier:
         # Crear directorio de salida
         output_dir.mkdir(exist_ok=True)
 
-        # Encontrar archivos PDF
-        pdf_files = [f for f in folder_path.iterdir()
-                    if f.suffix.lower() == '.pdf' and f.is_file()]
+        # Encontrar archivos PDF (si no vienen ya listados)
+        if pdf_files is None:
+            pdf_files = iter_pdfs(folder_path)
+        pdf_files = [Path(f) for f in pdf_files]
+        total_files = len(pdf_files)
 
         if not pdf_files:
             self.logger.warning("No se encontraron archivos PDF en la carpeta")
-            return {"total_files": 0, "processed": 0, "errors": 0}
+            return {"total_files": 0, "processed": 0, "errors": 0, "success_rate": 0.0,
+                    "already_classified": 0, "already_classified_files": []}
+
+        # Omitir los PDFs ya clasificados en corridas anteriores (salvo que hayan cambiado después)
+        already_classified = []
+        if self.skip_classified:
+            previous = self._previous_results(folder_path, output_dir)
+            if previous:
+                pending = []
+                for pdf_file in pdf_files:
+                    result = previous.get(pdf_file.name)
+                    try:
+                        up_to_date = (result is not None
+                                      and (folder_path / pdf_file.name).stat().st_mtime
+                                      <= datetime.fromisoformat(result['timestamp']).timestamp())
+                    except OSError:
+                        up_to_date = False
+                    if up_to_date:
+                        already_classified.append(pdf_file.name)
+                    else:
+                        pending.append(pdf_file)
+                pdf_files = pending
+
+        if already_classified:
+            self.logger.info(f"{len(already_classified)} archivos ya clasificados en resultados anteriores (usa --force para repetirlos)")
+            if self.on_batch is not None:
+                self.on_batch(len(already_classified))
+
+        if not pdf_files:
+            self.logger.info("Todos los PDFs de la carpeta ya estaban clasificados")
+            return {"total_files": total_files, "processed": 0, "errors": 0, "success_rate": 100.0,
+                    "already_classified": len(already_classified),
+                    "already_classified_files": already_classified}
 
         self.logger.info(f"Encontrados {len(pdf_files)} archivos PDF")
         self.logger.info(f"Procesando en lotes de {self.batch_size}")
@@ -443,58 +1531,155 @@ class PDFClassifier:
         self.api_logger.info(f"Carpeta de salida: {output_dir}")
         self.api_logger.info(f"Total de archivos PDF encontrados: {len(pdf_files)}")
         self.api_logger.info(f"Tamaño de lote configurado: {self.batch_size}")
+        self.api_logger.info(f"Procesos de extracción: {self.max_workers}")
+        self.api_logger.info(f"Lotes simultáneos: {self.concurrency}")
+        self.api_logger.info(f"Lotes extraídos por adelantado: {self.prefetch_batches}")
         self.api_logger.info(f"Archivos a procesar: {[f.name for f in pdf_files]}")
-        self.api_logger.info(f"=" * 80)
+        self.api_logger.info(_LOG_RULE)
 
         # Procesar en lotes
-        all_results = []
         processed_count = 0
         error_count = 0
 
-        for i in range(0, len(pdf_files), self.batch_size):
-            batch = pdf_files[i:i + self.batch_size]
+        # Control de rate limits: lotes simultáneos acotados y requests espaciados.
+        # Además de esos lotes, hasta prefetch_batches pueden ir extrayendo texto.
+        api_slots = asyncio.Semaphore(self.concurrency)
+        in_flight = asyncio.Semaphore(self.concurrency + self.prefetch_batches)
+        self._throttle_lock = asyncio.Lock()
+        self._tokens = float(self.request_burst)
+        self._tokens_at = time.monotonic()
+        self._backoff = 0.0
+        self._paused_until = 0.0
+        self._docs_per_request = self.batch_size
+
+        # Clasificar una sola vez cada contenido distinto
+        unique_files, duplicates, file_hashes = self._group_duplicates(pdf_files)
+        if duplicates:
+            duplicate_count = sum(len(peers) for peers in duplicates.values())
+            self.logger.info(f"{duplicate_count} archivos duplicados reutilizarán la clasificación de su original")
+            self.api_logger.info(f"♻️  Duplicados por contenido (sin request): {duplicates}")
+
+        # Resolver con la caché antes de armar los lotes: así los lotes solo llevan
+        # PDFs que necesitan la API y no quedan requests con un par de documentos
+        cached_results = []
+        content_hashes = {}
+        if self.cache:
+            cached_results, unique_files, content_hashes = await asyncio.get_running_loop().run_in_executor(
+                None, self._lookup_cache, unique_files, folder_path, file_hashes
+            )
 
-            try:
-                batch_results = self.process_batch(batch, folder_path)
-                all_results.extend(batch_results)
-                processed_count += len(batch_results)
+        batches = [unique_files[i:i + self.batch_size] for i in range(0, len(unique_files), self.batch_size)]
 
-                # Pausa entre lotes para respetar rate limits
-                if i + self.batch_size < len(pdf_files):
-                    self.logger.info("Pausa de 2 segundos antes del siguiente lote...")
-                    time.sleep(2)
+        # Pool de procesos para la extracción de texto (CPU-bound): no más procesos
+        # que PDFs a extraer, porque arrancar cada trabajador tiene su costo
+        workers = min(self.max_workers, len(unique_files))
+        executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+        self._executor = executor
 
-            except Exception as e:
-                self.logger.error(f"Error procesando lote {i//self.batch_size + 1}: {e}")
+        # Cada lote escribe sus resultados en un JSONL apenas termina: la memoria no
+        # crece con la cantidad de PDFs y el avance queda en disco si se interrumpe
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        partial_file = output_dir / f"clasificacion_{timestamp}.jsonl"
+        folder_key = os.path.realpath(folder_path)
+
+        def record(batch_results: List[Dict], partial) -> int:
+            # Copiar la clasificación a los duplicados del mismo contenido
+            for result in batch_results[:]:
+                for peer in duplicates.get(result['archivo'], []):
+                    peer_result = result.copy()
+                    peer_result['archivo'] = peer
+                    batch_results.append(peer_result)
+
+            # La carpeta de origen permite omitir estos PDFs en la próxima corrida
+            for result in batch_results:
+                result['carpeta'] = folder_key
+
+            append_jsonl(partial, batch_results)
+            return len(batch_results)
+
+        async def run_batch(batch: List[Path], partial) -> int:
+            try:
+                batch_results = await self._process_batch_async(batch, folder_path, in_flight, api_slots, content_hashes)
+                return record(batch_results, partial)
+            finally:
+                # Avisar el avance, contando también los duplicados que resuelve el lote
+                if self.on_batch is not None:
+                    self.on_batch(len(batch) + sum(len(duplicates.get(f.name, ())) for f in batch))
+
+        try:
+            with open(partial_file, 'wb') as partial:
+                if cached_results:
+                    resolved = record(cached_results, partial)
+                    processed_count += resolved
+                    if self.on_batch is not None:
+                        self.on_batch(resolved)
+                outcomes = await asyncio.gather(*(run_batch(batch, partial) for batch in batches),
+                                                return_exceptions=True)
+        finally:
+            self._executor = None
+            if executor is not None:
+                executor.shutdown()
+
+        for batch_number, (batch, outcome) in enumerate(zip(batches, outcomes), 1):
+            if isinstance(outcome, Exception):
+                self.logger.error(f"Error procesando lote {batch_number}: {outcome}")
                 error_count += len(batch)
+            else:
+                processed_count += outcome
 
         # Guardar resultados
-        self._save_results(all_results, output_dir)
+        self._save_results(partial_file, processed_count, output_dir, timestamp)
 
+        # total_files cuenta todos los PDFs de la carpeta: los ya clasificados también son éxitos
         stats = {
-            "total_files": len(pdf_files),
+            "total_files": total_files,
             "processed": processed_count,
             "errors": error_count,
-            "success_rate": processed_count / len(pdf_files) * 100 if pdf_files else 0
+            "success_rate": (processed_count + len(already_classified)) / total_files * 100,
+            "already_classified": len(already_classified),
+            "already_classified_files": already_classified
         }
 
         self.logger.info(f"Procesamiento completado: {processed_count}/{len(pdf_files)} archivos")
         self.logger.info(f"Tasa de éxito: {stats['success_rate']:.1f}%")
 
+        if self.cache:
+            stats['cache'] = dict(self.cache.stats)
+            self.logger.info(f"Caché: {self.cache.stats['hits']} aciertos, {self.cache.stats['misses']} fallos")
+            pruned = self.cache.prune()
+            if pruned:
+                self.logger.info(f"Caché: {pruned} entradas antiguas eliminadas")
+
+            text_stats = self.text_cache.stats
+            self.logger.info(f"Caché de texto: {text_stats['hits']} aciertos, {text_stats['misses']} fallos")
+            self.text_cache.prune()
+
+        if self.semantic_cache:
+            stats['semantic_cache'] = dict(self.semantic_cache.stats)
+            self.logger.info(f"Caché semántica: {self.semantic_cache.stats['hits']} aciertos, "
+                             f"{self.semantic_cache.stats['misses']} fallos")
+            try:
+                self.semantic_cache.save()
+            except OSError as e:
+                self.logger.warning(f"No se pudo guardar la caché semántica: {e}")
+
         # Log de fin de sesión en el archivo de API
-        self.api_logger.info(f"=" * 80)
+        self.api_logger.info(_LOG_RULE)
         self.api_logger.info(f"🏁 SESIÓN DE CLASIFICACIÓN COMPLETADA")
         self.api_logger.info(f"Fecha y hora de finalización: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         self.api_logger.info(f"📊 ESTADÍSTICAS FINALES:")
-        self.api_logger.info(f"  Total de archivos: {len(pdf_files)}")
+        self.api_logger.info(f"  Total de archivos: {total_files}")
+        self.api_logger.info(f"  Ya clasificados (omitidos): {len(already_classified)}")
         self.api_logger.info(f"  Archivos procesados exitosamente: {processed_count}")
         self.api_logger.info(f"  Archivos con errores: {error_count}")
         self.api_logger.info(f"  Tasa de éxito: {stats['success_rate']:.1f}%")
+        if 'cache' in stats:
+            self.api_logger.info(f"  Aciertos de caché: {stats['cache']['hits']}")
         self.api_logger.info(f"  Resultados guardados en: {output_dir}")
         self.api_logger.info(f"  Log general: {self.general_log_file}")
         self.api_logger.info(f"  Log de API: {self.api_log_file}")
         self.api_logger.info(f"🎯 FIN DE SESIÓN")
-        self.api_logger.info(f"=" * 100 + "\n")
+        self.api_logger.info(_LOG_RULE_END)
 
         # Agregar información de logs a las estadísticas
         stats['log_files'] = {
@@ -505,49 +1690,137 @@ class PDFClassifier:
 
         return stats
 
-    def _save_results(self, results: List[Dict], output_dir: Path):
-        """Guarda los resultados en archivos JSON y CSV."""
-        if not results:
+    def _save_results(self, partial_file: Path, count: int, output_dir: Path, timestamp: str):
+        """
+        Convierte el JSONL parcial en los archivos JSON y CSV de resultados.
+
+        Los resultados se leen y escriben de a uno (sin cargarlos todos en memoria);
+        el JSONL se elimina una vez generados ambos archivos, o se conserva como
+        archivo de resultados si results_format es "jsonl".
+
+        Args:
+            partial_file: JSONL escrito durante la clasificación
+            count: Cantidad de resultados que contiene
+            output_dir: Directorio de resultados
+            timestamp: Marca de tiempo de la sesión de clasificación
+        """
+        if not count:
             self.logger.warning("No hay resultados para guardar")
+            partial_file.unlink(missing_ok=True)
             return
 
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        # La cantidad en el nombre permite listar resultados sin abrir los archivos
+        base_name = f"clasificacion_{timestamp}_{count}_files"
+        json_file = output_dir / f"{base_name}.json"
+        csv_file = output_dir / f"{base_name}.csv"
+
+        fieldnames = ('documento', 'archivo', 'tema_general', 'subtema', 'tema_especifico',
+                      'confianza', 'palabras_clave', 'timestamp')
+
+        # Con results_format="jsonl" el JSONL parcial queda como archivo de resultados
+        # (una línea por resultado, ya escrita): solo falta el CSV
+        json_out = None if self.results_format == "jsonl" else open(json_file, 'wb')
+        with open(csv_file, 'w', newline='', encoding='utf-8') as csv_out:
+            def csv_rows():
+                # Escribe cada resultado en el JSON y entrega su fila de CSV ya proyectada
+                # (tupla en el orden de fieldnames), para que writerows recorra todo en C
+                separator = b"\n  "
+                for result in iter_jsonl(partial_file):
+                    if json_out is not None:
+                        # Mismo formato que un json.dump(indent=2) de la lista completa
+                        json_out.write(separator + dumps_json(result, indent=True).replace(b"\n", b"\n  "))
+                        separator = b",\n  "
 
-        # Guardar JSON
-        json_file = output_dir / f"clasificacion_{timestamp}.json"
-        with open(json_file, 'w', encoding='utf-8') as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
-        self.logger.info(f"Resultados guardados en JSON: {json_file}")
-
-        # Guardar CSV
-        csv_file = output_dir / f"clasificacion_{timestamp}.csv"
-        with open(csv_file, 'w', newline='', encoding='utf-8') as f:
-            if results:
-                fieldnames = ['documento', 'archivo', 'tema_general', 'subtema', 'tema_especifico',
-                             'confianza', 'palabras_clave', 'timestamp']
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
-                writer.writeheader()
-
-                for result in results:
                     # Convertir lista de palabras clave a string
-                    result_copy = result.copy()
-                    if 'palabras_clave' in result_copy and isinstance(result_copy['palabras_clave'], list):
-                        result_copy['palabras_clave'] = ', '.join(result_copy['palabras_clave'])
-                    # Filtrar solo los campos que están en fieldnames
-                    filtered_result = {k: v for k, v in result_copy.items() if k in fieldnames}
-                    writer.writerow(filtered_result)
-
+                    get = result.get
+                    keywords = get('palabras_clave')
+                    if isinstance(keywords, list):
+                        keywords = ', '.join(keywords)
+                    yield (get('documento'), get('archivo'), get('tema_general'), get('subtema'),
+                           get('tema_especifico'), get('confianza'), keywords, get('timestamp'))
+
+            writer = csv.writer(csv_out)
+            writer.writerow(fieldnames)
+            if json_out is None:
+                writer.writerows(csv_rows())
+            else:
+                with json_out:
+                    json_out.write(b"[")
+                    writer.writerows(csv_rows())
+                    json_out.write(b"\n]")
+
+        if json_out is None:
+            json_file = json_file.with_suffix(".jsonl")
+            os.replace(partial_file, json_file)
+            self.logger.info(f"Resultados guardados en JSONL: {json_file}")
+        else:
+            partial_file.unlink()
+            self.logger.info(f"Resultados guardados en JSON: {json_file}")
         self.logger.info(f"Resultados guardados en CSV: {csv_file}")
 
-    def organize_files_by_classification(self, results: List[Dict], source_folder: Path,
-                                       organized_folder: Path = None) -> Dict[str, int]:
+    @staticmethod
+    def _copy_with_dates(source_file: Path, dest_file: Path):
+        """Copia un PDF organizado conservando sus fechas (como shutil.copy2)."""
+        try:
+            copy_file(source_file, dest_file)
+        except shutil.SameFileError:
+            # Era un hardlink del original (organizado antes con link_mode="hardlink"):
+            # se quita el enlace y se hace una copia independiente
+            os.unlink(dest_file)
+            copy_file(source_file, dest_file)
+        shutil.copystat(source_file, dest_file)
+
+    @staticmethod
+    def _link_file(source_file: Path, dest_file: Path) -> bool:
+        """
+        Coloca un PDF organizado como hardlink del original (sin copiar datos).
+
+        Args:
+            source_file: PDF original
+            dest_file: Ruta en la carpeta organizada (se reemplaza si ya existe)
+
+        Returns:
+            False si no se puede enlazar (otro sistema de archivos, sin soporte)
+        """
+        try:
+            os.link(source_file, dest_file)
+            return True
+        except FileExistsError:
+            pass
+        except OSError:
+            return False
+
+        # Organizado en una corrida anterior: si ya es el mismo archivo no hay nada que hacer
+        if os.path.samefile(source_file, dest_file):
+            return True
+        tmp_file = dest_file.with_name(f".{dest_file.name}.{os.getpid()}.tmp")
+        try:
+            os.link(source_file, tmp_file)
+        except OSError:
+            return False
+        os.replace(tmp_file, dest_file)
+        return True
+
+    def organize_files_by_classification(self, results: Iterable[Dict], source_folder: Path,
+                                       organized_folder: Path = None,
+                                       link_mode: str = "copy",
+                                       pdf_files: Optional[Iterable[str]] = None,
+                                       io_workers: Optional[int] = None) -> Dict[str, int]:
         """
         Organiza los archivos PDF en carpetas basadas en su clasificación.
 
         Args:
-            results: Lista de resultados de clasificación
+            results: Resultados de clasificación (lista o iterable, se recorre una sola vez)
             source_folder: Carpeta origen con los PDFs
             organized_folder: Carpeta destino para la organización
+            link_mode: "copy" para copias independientes (default) o "hardlink" para
+                       enlazar cada PDF a su original cuando están en el mismo sistema de
+                       archivos (sin copiar datos; si no, se copia). Un hardlink comparte el
+                       contenido: editar o anotar uno de los dos cambia el otro
+            pdf_files: Rutas de los PDFs de source_folder ya listados (por defecto se
+                       recorre la carpeta)
+            io_workers: Hilos que copian o enlazan a la vez (default: COPY_THREADS;
+                        1 en discos mecánicos, donde el acceso en paralelo no ayuda)
 
         Returns:
             Diccionario con estadísticas de organización
@@ -569,6 +1842,27 @@ class PDFClassifier:
 
         self.logger.info(f"Organizando archivos en: {organized_folder}")
 
+        def place(job: Tuple[str, Path, Path]) -> Optional[Exception]:
+            _, source_file, dest_file = job
+            try:
+                if link_mode == "hardlink" and self._link_file(source_file, dest_file):
+                    return None
+                self._copy_with_dates(source_file, dest_file)
+            except Exception as e:
+                return e
+            return None
+
+        # Una sola lectura de la carpeta (la de la clasificación, si ya se hizo) responde
+        # qué PDFs existen y cuáles quedan sin clasificar
+        if pdf_files is None:
+            pdf_files = iter_pdfs(source_folder)
+        pending_files = {os.path.basename(path) for path in pdf_files}
+
+        # Primero se decide el destino de cada PDF (y se crean las carpetas);
+        # las copias o enlaces se hacen después, en paralelo
+        organized_jobs = []
+        unclassified_jobs = []
+
         # Organizar archivos clasificados
         for result in results:
             stats["total_processed"] += 1
@@ -578,12 +1872,13 @@ class PDFClassifier:
                 stats["errors"] += 1
                 continue
 
-            source_file = source_folder / archivo
-
-            if not source_file.exists():
+            if archivo not in pending_files:
                 self.logger.warning(f"Archivo no encontrado: {archivo}")
                 stats["errors"] += 1
                 continue
+            pending_files.discard(archivo)
+
+            source_file = source_folder / archivo
 
             try:
                 # Determinar carpeta destino
@@ -592,10 +1887,7 @@ class PDFClassifier:
 
                 if not tema_general or tema_general.lower() in ['n/a', 'na', 'none']:
                     # Mover a no_clasificados
-                    dest_file = no_clasificados_folder / archivo
-                    shutil.copy2(source_file, dest_file)
-                    stats["moved_to_unclassified"] += 1
-                    self.logger.info(f"Movido a no_clasificados: {archivo}")
+                    unclassified_jobs.append((archivo, source_file, no_clasificados_folder / archivo))
                 else:
                     # Crear estructura de carpetas
                     tema_folder = self._sanitize_folder_name(tema_general)
@@ -606,33 +1898,46 @@ class PDFClassifier:
                     else:
                         dest_folder = organized_folder / tema_folder
 
-                    dest_folder.mkdir(parents=True, exist_ok=True)
-                    stats["folders_created"].add(str(dest_folder))
-
-                    dest_file = dest_folder / archivo
-                    shutil.copy2(source_file, dest_file)
-                    stats["successfully_organized"] += 1
+                    if str(dest_folder) not in stats["folders_created"]:
+                        dest_folder.mkdir(parents=True, exist_ok=True)
+                        stats["folders_created"].add(str(dest_folder))
 
-                    self.logger.info(f"Organizado: {archivo} → {dest_folder.name}")
+                    organized_jobs.append((archivo, source_file, dest_folder / archivo))
 
             except Exception as e:
                 self.logger.error(f"Error organizando {archivo}: {e}")
                 stats["errors"] += 1
 
-        # Buscar archivos no clasificados (que no aparecen en results)
-        classified_files = {result.get('archivo', '') for result in results}
-        all_pdfs = list(source_folder.glob("*.pdf"))
+        # Archivos no clasificados (los que no aparecen en results)
+        classified_unclassified = len(unclassified_jobs)
+        unclassified_jobs.extend((archivo, source_folder / archivo, no_clasificados_folder / archivo)
+                                 for archivo in sorted(pending_files))
+
+        # Enlazar o copiar en paralelo (es E/S: los hilos se solapan en la espera del disco);
+        # map devuelve los resultados en el orden de entrada
+        jobs = organized_jobs + unclassified_jobs
+        workers = max(1, min(io_workers or COPY_THREADS, len(jobs)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            errors = list(executor.map(place, jobs))
+
+        for (archivo, _, dest_file), error in zip(organized_jobs, errors):
+            if error is not None:
+                self.logger.error(f"Error organizando {archivo}: {error}")
+                stats["errors"] += 1
+            else:
+                stats["successfully_organized"] += 1
+                self.logger.info(f"Organizado: {archivo} → {dest_file.parent.name}")
 
-        for pdf_file in all_pdfs:
-            if pdf_file.name not in classified_files:
-                try:
-                    dest_file = no_clasificados_folder / pdf_file.name
-                    shutil.copy2(pdf_file, dest_file)
-                    stats["moved_to_unclassified"] += 1
-                    self.logger.info(f"Archivo no clasificado movido: {pdf_file.name}")
-                except Exception as e:
-                    self.logger.error(f"Error moviendo archivo no clasificado {pdf_file.name}: {e}")
-                    stats["errors"] += 1
+        for i, ((archivo, _, _), error) in enumerate(zip(unclassified_jobs, errors[len(organized_jobs):])):
+            if error is not None:
+                self.logger.error(f"Error moviendo archivo no clasificado {archivo}: {error}")
+                stats["errors"] += 1
+            else:
+                stats["moved_to_unclassified"] += 1
+                if i < classified_unclassified:
+                    self.logger.info(f"Movido a no_clasificados: {archivo}")
+                else:
+                    self.logger.info(f"Archivo no clasificado movido: {archivo}")
 
         # Convertir set a count para el reporte
         stats["folders_created"] = len(stats["folders_created"])
@@ -646,7 +1951,9 @@ class PDFClassifier:
         return stats
 
     def classify_and_organize(self, folder_path: str, output_dir: str = "results",
-                            organize_files: bool = True, organized_folder: str = None) -> Dict:
+                            organize_files: bool = True, organized_folder: str = None,
+                            pdf_files: Optional[Iterable[str]] = None,
+                            link_mode: str = "copy", io_workers: Optional[int] = None) -> Dict:
         """
         Clasifica PDFs y opcionalmente los organiza en carpetas.
 
@@ -655,39 +1962,50 @@ class PDFClassifier:
             output_dir: Directorio para guardar resultados
             organize_files: Si True, organiza los archivos en carpetas
             organized_folder: Carpeta personalizada para organización
+            pdf_files: Rutas de los PDFs ya listados (por defecto se recorre la carpeta)
+            link_mode: "copy" (copias independientes, default) o "hardlink" (enlazar al original si se puede)
+            io_workers: Hilos para copiar o enlazar al organizar (default: COPY_THREADS)
 
         Returns:
             Diccionario con estadísticas completas
         """
+        # Listar la carpeta una sola vez: la misma lista sirve para clasificar y para organizar
+        # (si la carpeta no existe, classify_pdfs_in_folder lo informa)
+        if pdf_files is not None:
+            pdf_files = list(pdf_files)
+        elif os.path.isdir(folder_path):
+            pdf_files = list(iter_pdfs(folder_path))
+
         # Primero clasificar
-        classification_stats = self.classify_pdfs_in_folder(folder_path, output_dir)
+        classification_stats = self.classify_pdfs_in_folder(folder_path, output_dir, pdf_files)
 
-        if not organize_files or classification_stats["processed"] == 0:
+        if not organize_files or (classification_stats["processed"] == 0
+                                  and not classification_stats.get("already_classified")):
             return classification_stats
 
-        # Cargar resultados de la clasificación más reciente
-        output_dir_path = Path(output_dir)
-        json_files = list(output_dir_path.glob("clasificacion_*.json"))
+        # La clasificación más reciente de cada PDF de la carpeta: los omitidos por ya
+        # estar clasificados (o toda la carpeta, si no hubo nada nuevo) están en
+        # resultados anteriores, no en el archivo de esta corrida
+        folder_path = Path(folder_path)
+        previous = self._previous_results(folder_path, Path(output_dir))
+        present = {os.path.basename(path) for path in pdf_files}
+        results = [result for filename, result in previous.items() if filename in present]
 
-        if not json_files:
+        if not results:
             self.logger.warning("No se encontraron archivos de clasificación para organizar")
             return classification_stats
 
-        # Usar el archivo más reciente
-        latest_json = max(json_files, key=lambda x: x.stat().st_mtime)
-
-        with open(latest_json, 'r', encoding='utf-8') as f:
-            results = json.load(f)
-
         # Organizar archivos
-        folder_path = Path(folder_path)
         if organized_folder:
             organized_folder_path = Path(organized_folder)
         else:
             organized_folder_path = folder_path.parent / f"{folder_path.name}_clasificado"
 
         organization_stats = self.organize_files_by_classification(
-            results, folder_path, organized_folder_path
+            results, folder_path, organized_folder_path,
+            link_mode=link_mode,
+            pdf_files=pdf_files,
+            io_workers=io_workers
         )
 
         # Combinar estadísticas
@@ -707,15 +2025,42 @@ def main():
     parser = argparse.ArgumentParser(description="Clasificador temático de PDFs con Google Gemini")
     parser.add_argument("folder", help="Carpeta con archivos PDF a clasificar")
     parser.add_argument("--batch-size", type=int, default=5, help="Tamaño del lote (default: 5)")
+    parser.add_argument("--workers", type=int, help="Procesos para extraer texto (default: PDF_WORKERS o núcleos de CPU)")
+    parser.add_argument("--concurrency", type=int, help="Lotes enviados a la API a la vez (default: GEMINI_CONCURRENCY o 4)")
+    parser.add_argument("--prefetch", type=int, default=2, help="Lotes extra extraídos por adelantado (default: 2)")
+    parser.add_argument("--rpm", type=float, default=30, help="Requests por minuto a la API, en promedio (default: 30)")
     parser.add_argument("--output", default="results", help="Directorio de salida (default: results)")
     parser.add_argument("--organize", action="store_true", help="Organizar archivos en carpetas por tema")
     parser.add_argument("--organized-folder", help="Carpeta personalizada para organización")
     parser.add_argument("--no-organize", action="store_true", help="Solo clasificar, no organizar archivos")
+    parser.add_argument("--link-mode", choices=["copy", "hardlink"], default="copy",
+                        help="Cómo colocar los PDFs organizados: copia independiente (default) o hardlink al original (sin copiar datos; editar uno cambia el otro)")
+    parser.add_argument("--io-workers", type=int,
+                        help=f"Hilos que copian o enlazan al organizar (default: {COPY_THREADS}; usa 1 en discos mecánicos)")
+    parser.add_argument("--results-format", choices=["json", "jsonl"], default="json",
+                        help="Formato de los resultados: arreglo JSON legible (default) o JSONL, una línea por resultado (más rápido en corridas grandes)")
+    parser.add_argument("--no-cache", action="store_true", help="No usar la caché de clasificaciones")
+    parser.add_argument("--fast-rules", action="store_true",
+                        help="Clasificar por patrones, sin la API, facturas, preprints de arXiv y CVs (puede equivocarse con documentos que solo mencionan esas palabras)")
+    parser.add_argument("--force", action="store_true", help="Clasificar también los PDFs que ya figuran en resultados anteriores")
+    parser.add_argument("--semantic-threshold", type=float,
+                        help="Reutilizar la clasificación de documentos casi iguales desde esta similitud (ej: 0.92; requiere sentence-transformers)")
 
     args = parser.parse_args()
 
     try:
-        classifier = PDFClassifier(batch_size=args.batch_size)
+        classifier = PDFClassifier(
+            batch_size=args.batch_size,
+            max_workers=args.workers,
+            concurrency=args.concurrency,
+            prefetch_batches=args.prefetch,
+            request_interval=60 / args.rpm if args.rpm > 0 else 0,
+            cache_dir=None if args.no_cache else "cache",
+            fast_rules=args.fast_rules,
+            skip_classified=not args.force,
+            semantic_threshold=args.semantic_threshold,
+            results_format=args.results_format
+        )
 
         # Determinar si organizar archivos
         organize_files = args.organize or (not args.no_organize)
@@ -725,29 +2070,38 @@ def main():
                 folder_path=args.folder,
                 output_dir=args.output,
                 organize_files=True,
-                organized_folder=args.organized_folder
+                organized_folder=args.organized_folder,
+                link_mode=args.link_mode,
+                io_workers=args.io_workers
             )
         else:
             stats = classifier.classify_pdfs_in_folder(args.folder, args.output)
 
-        print("\n" + "="*50)
-        print("RESUMEN DE PROCESAMIENTO")
-        print("="*50)
-        print(f"Archivos totales: {stats['total_files']}")
-        print(f"Procesados exitosamente: {stats['processed']}")
-        print(f"Errores: {stats['errors']}")
-        print(f"Tasa de éxito: {stats['success_rate']:.1f}%")
+        # Resumen en una sola escritura a la terminal
+        resumen = f"""
+{_SUMMARY_RULE}
+RESUMEN DE PROCESAMIENTO
+{_SUMMARY_RULE}
+Archivos totales: {stats['total_files']}
+Procesados exitosamente: {stats['processed']}
+Errores: {stats['errors']}
+Tasa de éxito: {stats['success_rate']:.1f}%
+"""
+        if stats.get('already_classified'):
+            resumen += f"Ya clasificados (omitidos): {stats['already_classified']}\n"
 
         # Mostrar estadísticas de organización si están disponibles
         if 'organization' in stats:
             org_stats = stats['organization']
-            print("\n--- ORGANIZACIÓN DE ARCHIVOS ---")
-            print(f"Archivos organizados por tema: {org_stats['successfully_organized']}")
-            print(f"Movidos a 'no_clasificados': {org_stats['moved_to_unclassified']}")
-            print(f"Carpetas creadas: {org_stats['folders_created']}")
-            print(f"Carpeta de organización: {stats.get('organized_folder', 'N/A')}")
+            resumen += f"""
+--- ORGANIZACIÓN DE ARCHIVOS ---
+Archivos organizados por tema: {org_stats['successfully_organized']}
+Movidos a 'no_clasificados': {org_stats['moved_to_unclassified']}
+Carpetas creadas: {org_stats['folders_created']}
+Carpeta de organización: {stats.get('organized_folder', 'N/A')}
+"""
 
-        print("="*50)
+        print(resumen + _SUMMARY_RULE)
 
     except Exception as e:
         print(f"Error crítico: {e}")
@@ -0,0 +1,338 @@
+#!/usr/bin/env python3
+"""
+Utilidades livianas para archivos PDF
+=====================================
+Funciones sin dependencias externas que pueden usar el clasificador,
+el menú y los ejemplos sin cargar PyMuPDF ni la API de Gemini.
+"""
+
+import os
+import re
+import json
+import errno
+import shutil
+import hashlib
+from datetime import datetime
+from operator import itemgetter
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# Archivos de resultados mayores que esto se cuentan en streaming (si ijson está instalado)
+STREAMING_THRESHOLD_BYTES = 100 * 1024 * 1024
+
+# Errores con los que copy_file_range indica que no sirve para este par de archivos
+# (otro sistema de archivos en kernels viejos, sin soporte, descriptores no válidos...)
+_COPY_RANGE_UNSUPPORTED = {errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP,
+                           errno.ENOTSUP, errno.EBADF, errno.EPERM}
+
+# Nombre de los archivos de resultados que incluyen la cantidad de clasificaciones
+_RESULT_COUNT_RE = re.compile(r"clasificacion_\d{8}_\d{6}_(\d+)_files\.jsonl?$")
+
+
+def iter_pdfs(root: Union[str, os.PathLike], recursive: bool = False) -> Iterator[str]:
+    """
+    Recorre los PDFs de una carpeta.
+
+    Usa os.scandir, que obtiene el tipo de cada entrada al leer el directorio,
+    y compara la extensión sin distinguir mayúsculas (incluye los .PDF).
+    En modo recursivo las subcarpetas se recorren con una pila explícita
+    (sin seguir enlaces simbólicos a carpetas ni detenerse en las ilegibles).
+
+    Args:
+        root: Carpeta a recorrer
+        recursive: Si también se recorren las subcarpetas
+
+    Returns:
+        Iterador con la ruta de cada PDF
+    """
+    pending = [root]
+    while pending:
+        folder = pending.pop()
+        try:
+            entries = os.scandir(folder)
+        except OSError:
+            if folder is root:
+                raise
+            continue  # Subcarpeta ilegible: se omite, como hace Path.rglob
+
+        with entries:
+            for entry in entries:
+                if entry.name.lower().endswith(".pdf") and entry.is_file(follow_symlinks=False):
+                    yield entry.path
+                elif recursive and entry.is_dir(follow_symlinks=False):
+                    pending.append(entry.path)
+
+
+def list_result_files(results_dir: Union[str, os.PathLike]) -> List[Tuple[float, int, str, str]]:
+    """
+    Lista los archivos de resultados (clasificacion_*.json o clasificacion_*_files.jsonl),
+    del más reciente al más antiguo. No incluye el JSONL parcial de una clasificación en curso.
+
+    Cada archivo se consulta una sola vez: la fecha y el tamaño devueltos
+    evitan volver a hacer stat() al mostrarlos o al decidir cómo leerlos.
+
+    Args:
+        results_dir: Carpeta de resultados
+
+    Returns:
+        Lista de tuplas (mtime, tamaño, nombre, ruta); vacía si la carpeta no existe
+    """
+    results = []
+    try:
+        with os.scandir(results_dir) as entries:
+            for entry in entries:
+                name = entry.name
+                if not (name.startswith("clasificacion_")
+                        and (name.endswith(".json") or name.endswith("_files.jsonl"))):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    info = entry.stat()
+                except OSError:
+                    continue  # Borrado mientras se listaba
+                results.append((info.st_mtime, info.st_size, name, entry.path))
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+    results.sort(key=itemgetter(0), reverse=True)
+    return results
+
+
+def count_results(path: Union[str, os.PathLike], size: Optional[int] = None) -> Optional[int]:
+    """
+    Devuelve cuántas clasificaciones contiene un archivo de resultados.
+
+    Los archivos nuevos llevan la cantidad en el nombre, así que no se abren.
+    Los anteriores se leen con orjson si está disponible; los muy grandes se
+    cuentan en streaming si ijson está instalado.
+
+    Args:
+        path: Ruta al archivo clasificacion_*.json
+        size: Tamaño en bytes si ya se conoce (p. ej. de list_result_files)
+
+    Returns:
+        Cantidad de resultados o None si el archivo no se puede leer
+    """
+    match = _RESULT_COUNT_RE.search(os.path.basename(path))
+    if match:
+        return int(match.group(1))
+
+    try:
+        with open(path, 'rb') as f:
+            if size is None:
+                size = os.fstat(f.fileno()).st_size
+            if IJSON_AVAILABLE and size > STREAMING_THRESHOLD_BYTES:
+                return sum(1 for _ in ijson.items(f, 'item'))
+            data = f.read()
+        return len(orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data))
+    except (OSError, ValueError):
+        return None
+
+
+def iter_results(path: Union[str, os.PathLike]) -> Iterator[Dict]:
+    """
+    Lee un archivo de resultados (clasificacion_*.json o .jsonl) resultado por resultado.
+
+    Usa orjson si está disponible; los JSONL se leen línea por línea y los
+    JSON muy grandes en streaming si ijson está instalado.
+
+    Args:
+        path: Ruta al archivo de resultados
+
+    Returns:
+        Iterador sobre los resultados
+    """
+    if os.fspath(path).endswith(".jsonl"):
+        yield from iter_jsonl(path)
+        return
+
+    with open(path, 'rb') as f:
+        if IJSON_AVAILABLE and os.fstat(f.fileno()).st_size > STREAMING_THRESHOLD_BYTES:
+            yield from ijson.items(f, 'item')
+            return
+        data = f.read()
+
+    yield from (orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data))
+
+
+def latest_results(results_dir: Union[str, os.PathLike], folder: Union[str, os.PathLike],
+                   on_error: Optional[Callable[[str, Exception], None]] = None) -> Dict[str, Dict]:
+    """
+    Reúne la clasificación más reciente de cada PDF de una carpeta entre todos los
+    archivos de resultados (una corrida incremental guarda solo los PDFs que
+    clasificó; los demás están en resultados anteriores).
+
+    Solo cuentan los resultados que registran su carpeta de origen (campo
+    'carpeta') y su fecha (campo 'timestamp'), para no confundir archivos
+    homónimos de otras carpetas.
+
+    Args:
+        results_dir: Carpeta de resultados
+        folder: Carpeta de los PDFs
+        on_error: Función llamada con (nombre, excepción) por cada archivo de
+                  resultados que no se puede leer (por defecto se omite en silencio)
+
+    Returns:
+        Diccionario nombre de archivo → resultado más reciente
+    """
+    folder_key = os.path.realpath(folder)
+    latest = {}  # nombre de archivo -> (fecha, resultado)
+
+    for _, _, name, path in list_result_files(results_dir):
+        try:
+            for result in iter_results(path):
+                if result.get('carpeta') != folder_key:
+                    continue
+                try:
+                    classified_at = datetime.fromisoformat(result['timestamp'])
+                except (KeyError, TypeError, ValueError):
+                    continue
+                filename = result.get('archivo')
+                previous = latest.get(filename)
+                if previous is None or classified_at > previous[0]:
+                    latest[filename] = (classified_at, result)
+        except Exception as e:
+            if on_error is not None:
+                on_error(name, e)
+
+    return {filename: result for filename, (_, result) in latest.items()}
+
+
+def loads_json(data: Union[bytes, str]) -> Any:
+    """
+    Parsea JSON con orjson si está disponible (bastante más rápido que json.loads).
+
+    Args:
+        data: JSON en bytes o texto
+
+    Returns:
+        Datos parseados (lanza json.JSONDecodeError si no es JSON válido;
+        orjson.JSONDecodeError es subclase de esa excepción)
+    """
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
+
+
+def dumps_json(data: Any, indent: bool = False) -> bytes:
+    """
+    Serializa datos como JSON en UTF-8 (sin escapar acentos).
+
+    Usa orjson si está disponible: serializa directamente a bytes, varias veces
+    más rápido que el módulo json en listas grandes de resultados.
+
+    Args:
+        data: Datos serializables (claves de tipo str)
+        indent: Si se indenta con 2 espacios (legible) o se escribe compacto
+
+    Returns:
+        JSON codificado en UTF-8
+    """
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None, ensure_ascii=False).encode('utf-8')
+
+
+def write_json(path: Union[str, os.PathLike], data: Any, indent: bool = True) -> None:
+    """
+    Escribe datos como JSON en UTF-8.
+
+    Args:
+        path: Archivo de destino
+        data: Datos serializables (claves de tipo str)
+        indent: Si se indenta con 2 espacios (legible) o se escribe compacto
+    """
+    with open(path, 'wb') as f:
+        f.write(dumps_json(data, indent))
+
+
+def append_jsonl(f: BinaryIO, records: Iterable[Any]) -> None:
+    """
+    Agrega registros a un archivo JSONL abierto en modo binario, uno por línea.
+
+    Se vacía el buffer al terminar para que lo escrito sobreviva a una interrupción.
+
+    Args:
+        f: Archivo abierto con 'ab' o 'wb'
+        records: Registros serializables
+    """
+    f.write(b"".join(dumps_json(record) + b"\n" for record in records))
+    f.flush()
+
+
+def iter_jsonl(path: Union[str, os.PathLike]) -> Iterator[Any]:
+    """
+    Lee un archivo JSONL registro por registro (ignora las líneas vacías).
+
+    Args:
+        path: Archivo JSONL
+
+    Returns:
+        Iterador con cada registro
+    """
+    with open(path, 'rb') as f:
+        for line in f:
+            if line.strip():
+                yield loads_json(line)
+
+
+def copy_file(src: Union[str, os.PathLike], dst: Union[str, os.PathLike]) -> None:
+    """
+    Copia el contenido de un archivo (sin permisos ni fechas).
+
+    En Linux intenta os.copy_file_range: la copia la hace el kernel y en
+    sistemas de archivos con copy-on-write (btrfs, XFS) o NFS puede resolverse
+    sin mover los datos. Si no está disponible vuelve a shutil.copyfile.
+
+    Args:
+        src: Archivo de origen
+        dst: Archivo de destino (se sobrescribe; shutil.SameFileError si es el mismo archivo)
+    """
+    # Abrir el destino para escribir lo truncaría: si es el mismo archivo (p. ej. un
+    # hardlink del origen) se perdería el contenido. shutil.copyfile hace la misma comprobación.
+    try:
+        if os.path.samefile(src, dst):
+            raise shutil.SameFileError(f"{src!r} y {dst!r} son el mismo archivo")
+    except FileNotFoundError:
+        pass
+
+    if hasattr(os, "copy_file_range"):
+        with open(src, 'rb') as fsrc, open(dst, 'wb') as fdst:
+            try:
+                while os.copy_file_range(fsrc.fileno(), fdst.fileno(), 1 << 30):
+                    pass
+                return
+            except OSError as e:
+                if e.errno not in _COPY_RANGE_UNSUPPORTED:
+                    raise
+
+    shutil.copyfile(src, dst)
+
+
+def hash_file(path: Union[str, os.PathLike], algorithm: str = "sha256", chunk_size: int = 1 << 20) -> str:
+    """
+    Calcula el hash del contenido de un archivo leyéndolo por bloques.
+
+    Args:
+        path: Archivo a leer
+        algorithm: Algoritmo de hashlib (sha256 para la caché; blake2b es más rápido)
+        chunk_size: Bytes leídos por bloque
+
+    Returns:
+        Hash en hexadecimal
+    """
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
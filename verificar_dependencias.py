@@ -5,11 +5,173 @@ VERIFICADOR DE DEPENDENCIAS
 Script para verificar que todas las dependencias están correctamente instaladas.
 """
 
+import os
 import sys
+import functools
 import importlib.util
-from pathlib import Path
+from importlib.machinery import ModuleSpec
+from typing import Dict, NamedTuple, Optional
 
-def verificar_modulo(nombre_modulo, nombre_paquete=None, requerido=True):
+# API pública: el resto son detalles internos del informe
+__all__ = ["EstadoModulo", "estado_modulo", "verificar_modulo", "main"]
+
+# Módulos de la biblioteca estándar (Python 3.10+): están siempre, no hace falta buscarlos
+_MODULOS_ESTANDAR = getattr(sys, "stdlib_module_names", frozenset())
+
+# Módulos ya encontrados en la corrida anterior (nombre → archivo del módulo), guardados
+# en la caché del usuario. Valen mientras no cambien el intérprete ni sys.path y el
+# archivo siga existiendo; solo se guardan los encontrados
+_CACHE_MODULOS = os.path.join(os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+                              "clasificador_pdfs", "dependencias.json")
+_CLAVE_INTERPRETE = "\n".join([sys.executable, sys.version, *sys.path])
+_modulos_encontrados = {}
+
+# Archivo de configuración que se revisa (en la carpeta actual, como lo busca load_dotenv)
+_ARCHIVO_ENV = ".env"
+
+# Línea GOOGLE_API_KEY=... del .env (con o sin "export" delante, como acepta python-dotenv);
+# se busca directamente en los bytes del archivo, sin decodificarlo
+_API_KEY_PATRON = rb"(?m)^(?:export\s+)?GOOGLE_API_KEY\s*=\s*(\S*)"
+
+@functools.lru_cache(maxsize=None)
+def _buscar_modulo(nombre_modulo: str) -> Optional[ModuleSpec]:
+    """
+    Busca un módulo sin importarlo (cada nombre se busca una sola vez por proceso).
+
+    find_spec recorre sys.path y consulta a cada buscador de módulos; el resultado
+    no cambia durante la verificación, así que se reutiliza en llamadas repetidas.
+
+    Args:
+        nombre_modulo: Nombre del módulo
+
+    Returns:
+        ModuleSpec del módulo o None si no está instalado
+    """
+    return importlib.util.find_spec(nombre_modulo)
+
+# Línea que separa el encabezado y el resumen del informe
+_SEPARADOR = "=" * 60
+
+# Encabezado de cada sección de la verificación
+_SECCIONES = {
+    "principales": "\n📦 DEPENDENCIAS PRINCIPALES:",
+    "visuales": "\n🎨 DEPENDENCIAS PARA INTERFAZ VISUAL:",
+    "estandar": "\n🐍 MÓDULOS ESTÁNDAR DE PYTHON:",
+}
+
+# Módulos a verificar, en orden: (sección, módulo, paquete para pip, requerido).
+# Las principales son requeridas; las visuales, opcionales
+_DEPENDENCIAS = (
+    ("principales", "google.generativeai", "google-generativeai", True),
+    ("principales", "fitz", "PyMuPDF", True),
+    ("principales", "dotenv", "python-dotenv", True),
+    ("visuales", "colorama", "colorama", False),
+    ("visuales", "rich", "rich", False),
+    *(("estandar", modulo, None, True) for modulo in (
+        "os", "sys", "json", "time", "csv", "logging",
+        "shutil", "re", "pathlib", "datetime", "argparse"
+    )),
+)
+
+class EstadoModulo(NamedTuple):
+    """Resultado de verificar un módulo (sin imprimir nada)."""
+    nombre: str
+    instalado: bool
+    requerido: bool
+    paquete: str  # Nombre para pip install
+    error: Optional[str] = None  # Error al buscarlo, si lo hubo
+
+def estado_modulo(nombre_modulo: str, nombre_paquete: Optional[str] = None,
+                  requerido: bool = True) -> EstadoModulo:
+    """
+    Verifica si un módulo está instalado, sin imprimir nada.
+
+    Args:
+        nombre_modulo: Nombre del módulo a importar
+        nombre_paquete: Nombre del paquete para instalación (si es diferente)
+        requerido: Si el módulo es requerido o opcional
+
+    Returns:
+        EstadoModulo con el resultado
+    """
+    paquete = nombre_paquete or nombre_modulo
+    if nombre_modulo.partition(".")[0] in _MODULOS_ESTANDAR:
+        return EstadoModulo(nombre_modulo, True, requerido, paquete)
+
+    origen = _modulos_encontrados.get(nombre_modulo)
+    if origen and os.path.exists(origen):
+        return EstadoModulo(nombre_modulo, True, requerido, paquete)
+
+    if "." in nombre_modulo:
+        # Para un submódulo find_spec importa el paquete padre, que puede faltar
+        # o fallar al importarse; un módulo de primer nivel solo se busca
+        try:
+            spec = _buscar_modulo(nombre_modulo)
+        except Exception as e:
+            return EstadoModulo(nombre_modulo, False, requerido, paquete, str(e))
+    else:
+        spec = _buscar_modulo(nombre_modulo)
+
+    if spec is not None and spec.origin and os.path.isabs(spec.origin):
+        _modulos_encontrados[nombre_modulo] = spec.origin
+    return EstadoModulo(nombre_modulo, spec is not None, requerido, paquete)
+
+def _linea_informe(estado: EstadoModulo) -> str:
+    """
+    Arma la línea del informe de un módulo (alineada con ljust, sin mini-lenguaje de formato).
+
+    Args:
+        estado: Resultado de estado_modulo
+
+    Returns:
+        Línea a imprimir
+    """
+    if estado.instalado:
+        return "✅ " + estado.nombre.ljust(20) + " - Instalado"
+    if estado.error is not None:
+        status = "❌ ERROR" if estado.requerido else "⚠️  Error"
+        return status + " " + estado.nombre.ljust(18) + " - Error: " + estado.error
+    status = "❌ REQUERIDO" if estado.requerido else "⚠️  Opcional"
+    return status + " " + estado.nombre.ljust(15) + " - pip install " + estado.paquete
+
+def _cargar_cache_modulos() -> Dict[str, str]:
+    """
+    Lee los módulos encontrados en la corrida anterior, si fue con el mismo intérprete y sys.path.
+
+    Returns:
+        Diccionario nombre de módulo → archivo (vacío si no hay caché o no sirve)
+    """
+    import json
+    try:
+        with open(_CACHE_MODULOS, 'rb') as f:
+            datos = json.load(f)
+        if datos["interprete"] == _CLAVE_INTERPRETE and isinstance(datos["modulos"], dict):
+            return datos["modulos"]
+    except (OSError, ValueError, TypeError, KeyError):
+        pass
+    return {}
+
+def _guardar_cache_modulos(anteriores: Dict[str, str]):
+    """
+    Guarda los módulos encontrados en esta corrida (si cambiaron).
+
+    Args:
+        anteriores: Lo que había en la caché al empezar
+    """
+    if _modulos_encontrados == anteriores:
+        return
+
+    import json
+    try:
+        os.makedirs(os.path.dirname(_CACHE_MODULOS), exist_ok=True)
+        with open(_CACHE_MODULOS, 'w', encoding='utf-8') as f:
+            json.dump({"interprete": _CLAVE_INTERPRETE, "modulos": _modulos_encontrados},
+                      f, ensure_ascii=False, indent=2)
+    except OSError:
+        pass  # Sin caché la próxima verificación simplemente vuelve a buscar
+
+def verificar_modulo(nombre_modulo: str, nombre_paquete: Optional[str] = None,
+                     requerido: bool = True) -> bool:
     """
     Verifica si un módulo está instalado.
 
@@ -21,113 +183,102 @@ def verificar_modulo(nombre_modulo, nombre_paquete=None, requerido=True):
     Returns:
         bool: True si está instalado, False si no
     """
-    try:
-        spec = importlib.util.find_spec(nombre_modulo)
-        if spec is not None:
-            print(f"✅ {nombre_modulo:<20} - Instalado")
-            return True
-        else:
-            status = "❌ REQUERIDO" if requerido else "⚠️  Opcional"
-            paquete = nombre_paquete or nombre_modulo
-            print(f"{status} {nombre_modulo:<15} - pip install {paquete}")
-            return False
-    except Exception as e:
-        status = "❌ ERROR" if requerido else "⚠️  Error"
-        print(f"{status} {nombre_modulo:<18} - Error: {e}")
-        return False
-
-def main():
+    estado = estado_modulo(nombre_modulo, nombre_paquete, requerido)
+    print(_linea_informe(estado))
+    return estado.instalado
+
+def main() -> int:
     """Función principal de verificación."""
-    print("🔍 VERIFICANDO DEPENDENCIAS DEL CLASIFICADOR DE PDFs")
-    print("=" * 60)
-
-    # Dependencias principales (requeridas)
-    print("\n📦 DEPENDENCIAS PRINCIPALES:")
-    dependencias_principales = [
-        ("google.generativeai", "google-generativeai"),
-        ("fitz", "PyMuPDF"),
-        ("dotenv", "python-dotenv"),
-    ]
-
-    principales_ok = True
-    for modulo, paquete in dependencias_principales:
-        if not verificar_modulo(modulo, paquete, requerido=True):
-            principales_ok = False
-
-    # Dependencias para interfaz visual (opcionales)
-    print("\n🎨 DEPENDENCIAS PARA INTERFAZ VISUAL:")
-    dependencias_visuales = [
-        ("colorama", "colorama"),
-        ("rich", "rich"),
-    ]
-
-    visuales_ok = True
-    for modulo, paquete in dependencias_visuales:
-        if not verificar_modulo(modulo, paquete, requerido=False):
-            visuales_ok = False
-
-    # Dependencias estándar de Python
-    print("\n🐍 MÓDULOS ESTÁNDAR DE PYTHON:")
-    modulos_estandar = [
-        "os", "sys", "json", "time", "csv", "logging",
-        "shutil", "re", "pathlib", "datetime", "argparse"
-    ]
+    # El informe se junta y se escribe de una vez al final (una escritura en la
+    # terminal en lugar de una por línea)
+    salida = []
+    salida.append("🔍 VERIFICANDO DEPENDENCIAS DEL CLASIFICADOR DE PDFs")
+    salida.append(_SEPARADOR)
+
+    # concurrent.futures (que carga logging) y re se importan recién aquí: importar
+    # el módulo solo para usar verificar_modulo no los necesita
+    import re
+    from concurrent.futures import ThreadPoolExecutor
+
+    # Los módulos se buscan en paralelo (cada búsqueda espera al disco); map
+    # devuelve los resultados en el orden de la tabla. Los encontrados en corridas
+    # anteriores solo se comprueban con un stat de su archivo
+    anteriores = _cargar_cache_modulos()
+    _modulos_encontrados.update(anteriores)
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        estados = list(executor.map(lambda dep: estado_modulo(*dep[1:]), _DEPENDENCIAS))
+    _guardar_cache_modulos(anteriores)
+
+    # Un solo recorrido de la tabla; el encabezado se agrega al empezar cada sección
+    seccion_ok = dict.fromkeys(_SECCIONES, True)
+    seccion_actual = None
+    for (seccion, _, _, _), estado in zip(_DEPENDENCIAS, estados):
+        if seccion != seccion_actual:
+            salida.append(_SECCIONES[seccion])
+            seccion_actual = seccion
+        salida.append(_linea_informe(estado))
+        if not estado.instalado:
+            seccion_ok[seccion] = False
 
-    for modulo in modulos_estandar:
-        verificar_modulo(modulo, requerido=True)
+    principales_ok = seccion_ok["principales"]
+    visuales_ok = seccion_ok["visuales"]
 
     # Resumen
-    print("\n" + "=" * 60)
-    print("📋 RESUMEN:")
+    salida.append("\n" + _SEPARADOR)
+    salida.append("📋 RESUMEN:")
 
     if principales_ok:
-        print("✅ Dependencias principales: TODAS INSTALADAS")
-        print("   → El clasificador básico funcionará correctamente")
+        salida.append("✅ Dependencias principales: TODAS INSTALADAS")
+        salida.append("   → El clasificador básico funcionará correctamente")
     else:
-        print("❌ Dependencias principales: FALTAN ALGUNAS")
-        print("   → Ejecuta: pip install -r requirements-minimal.txt")
+        salida.append("❌ Dependencias principales: FALTAN ALGUNAS")
+        salida.append("   → Ejecuta: pip install -r requirements-minimal.txt")
 
     if visuales_ok:
-        print("✅ Dependencias visuales: TODAS INSTALADAS")
-        print("   → El menú interactivo colorido estará disponible")
+        salida.append("✅ Dependencias visuales: TODAS INSTALADAS")
+        salida.append("   → El menú interactivo colorido estará disponible")
     else:
-        print("⚠️  Dependencias visuales: FALTAN ALGUNAS")
-        print("   → Para interfaz completa: pip install -r requirements.txt")
-        print("   → El programa funcionará en modo básico")
+        salida.append("⚠️  Dependencias visuales: FALTAN ALGUNAS")
+        salida.append("   → Para interfaz completa: pip install -r requirements.txt")
+        salida.append("   → El programa funcionará en modo básico")
 
     # Verificar archivos de configuración
-    print("\n🔧 CONFIGURACIÓN:")
-    env_file = Path(".env")
-    if env_file.exists():
-        print("✅ Archivo .env encontrado")
-
-        # Verificar API key
+    salida.append("\n🔧 CONFIGURACIÓN:")
+    # os.path.isfile no lanza excepciones y descarta una carpeta llamada .env
+    # en cualquier sistema (abrir una carpeta da IsADirectoryError en POSIX
+    # pero PermissionError en Windows)
+    if not os.path.isfile(_ARCHIVO_ENV):
+        salida.append("❌ Archivo .env no encontrado")
+        salida.append("   → Crea un archivo .env con tu GOOGLE_API_KEY")
+    else:
+        salida.append("✅ Archivo .env encontrado")
         try:
-            with open(env_file, 'r') as f:
+            with open(_ARCHIVO_ENV, 'rb') as f:
                 content = f.read()
-                if "GOOGLE_API_KEY=" in content and len(content.split("GOOGLE_API_KEY=")[1].split()[0]) > 10:
-                    print("✅ API Key configurada en .env")
-                else:
-                    print("⚠️  API Key en .env parece incompleta")
-        except:
-            print("⚠️  No se pudo verificar API Key en .env")
-    else:
-        print("❌ Archivo .env no encontrado")
-        print("   → Crea un archivo .env con tu GOOGLE_API_KEY")
+        except OSError:
+            salida.append("⚠️  No se pudo verificar API Key en .env")
+        else:
+            # Verificar API key (en una línea propia, no comentada)
+            api_key = re.search(_API_KEY_PATRON, content)
+            if api_key and len(api_key.group(1)) > 10:
+                salida.append("✅ API Key configurada en .env")
+            else:
+                salida.append("⚠️  API Key en .env parece incompleta")
 
     # Recomendaciones
-    print("\n💡 RECOMENDACIONES:")
+    salida.append("\n💡 RECOMENDACIONES:")
     if not principales_ok:
-        print("1. Instala las dependencias principales primero")
-        print("2. Configura tu API Key de Google Gemini")
-        print("3. Prueba el clasificador básico")
+        salida.append("1. Instala las dependencias principales primero")
+        salida.append("2. Configura tu API Key de Google Gemini")
+        salida.append("3. Prueba el clasificador básico")
     elif not visuales_ok:
-        print("1. Considera instalar las dependencias visuales para mejor experiencia")
-        print("2. Usa 'python main.py' para menú interactivo")
+        salida.append("1. Considera instalar las dependencias visuales para mejor experiencia")
+        salida.append("2. Usa 'python main.py' para menú interactivo")
     else:
-        print("1. ¡Todo está listo! Usa 'python main.py' para empezar")
-        print("2. El menú interactivo estará disponible con todas las funciones")
+        salida.append("1. ¡Todo está listo! Usa 'python main.py' para empezar")
+        salida.append("2. El menú interactivo estará disponible con todas las funciones")
 
+    print("\n".join(salida))
     return 0 if principales_ok else 1
 
 if __name__ == "__main__":